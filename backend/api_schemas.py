@@ -1,6 +1,6 @@
 
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, model_validator
+from typing import Any, Dict, List, Optional, Union
 
 
 class BaseRequest(BaseModel):
@@ -180,3 +180,165 @@ class IterativeRefinementRequest(BaseRequest):
     learner_profile: str
     learning_path: str
     max_iterations: int = 2
+
+
+# ---------------------------------------------------------------------------
+# v2 request bodies: real nested JSON instead of str(dict) payloads.
+# ---------------------------------------------------------------------------
+
+JSONDict = Dict[str, Any]
+JSONLike = Union[JSONDict, List[Any], str]
+LearningPathLike = Union[List[JSONDict], JSONDict]
+
+
+class ChatMessage(BaseModel):
+
+    role: str = "user"
+    content: str = ""
+
+
+class ChatWithTutorRequestV2(BaseRequest):
+
+    messages: List[ChatMessage]
+    learner_profile: JSONLike = ""
+    use_search: bool = True
+
+
+class SkillGapIdentificationRequestV2(BaseRequest):
+
+    learning_goal: str
+    learner_information: str
+    skill_requirements: Optional[JSONDict] = None
+
+
+class LearnerProfileInitializationRequestV2(BaseRequest):
+
+    learning_goal: str
+    learner_information: JSONLike
+    skill_gaps: JSONLike
+
+
+class LearnerProfileUpdateRequestV2(BaseRequest):
+
+    learner_profile: JSONDict
+    learner_interactions: JSONLike
+    learner_information: JSONLike = ""
+    session_information: Optional[JSONLike] = None
+
+
+class LearningPathSchedulingRequestV2(BaseRequest):
+
+    learner_profile: JSONDict
+    session_count: int
+
+
+class LearningPathReschedulingRequestV2(BaseRequest):
+
+    learner_profile: JSONDict
+    learning_path: LearningPathLike
+    session_count: int = -1
+    other_feedback: JSONLike = ""
+
+
+class KnowledgePointExplorationRequestV2(BaseRequest):
+
+    learner_profile: JSONDict
+    learning_path: LearningPathLike
+    learning_session: JSONDict
+
+
+class KnowledgePointDraftingRequestV2(KnowledgePointExplorationRequestV2):
+
+    knowledge_points: List[JSONDict]
+    knowledge_point: JSONDict
+    use_search: bool = True
+
+
+class KnowledgePointsDraftingRequestV2(KnowledgePointExplorationRequestV2):
+
+    knowledge_points: List[JSONDict]
+    use_search: bool = True
+    allow_parallel: bool = True
+
+
+class LearningDocumentIntegrationRequestV2(KnowledgePointExplorationRequestV2):
+
+    knowledge_points: List[JSONDict]
+    knowledge_drafts: List[JSONDict]
+    output_markdown: bool = False
+
+
+class KnowledgeQuizGenerationRequestV2(BaseRequest):
+
+    learner_profile: JSONDict
+    learning_document: JSONLike
+    single_choice_count: int = 3
+    multiple_choice_count: int = 0
+    true_false_count: int = 0
+    short_answer_count: int = 0
+
+
+class TailoredContentGenerationRequestV2(KnowledgePointExplorationRequestV2):
+
+    use_search: bool = True
+    allow_parallel: bool = True
+    with_quiz: bool = True
+
+
+class TailoredContentStreamRequestV2(TailoredContentGenerationRequestV2):
+
+    output_markdown: bool = True
+    single_choice_count: int = 3
+    multiple_choice_count: int = 0
+    true_false_count: int = 0
+    short_answer_count: int = 0
+
+
+class LearningPathContentBatchRequestV2(BaseRequest):
+    """Generate content for several (by default all) sessions of a learning path."""
+    learner_profile: JSONDict
+    learning_path: LearningPathLike
+    session_indices: Optional[List[int]] = None
+    use_search: bool = True
+    with_quiz: bool = True
+    output_markdown: bool = True
+    single_choice_count: int = 3
+    multiple_choice_count: int = 0
+    true_false_count: int = 0
+    short_answer_count: int = 0
+
+    @model_validator(mode="after")
+    def check_session_indices(self) -> "LearningPathContentBatchRequestV2":
+        # Checked here so a bad index is a 422, not an error after the stream has started.
+        if self.session_indices is not None:
+            sessions = self.learning_path.get("learning_path", []) if isinstance(self.learning_path, dict) else self.learning_path
+            invalid = [index for index in self.session_indices if not 0 <= index < len(sessions)]
+            if invalid:
+                raise ValueError(f"session_indices {invalid} are not sessions of a {len(sessions)}-session learning path")
+            self.session_indices = list(dict.fromkeys(self.session_indices))
+        return self
+
+
+class LearningPathFeedbackRequestV2(BaseRequest):
+
+    learner_profile: JSONDict
+    learning_path: LearningPathLike
+
+
+class LearningContentFeedbackRequestV2(BaseRequest):
+
+    learner_profile: JSONDict
+    learning_content: JSONLike
+
+
+class LearningPathRefinementRequestV2(BaseRequest):
+    """Request for refining a learning path based on feedback."""
+    learning_path: LearningPathLike
+    feedback: JSONLike
+
+
+class IterativeRefinementRequestV2(BaseRequest):
+    """Request for iterative refinement with feedback simulation."""
+    learner_profile: JSONDict
+    learning_path: LearningPathLike
+    max_iterations: int = 2
@@ -1,5 +1,10 @@
-from .base_agent import BaseAgent
+from .agent_cache import AgentGraphCache, agent_graph_cache
+from .base_agent import BaseAgent, llm_call_limit, use_llm_call_limit
+from .kv_cache import TieredCache
+from .llm_cache import LLMResponseCache, llm_response_cache
+from .rate_limiter import LLMRateLimiter, llm_rate_limiter
 from .llm_factory import LLMFactory
+from .llm_registry import LLMClientRegistry
 from .searcher_factory import SearcherFactory, SearchRunner
 from .embedder_factory import EmbedderFactory
 from .rag_factory import TextSplitterFactory, VectorStoreFactory
@@ -7,7 +12,17 @@ from .rag_factory import TextSplitterFactory, VectorStoreFactory
 
 __all__ = [
     "BaseAgent",
+    "llm_call_limit",
+    "use_llm_call_limit",
+    "AgentGraphCache",
+    "agent_graph_cache",
+    "TieredCache",
+    "LLMResponseCache",
+    "llm_response_cache",
+    "LLMRateLimiter",
+    "llm_rate_limiter",
     "LLMFactory",
+    "LLMClientRegistry",
     "SearcherFactory",
     "SearchRunner",
     "EmbedderFactory",
@@ -0,0 +1,116 @@
+"""Process-wide memo of compiled agent graphs.
+
+Helpers construct a fresh :class:`~base.base_agent.BaseAgent` per call and
+each construction used to compile a new LangGraph graph through
+``create_agent``. Compiled graphs are stateless and safe to share, so
+:class:`AgentGraphCache` compiles each distinct (model, system prompt, tools,
+agent kwargs) combination once per process.
+
+The model and tools are keyed by identity, so the cache pays off when the model
+instance is shared (see :class:`~base.llm_registry.LLMClientRegistry`).
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+GraphKey = Tuple[Hashable, ...]
+
+
+def _freeze(value: Any) -> Hashable:
+    """Turn nested kwargs into a hashable value; raises TypeError when impossible."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    hash(value)
+    return value
+
+
+class AgentGraphCache:
+    """Bounded LRU of compiled agent graphs with hit/miss/build-time stats."""
+
+    def __init__(self, max_size: int = 128, enabled: bool = True) -> None:
+        self.max_size = max(1, int(max_size))
+        self.enabled = enabled
+        # key -> (graph, objects the key refers to by id, kept alive while cached)
+        self._graphs: "OrderedDict[GraphKey, Tuple[Any, Tuple[Any, ...]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._build_seconds = 0.0
+
+    def configure(self, max_size: Optional[int] = None, enabled: Optional[bool] = None) -> None:
+        if max_size is not None:
+            self.max_size = max(1, int(max_size))
+        if enabled is not None:
+            self.enabled = enabled
+        if not self.enabled:
+            self.clear()
+
+    @staticmethod
+    def make_key(
+        model: Any,
+        system_prompt: Optional[str],
+        tools: Optional[Sequence[Any]],
+        agent_kwargs: Dict[str, Any],
+    ) -> Optional[GraphKey]:
+        """Build the cache key, or return ``None`` when the kwargs are not hashable."""
+        try:
+            kwargs_key = _freeze(agent_kwargs)
+        except TypeError:
+            return None
+        tool_ids = tuple(id(tool) for tool in tools or ())
+        return (id(model), system_prompt, tool_ids, kwargs_key)
+
+    def get_or_build(self, key: Optional[GraphKey], builder: Callable[[], Any], refs: Tuple[Any, ...] = ()) -> Any:
+        """Return the cached graph for ``key`` or compile, cache and return a new one."""
+        if not self.enabled or key is None:
+            return builder()
+        with self._lock:
+            cached = self._graphs.get(key)
+            if cached is not None:
+                self._graphs.move_to_end(key)
+                self._hits += 1
+                return cached[0]
+            self._misses += 1
+            started = time.perf_counter()
+            graph = builder()
+            self._build_seconds += time.perf_counter() - started
+            self._graphs[key] = (graph, refs)
+            while len(self._graphs) > self.max_size:
+                self._graphs.popitem(last=False)
+            return graph
+
+    def invalidate(self, key: Optional[GraphKey] = None) -> None:
+        """Drop one compiled graph, or all of them when ``key`` is ``None``."""
+        with self._lock:
+            if key is None:
+                self._graphs.clear()
+            else:
+                self._graphs.pop(key, None)
+
+    def clear(self) -> None:
+        self.invalidate()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "enabled": self.enabled,
+                "size": len(self._graphs),
+                "max_size": self.max_size,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "build_seconds": self._build_seconds,
+            }
+
+
+agent_graph_cache = AgentGraphCache()
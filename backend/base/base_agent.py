@@ -1,9 +1,18 @@
-from typing import Any, Dict, Optional, Sequence
+import asyncio
+from contextlib import asynccontextmanager, contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Sequence
 
 from langchain.agents import create_agent
 from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
 
-from utils.llm_output import preprocess_response
+from base.agent_cache import agent_graph_cache
+from base.llm_cache import llm_response_cache
+from base.metrics import LLM_CALL_ERRORS, LLM_CALL_SECONDS, observe_seconds, record_token_usage
+from base.rate_limiter import llm_rate_limiter
+from base.tracing import span, tracer
+from utils.llm_output import ThinkTagFilter, preprocess_response
 from langgraph.typing import InputT, OutputT, StateT
 from langchain.agents.middleware.types import (
     AgentMiddleware,
@@ -30,6 +39,20 @@ valid_agent_arg_list = [
     "cache"
 ]
 
+# Optional cap on concurrent async LLM calls, scoped to the current context so
+# that a batch can share one limit across all the tasks it spawns.
+llm_call_limit: ContextVar[Optional[asyncio.Semaphore]] = ContextVar("llm_call_limit", default=None)
+
+
+@contextmanager
+def use_llm_call_limit(semaphore: Optional[asyncio.Semaphore]) -> Iterator[None]:
+    """Make ``ainvoke``/``astream`` calls in this context wait on ``semaphore``."""
+    token = llm_call_limit.set(semaphore)
+    try:
+        yield
+    finally:
+        llm_call_limit.reset(token)
+
 
 class BaseAgent:
 
@@ -49,16 +72,25 @@ class BaseAgent:
         self.exclude_think = kwargs.get("exclude_think", True)
         self.jsonalize_output = kwargs.get("jsonalize_output", True)
 
+    def _graph_key(self):
+        return agent_graph_cache.make_key(self._model, self._system_prompt, self._tools, self._agent_kwargs)
+
     def _build_agent(self):
-        return create_agent(
-            model=self._model,
-            tools=self._tools,
-            system_prompt=self._system_prompt,
-            **self._agent_kwargs,
+        """Return the compiled graph, reusing one compiled by an equivalent agent."""
+        return agent_graph_cache.get_or_build(
+            self._graph_key(),
+            lambda: create_agent(
+                model=self._model,
+                tools=self._tools,
+                system_prompt=self._system_prompt,
+                **self._agent_kwargs,
+            ),
+            refs=(self._model, self._tools),
         )
 
     def set_prompts(self, system_prompt: Optional[str] = None, task_prompt: Optional[str] = None) -> None:
         """Set or update system/task prompts and rebuild the internal agent if needed."""
+        agent_graph_cache.invalidate(self._graph_key())
         if system_prompt is not None:
             self._system_prompt = system_prompt
         if task_prompt is not None:
@@ -77,11 +109,159 @@ class BaseAgent:
         }
         return prompt
 
+    def _parse_output(self, raw_output: Any) -> Any:
+        return preprocess_response(
+            raw_output, only_text=True, exclude_think=self.exclude_think, json_output=self.jsonalize_output
+        )
+
+    @property
+    def _agent_name(self) -> str:
+        return getattr(self, "name", type(self).__name__)
+
+    def _response_cache_key(self, input_prompt: _InputAgentState) -> Optional[str]:
+        return llm_response_cache.lookup_key(
+            self._agent_name, self._model, self._system_prompt, input_prompt, tools=self._tools
+        )
+
+    @staticmethod
+    def _cached_output(content: Any) -> Dict[str, Any]:
+        return {"messages": [AIMessage(content=content)]}
+
+    def _estimated_tokens(self, input_prompt: _InputAgentState) -> int:
+        return llm_rate_limiter.estimate(self._system_prompt, *(m["content"] for m in input_prompt["messages"]))
+
+    @staticmethod
+    def _reported_tokens(raw_output: Any) -> Optional[int]:
+        """Total tokens the provider reported for all model turns of the run, if any."""
+        total = 0
+        for message in raw_output.get("messages", []):
+            usage = getattr(message, "usage_metadata", None)
+            if usage:
+                total += usage.get("total_tokens", 0)
+        return total or None
+
+    def _agent_span(self, method: str):
+        return span(
+            f"invoke_agent {self._agent_name}",
+            **{"gen_ai.operation.name": "invoke_agent", "gen_ai.agent.name": self._agent_name, "genmentor.agent.method": method},
+        )
+
+    def _model_span(self):
+        model_name = getattr(self._model, "model_name", None) or getattr(self._model, "model", None)
+        return span(f"chat {model_name}", **{"gen_ai.operation.name": "chat", "gen_ai.request.model": model_name})
+
+    def _record_usage(self, current_span: Any, raw_output: Any) -> None:
+        usage = record_token_usage(self._agent_name, raw_output)
+        current_span.set_attribute("gen_ai.usage.input_tokens", usage["input"])
+        current_span.set_attribute("gen_ai.usage.output_tokens", usage["output"])
+
+    def _invoke_graph(self, input_prompt: _InputAgentState) -> Any:
+        with self._model_span() as current_span, \
+                observe_seconds(LLM_CALL_SECONDS.labels(agent=self._agent_name, method="invoke")):
+            try:
+                raw_output = self._agent.invoke(input_prompt)
+            except Exception:
+                LLM_CALL_ERRORS.labels(agent=self._agent_name).inc()
+                raise
+            self._record_usage(current_span, raw_output)
+        return raw_output
+
+    async def _ainvoke_graph(self, input_prompt: _InputAgentState) -> Any:
+        with self._model_span() as current_span, \
+                observe_seconds(LLM_CALL_SECONDS.labels(agent=self._agent_name, method="ainvoke")):
+            try:
+                raw_output = await self._agent.ainvoke(input_prompt)
+            except Exception:
+                LLM_CALL_ERRORS.labels(agent=self._agent_name).inc()
+                raise
+            self._record_usage(current_span, raw_output)
+        return raw_output
+
     def invoke(self, input_dict: dict, task_prompt: Optional[str] = None) -> Any:
         """Invoke the agent with the given input text."""
         input_prompt = self._build_prompt(input_dict, task_prompt=task_prompt)
-        raw_output = self._agent.invoke(input_prompt)
-        output = preprocess_response(
-            raw_output, only_text=True, exclude_think=self.exclude_think, json_output=self.jsonalize_output
+        with self._agent_span("invoke") as current_span:
+            cache_key = self._response_cache_key(input_prompt)
+            if cache_key is not None:
+                cached = llm_response_cache.get(self._agent_name, cache_key)
+                current_span.set_attribute("genmentor.cache_hit", cached is not None)
+                if cached is not None:
+                    return self._parse_output(self._cached_output(cached))
+            raw_output = llm_rate_limiter.call(
+                self._model,
+                self._estimated_tokens(input_prompt),
+                lambda: self._invoke_graph(input_prompt),
+                usage=self._reported_tokens,
+            )
+            parsed = self._parse_output(raw_output)
+            # Stored only once the reply parses, so a malformed reply is retried next time.
+            if cache_key is not None:
+                llm_response_cache.set(cache_key, raw_output["messages"][-1].content)
+            return parsed
+
+    async def ainvoke(self, input_dict: dict, task_prompt: Optional[str] = None) -> Any:
+        """Asynchronously invoke the agent through the compiled graph's ``ainvoke``."""
+        input_prompt = self._build_prompt(input_dict, task_prompt=task_prompt)
+        with self._agent_span("ainvoke") as current_span:
+            cache_key = self._response_cache_key(input_prompt)
+            if cache_key is not None:
+                cached = await asyncio.to_thread(llm_response_cache.get, self._agent_name, cache_key)
+                current_span.set_attribute("genmentor.cache_hit", cached is not None)
+                if cached is not None:
+                    return self._parse_output(self._cached_output(cached))
+            async with llm_call_limit.get() or nullcontext():
+                raw_output = await llm_rate_limiter.acall(
+                    self._model,
+                    self._estimated_tokens(input_prompt),
+                    lambda: self._ainvoke_graph(input_prompt),
+                    usage=self._reported_tokens,
+                )
+            parsed = self._parse_output(raw_output)
+            if cache_key is not None:
+                await asyncio.to_thread(llm_response_cache.set, cache_key, raw_output["messages"][-1].content)
+            return parsed
+
+    @asynccontextmanager
+    async def _timed_stream(self) -> AsyncIterator[Any]:
+        # The span is not made current: an async generator may resume in another
+        # context, which would break detaching it.
+        stream_span = tracer.start_span(
+            f"invoke_agent {self._agent_name}",
+            attributes={"gen_ai.operation.name": "invoke_agent", "gen_ai.agent.name": self._agent_name, "genmentor.agent.method": "astream"},
         )
-        return output
+        try:
+            with observe_seconds(LLM_CALL_SECONDS.labels(agent=self._agent_name, method="astream")):
+                try:
+                    yield stream_span
+                except Exception as e:
+                    LLM_CALL_ERRORS.labels(agent=self._agent_name).inc()
+                    stream_span.record_exception(e)
+                    raise
+        finally:
+            stream_span.end()
+
+    async def astream(self, input_dict: dict, task_prompt: Optional[str] = None) -> AsyncIterator[str]:
+        """Yield the model's reply text chunk by chunk as it is generated.
+
+        Only meaningful for free-text agents (``jsonalize_output=False``); the
+        chunks are raw text and are not passed through :meth:`_parse_output`.
+        """
+        input_prompt = self._build_prompt(input_dict, task_prompt=task_prompt)
+        think_filter = ThinkTagFilter() if self.exclude_think else None
+        async with llm_call_limit.get() or nullcontext(), \
+                llm_rate_limiter.aslot(self._model, self._estimated_tokens(input_prompt)), \
+                self._timed_stream() as stream_span:
+            async for chunk, _metadata in self._agent.astream(input_prompt, stream_mode="messages"):
+                if not isinstance(chunk, AIMessageChunk):
+                    continue
+                if chunk.usage_metadata:
+                    self._record_usage(stream_span, {"messages": [chunk]})
+                text = chunk.text
+                if think_filter is not None:
+                    text = think_filter.feed(text)
+                if text:
+                    yield text
+        if think_filter is not None:
+            tail = think_filter.flush()
+            if tail:
+                yield tail
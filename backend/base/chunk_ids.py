@@ -0,0 +1,84 @@
+"""Stable ids for vector store chunks, and de-duplication of existing collections.
+
+A chunk's id is derived from its source URL and the hash of its text, so
+adding the same page again yields the same ids: :class:`SearchRagManager`
+looks them up and embeds only chunks the store does not have yet. Collections
+filled before ids were stable hold one copy of a chunk per time its page was
+fetched; :func:`dedupe_collection` (``python backend/maintenance/dedupe_vectorstore.py``)
+keeps one of each and moves it to its stable id.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+from typing import Any, Dict, List, Optional
+
+from langchain_core.documents import Document
+
+logger = logging.getLogger(__name__)
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def chunk_id(source: Optional[str], text: str) -> str:
+    """Stable id of a chunk: SHA-256 over the source URL and the hash of the text."""
+    return hashlib.sha256(f"{source or ''}\x1f{content_hash(text)}".encode("utf-8")).hexdigest()
+
+
+def document_chunk_id(document: Document) -> str:
+    return chunk_id(document.metadata.get("source"), document.page_content)
+
+
+def dedupe_collection(collection: Any, batch_size: int = 1000, dry_run: bool = False) -> Dict[str, int]:
+    """Remove duplicate chunks from a Chroma collection and move the kept ones to stable ids.
+
+    Records with the same source and text are duplicates; the first one seen is
+    kept. A kept record whose id is not its stable id is copied under the stable
+    id with its stored embedding (nothing is re-embedded) and the old id deleted.
+    """
+    # Scan first, then modify, so deletions do not shift the pages being read.
+    kept: Dict[str, str] = {}
+    to_delete: List[str] = []
+    to_rekey: Dict[str, str] = {}
+    offset = 0
+    while True:
+        batch = collection.get(limit=batch_size, offset=offset, include=["documents", "metadatas"])
+        if not batch["ids"]:
+            break
+        for record_id, text, metadata in zip(batch["ids"], batch["documents"], batch["metadatas"]):
+            stable = chunk_id((metadata or {}).get("source"), text or "")
+            previous = kept.get(stable)
+            if previous is None:
+                kept[stable] = record_id
+                if record_id != stable:
+                    to_rekey[record_id] = stable
+            elif record_id == stable:
+                # A copy already at its stable id wins over one kept earlier.
+                to_delete.append(previous)
+                to_rekey.pop(previous, None)
+                kept[stable] = record_id
+            else:
+                to_delete.append(record_id)
+        offset += len(batch["ids"])
+
+    summary = {"records": offset, "unique": len(kept), "duplicates": len(to_delete), "rekeyed": len(to_rekey)}
+    if dry_run:
+        return summary
+
+    for start in range(0, len(to_delete), batch_size):
+        collection.delete(ids=to_delete[start:start + batch_size])
+    old_ids = list(to_rekey)
+    for start in range(0, len(old_ids), batch_size):
+        batch = collection.get(ids=old_ids[start:start + batch_size], include=["documents", "metadatas", "embeddings"])
+        collection.add(
+            ids=[to_rekey[record_id] for record_id in batch["ids"]],
+            embeddings=batch["embeddings"],
+            documents=batch["documents"],
+            metadatas=batch["metadatas"],
+        )
+        collection.delete(ids=batch["ids"])
+    logger.info(f"Deduplicated collection: {summary}")
+    return summary
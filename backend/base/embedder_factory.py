@@ -1,5 +1,5 @@
 from langchain_core.embeddings import Embeddings
-from typing import Optional
+from typing import Any, Optional
 
 
 class EmbedderFactory:
@@ -7,13 +7,22 @@ class EmbedderFactory:
     def create(
         model: str = "sentence-transformers/all-MiniLM-L6-v2", 
         model_provider: Optional[str] = "huggingface",
+        backend: str = "torch",
+        **backend_kwargs: Any,
         ) -> Embeddings:
-        """Create an embedding model instance based on the specified model name."""
+        """Create an embedding model instance based on the specified model name.
+
+        For HuggingFace models ``backend="onnx"`` runs the model on ONNX Runtime
+        (see :class:`base.onnx_embedder.OnnxEmbeddings`, which takes ``backend_kwargs``).
+        """
         if ':' in model:
             model_provider, model = model.split(':', 1)
         else:
             model_provider = model_provider or "huggingface"
         match model_provider.lower():
+            case "huggingface" if backend == "onnx":
+                from base.onnx_embedder import OnnxEmbeddings
+                return OnnxEmbeddings(model_name=model, **backend_kwargs)
             case "huggingface":
                 from langchain_huggingface import HuggingFaceEmbeddings
                 return HuggingFaceEmbeddings(model_name=model)
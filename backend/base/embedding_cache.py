@@ -0,0 +1,189 @@
+"""Persistent cache of embedding vectors in front of an embedding model.
+
+:class:`CachedEmbeddings` wraps the model built by
+:class:`~base.embedder_factory.EmbedderFactory`. Vectors are keyed by the model
+name, the kind of text (document or query: some models embed them differently)
+and the SHA-256 of the text. They are kept in a per-process LRU and in SQLite as
+float32 blobs, so they survive restarts and are shared by every process using
+the same file. ``embed_documents`` looks up a whole batch at once and sends
+only the texts not found (each distinct text once) to the model.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from typing import Any, Dict, List, Optional, Sequence
+
+from langchain_core.embeddings import Embeddings
+
+from base.kv_cache import MemoryTTLCache
+
+_MISSING = object()
+# SQLite limits the number of bound parameters per statement.
+LOOKUP_BATCH = 500
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class SQLiteVectorCache:
+    """Vectors by ``(model, kind, text hash)`` in SQLite, trimmed to the most recently read ``max_entries``."""
+
+    def __init__(self, path: str, max_entries: Optional[int] = None) -> None:
+        self.path = path
+        self.max_entries = max_entries
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self._writes = 0
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "model TEXT NOT NULL, kind TEXT NOT NULL, text_hash TEXT NOT NULL, vector BLOB NOT NULL, "
+                "accessed_at REAL NOT NULL, PRIMARY KEY (model, kind, text_hash))"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS embeddings_by_access ON embeddings (accessed_at)")
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        # Reopened after fork, as in kv_cache.SQLiteCache.
+        if self._connection is None or (self._pid != os.getpid() and self.path != ":memory:"):
+            self._connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._pid = os.getpid()
+        return self._connection
+
+    def get_many(self, model: str, kind: str, hashes: Sequence[str]) -> Dict[str, List[float]]:
+        found: Dict[str, List[float]] = {}
+        now = time.time()
+        with self._lock:
+            for start in range(0, len(hashes), LOOKUP_BATCH):
+                batch = list(hashes[start:start + LOOKUP_BATCH])
+                marks = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings WHERE model = ? AND kind = ? AND text_hash IN ({marks})",
+                    (model, kind, *batch),
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = array("f", blob).tolist()
+                if rows:
+                    self._conn.execute(
+                        f"UPDATE embeddings SET accessed_at = ? WHERE model = ? AND kind = ? AND text_hash IN ({marks})",
+                        (now, model, kind, *batch),
+                    )
+        return found
+
+    def set_many(self, model: str, kind: str, vectors: Dict[str, List[float]]) -> None:
+        now = time.time()
+        rows = [(model, kind, key, array("f", vector).tobytes(), now) for key, vector in vectors.items()]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, kind, text_hash, vector, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.execute("COMMIT")
+            self._writes += len(rows)
+            # Trimming scans the table, so only do it every few thousand vectors.
+            if self.max_entries and self._writes >= 4096:
+                self._writes = 0
+                self._conn.execute(
+                    "DELETE FROM embeddings WHERE rowid IN (SELECT rowid FROM embeddings "
+                    "ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                    (int(self.max_entries),),
+                )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings wrapper that only sends texts without a cached vector to the model."""
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        model: str,
+        max_entries: int = 10000,
+        disk_path: Optional[str] = None,
+        disk_max_entries: Optional[int] = 1000000,
+    ) -> None:
+        self.embeddings = embeddings
+        self.model = model
+        self.memory = MemoryTTLCache(max_entries)
+        self.disk = SQLiteVectorCache(disk_path, disk_max_entries) if disk_path else None
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.embedded = 0
+
+    def _lookup(self, kind: str, hashes: List[str]) -> Dict[str, List[float]]:
+        found: Dict[str, List[float]] = {}
+        for key in hashes:
+            vector = self.memory.get(f"{kind}:{key}", _MISSING)
+            if vector is not _MISSING:
+                found[key] = vector
+        memory_hits = len(found)
+        if self.disk is not None and len(found) < len(hashes):
+            from_disk = self.disk.get_many(self.model, kind, [key for key in hashes if key not in found])
+            for key, vector in from_disk.items():
+                self.memory.set(f"{kind}:{key}", vector)
+            found.update(from_disk)
+        with self._lock:
+            self.memory_hits += memory_hits
+            self.disk_hits += len(found) - memory_hits
+            self.misses += len(hashes) - len(found)
+        return found
+
+    def _store(self, kind: str, vectors: Dict[str, List[float]]) -> None:
+        for key, vector in vectors.items():
+            self.memory.set(f"{kind}:{key}", vector)
+        if self.disk is not None and vectors:
+            self.disk.set_many(self.model, kind, vectors)
+        with self._lock:
+            self.embedded += len(vectors)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        hashes = [text_hash(text) for text in texts]
+        unique = list(dict.fromkeys(hashes))
+        found = self._lookup("document", unique)
+        missing = {key: text for key, text in zip(hashes, texts) if key not in found}
+        if missing:
+            vectors = self.embeddings.embed_documents(list(missing.values()))
+            computed = dict(zip(missing, vectors))
+            self._store("document", computed)
+            found.update(computed)
+        return [found[key] for key in hashes]
+
+    def embed_query(self, text: str) -> List[float]:
+        key = text_hash(text)
+        found = self._lookup("query", [key])
+        if key in found:
+            return found[key]
+        vector = self.embeddings.embed_query(text)
+        self._store("query", {key: vector})
+        return vector
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "model": self.model,
+                "memory_entries": len(self.memory),
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "embedded": self.embedded,
+                "hit_rate": hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,237 @@
+"""Small two-tier key/value cache: an in-memory TTL LRU in front of SQLite.
+
+Values are JSON-serialisable. The memory tier is per process; the SQLite
+tier survives restarts and is shared by every process pointing at the same
+file. Both tiers expire entries after ``ttl_seconds`` (``None`` keeps them
+until evicted). The SQLite tier can also be bounded by entry count and by the
+total size of the stored values; the least recently read entries go first.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+_MISSING = object()
+
+
+class MemoryTTLCache:
+    """Thread-safe LRU with an optional per-entry TTL."""
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: Optional[float] = None) -> None:
+        self.max_entries = max(1, int(max_entries))
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at and expires_at < time.time():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        expires_at = time.time() + ttl if ttl else 0.0
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCache:
+    """Persistent JSON key/value table with an optional TTL, entry cap and size cap."""
+
+    def __init__(
+        self,
+        path: str,
+        ttl_seconds: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        table: str = "cache",
+        max_bytes: Optional[int] = None,
+    ) -> None:
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.table = table
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._bytes_since_trim = 0
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_by_access ON {table} (accessed_at)")
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        # SQLite connections must not cross fork(); a forked server worker opens its own
+        # (an in-memory database has nothing to reopen and stays a private copy).
+        if self._connection is None or (self._pid != os.getpid() and self.path != ":memory:"):
+            self._connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._pid = os.getpid()
+        return self._connection
+
+    def get(self, key: str, default: Any = None) -> Any:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return default
+            value, expires_at = row
+            if expires_at and expires_at < now:
+                self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                return default
+            self._conn.execute(f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (now, key))
+        return json.loads(value)
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        now = time.time()
+        expires_at = now + ttl if ttl else 0.0
+        encoded = json.dumps(value, default=str)
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, encoded, expires_at, now),
+            )
+            self._writes += 1
+            self._bytes_since_trim += len(encoded)
+            # Trimming scans the table, so only do it every few hundred writes
+            # (or once 1/16 of the size cap has been written since the last trim).
+            if self._writes % 256 == 0 or (self.max_bytes and self._bytes_since_trim * 16 > self.max_bytes):
+                self._trim(now)
+
+    def _trim(self, now: float) -> None:
+        self._conn.execute(f"DELETE FROM {self.table} WHERE expires_at != 0 AND expires_at < ?", (now,))
+        if self.max_entries:
+            self._conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN (SELECT key FROM {self.table} "
+                f"ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (int(self.max_entries),),
+            )
+        if self.max_bytes:
+            self._conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN (SELECT key FROM (SELECT key, "
+                f"SUM(LENGTH(CAST(value AS BLOB))) OVER (ORDER BY accessed_at DESC) AS kept FROM {self.table}) "
+                f"WHERE kept > ?)",
+                (int(self.max_bytes),),
+            )
+        self._bytes_since_trim = 0
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table}")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+
+class TieredCache:
+    """Memory tier in front of an optional SQLite tier, with per-tier hit counters."""
+
+    def __init__(self, memory: MemoryTTLCache, disk: Optional[SQLiteCache] = None) -> None:
+        self.memory = memory
+        self.disk = disk
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    @staticmethod
+    def create(
+        max_entries: int = 1024,
+        ttl_seconds: Optional[float] = None,
+        disk_path: Optional[str] = None,
+        disk_max_entries: Optional[int] = None,
+        table: str = "cache",
+        disk_max_bytes: Optional[int] = None,
+    ) -> "TieredCache":
+        disk = (
+            SQLiteCache(disk_path, ttl_seconds=ttl_seconds, max_entries=disk_max_entries, table=table, max_bytes=disk_max_bytes)
+            if disk_path else None
+        )
+        return TieredCache(MemoryTTLCache(max_entries, ttl_seconds), disk)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = self.memory.get(key, _MISSING)
+        if value is not _MISSING:
+            with self._lock:
+                self.memory_hits += 1
+            return value
+        if self.disk is not None:
+            value = self.disk.get(key, _MISSING)
+            if value is not _MISSING:
+                self.memory.set(key, value)
+                with self._lock:
+                    self.disk_hits += 1
+                return value
+        with self._lock:
+            self.misses += 1
+        return default
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        self.memory.set(key, value, ttl_seconds)
+        if self.disk is not None:
+            self.disk.set(key, value, ttl_seconds)
+        with self._lock:
+            self.stores += 1
+
+    def delete(self, key: str) -> None:
+        self.memory.delete(key)
+        if self.disk is not None:
+            self.disk.delete(key)
+
+    def clear(self) -> None:
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "memory_entries": len(self.memory),
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "stores": self.stores,
+                "hit_rate": hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,138 @@
+"""In-process BM25 index over vector store chunks, and reciprocal-rank fusion.
+
+Embedding similarity misses exact technical terms: an API name, an acronym or
+an error message. :class:`BM25Index` is an inverted index over the same chunks
+as the vector store, kept in sync by :class:`~base.search_rag.SearchRagManager`
+as chunks are added (and filled from a persistent collection on start), so
+hybrid retrieval can fuse its ranking with the vector ranking by
+:func:`reciprocal_rank_fusion`.
+
+Tokens are lower-cased words and identifiers. Dotted and scoped names are
+indexed whole and by part (``asyncio.gather`` gives ``asyncio.gather``,
+``asyncio`` and ``gather``), and CJK text is indexed per character.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from langchain_core.documents import Document
+
+from base.chunk_ids import document_chunk_id
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9_]+(?:(?:\.|::|->|-)[a-z0-9_]+)*[+#]*|[぀-ヿ㐀-䶿一-鿿가-힯]")
+PART_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    tokens: List[str] = []
+    for token in TOKEN_PATTERN.findall(text.lower()):
+        tokens.append(token)
+        parts = PART_PATTERN.findall(token)
+        if len(parts) > 1 or (parts and parts[0] != token):
+            tokens.extend(parts)
+    return tokens
+
+
+def document_key(document: Document) -> str:
+    return document.id or document_chunk_id(document)
+
+
+class BM25Index:
+    """Incremental Okapi BM25 over documents; safe to add to and search from several threads."""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75) -> None:
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.Lock()
+        self._documents: List[Document] = []
+        self._keys: Dict[str, int] = {}
+        self._lengths: List[int] = []
+        self._postings: Dict[str, Dict[int, int]] = defaultdict(dict)
+        self._total_length = 0
+
+    def add_documents(self, documents: Iterable[Document]) -> int:
+        """Index documents not indexed yet (by id); returns how many were added."""
+        added = 0
+        tokenized = [(document_key(document), document, Counter(tokenize(document.page_content))) for document in documents]
+        with self._lock:
+            for key, document, counts in tokenized:
+                if key in self._keys:
+                    continue
+                index = len(self._documents)
+                self._keys[key] = index
+                self._documents.append(document)
+                length = sum(counts.values())
+                self._lengths.append(length)
+                self._total_length += length
+                for term, count in counts.items():
+                    self._postings[term][index] = count
+                added += 1
+        return added
+
+    def search(self, query: str, k: int = 10) -> List[Tuple[Document, float]]:
+        terms = set(tokenize(query))
+        with self._lock:
+            count = len(self._documents)
+            if not count or not terms:
+                return []
+            average_length = self._total_length / count
+            scores: Dict[int, float] = defaultdict(float)
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for index, frequency in postings.items():
+                    norm = self.k1 * (1 - self.b + self.b * self._lengths[index] / average_length)
+                    scores[index] += idf * frequency * (self.k1 + 1) / (frequency + norm)
+            best = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+            return [(self._documents[index], score) for index, score in best]
+
+    def load(self, vectorstore: Any, batch_size: int = 1000) -> int:
+        """Index every chunk already in a Chroma-style store (one with ``get(limit, offset, include)``)."""
+        if not hasattr(vectorstore, "get"):
+            return 0
+        added = 0
+        offset = 0
+        while True:
+            batch = vectorstore.get(limit=batch_size, offset=offset, include=["documents", "metadatas"])
+            if not batch["ids"]:
+                return added
+            added += self.add_documents(
+                Document(id=record_id, page_content=text or "", metadata=metadata or {})
+                for record_id, text, metadata in zip(batch["ids"], batch["documents"], batch["metadatas"])
+            )
+            offset += len(batch["ids"])
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "documents": len(self._documents),
+                "terms": len(self._postings),
+                "mean_length": self._total_length / len(self._documents) if self._documents else 0.0,
+            }
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[Document]],
+    k: int = 60,
+    weights: Optional[Sequence[float]] = None,
+) -> List[Document]:
+    """Merge rankings by ``sum(weight / (k + rank))`` over the rankings each document appears in."""
+    weights = weights or [1.0] * len(rankings)
+    scores: Dict[str, float] = defaultdict(float)
+    documents: Dict[str, Document] = {}
+    for ranking, weight in zip(rankings, weights):
+        for rank, document in enumerate(ranking, start=1):
+            key = document_key(document)
+            scores[key] += weight / (k + rank)
+            documents.setdefault(key, document)
+    return [documents[key] for key in sorted(scores, key=scores.get, reverse=True)]
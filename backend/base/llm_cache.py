@@ -0,0 +1,123 @@
+"""Response cache for deterministic agent calls.
+
+Every agent runs at temperature 0, so the same model, system prompt and task
+prompt give (practically) the same reply. :class:`LLMResponseCache` keeps the
+reply text of such calls in a :class:`~base.kv_cache.TieredCache` so repeated
+pipeline steps, reruns and retried jobs skip the provider round trip.
+
+Calls are only cached when the model's temperature is 0 and the agent has no
+tools (tool results can change between calls). Caching can be switched off
+per agent by its ``name`` through the ``llm_cache.agents`` config mapping.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+from collections import defaultdict
+from typing import Any, Dict, Optional
+
+from base.kv_cache import TieredCache
+
+logger = logging.getLogger(__name__)
+
+
+def model_fingerprint(model: Any) -> str:
+    """Identity of a chat model's provider, model name and sampling parameters."""
+    try:
+        return model._get_llm_string()
+    except Exception:
+        params = {
+            name: getattr(model, name, None)
+            for name in ("model_name", "model", "temperature", "top_p", "max_tokens", "openai_api_base", "base_url")
+        }
+        return json.dumps([type(model).__name__, params], sort_keys=True, default=str)
+
+
+def is_deterministic(model: Any) -> bool:
+    temperature = getattr(model, "temperature", None)
+    return temperature is not None and float(temperature) == 0.0
+
+
+class LLMResponseCache:
+    """Per-process front end of the response cache, with per-agent hit/miss counters."""
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        max_entries: int = 1024,
+        ttl_seconds: Optional[float] = 86400,
+        disk_path: Optional[str] = None,
+        disk_max_entries: Optional[int] = 100000,
+        agents: Optional[Dict[str, bool]] = None,
+    ) -> None:
+        self._counters: Dict[str, Dict[str, int]] = defaultdict(lambda: {"hits": 0, "misses": 0, "bypassed": 0})
+        self._lock = threading.Lock()
+        self.configure(enabled, max_entries, ttl_seconds, disk_path, disk_max_entries, agents)
+
+    def configure(
+        self,
+        enabled: bool = False,
+        max_entries: int = 1024,
+        ttl_seconds: Optional[float] = 86400,
+        disk_path: Optional[str] = None,
+        disk_max_entries: Optional[int] = 100000,
+        agents: Optional[Dict[str, bool]] = None,
+    ) -> None:
+        self.enabled = enabled
+        self.agents = dict(agents or {})
+        self._store = (
+            TieredCache.create(max_entries, ttl_seconds, disk_path, disk_max_entries, table="llm_responses")
+            if enabled else None
+        )
+        if enabled:
+            logger.info(f"LLM response cache enabled (disk: {disk_path or 'off'})")
+
+    def enabled_for(self, agent_name: str) -> bool:
+        return self.enabled and self.agents.get(agent_name, True)
+
+    @staticmethod
+    def make_key(model: Any, system_prompt: Optional[str], prompt: Any) -> str:
+        canonical = json.dumps(
+            [model_fingerprint(model), system_prompt, prompt], sort_keys=True, separators=(",", ":"), default=str
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def lookup_key(self, agent_name: str, model: Any, system_prompt: Optional[str], prompt: Any, tools: Any = None) -> Optional[str]:
+        """Return the cache key for this call, or ``None`` when it must not be cached."""
+        if not self.enabled_for(agent_name):
+            return None
+        if tools or not is_deterministic(model):
+            self._count(agent_name, "bypassed")
+            return None
+        return self.make_key(model, system_prompt, prompt)
+
+    def get(self, agent_name: str, key: str) -> Optional[Any]:
+        content = self._store.get(key)
+        self._count(agent_name, "misses" if content is None else "hits")
+        return content
+
+    def set(self, key: str, content: Any) -> None:
+        if content:
+            self._store.set(key, content)
+
+    def clear(self) -> None:
+        if self._store is not None:
+            self._store.clear()
+
+    def _count(self, agent_name: str, field: str) -> None:
+        with self._lock:
+            self._counters[agent_name][field] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            by_agent = {name: dict(counts) for name, counts in sorted(self._counters.items())}
+        stats: Dict[str, Any] = {"enabled": self.enabled, "by_agent": by_agent}
+        if self._store is not None:
+            stats.update(self._store.stats())
+        return stats
+
+
+llm_response_cache = LLMResponseCache()
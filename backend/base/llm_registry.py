@@ -0,0 +1,216 @@
+"""Process-wide registry of shared chat model clients.
+
+``LLMFactory.create`` builds a fresh client, and with it a fresh HTTP
+connection pool, on every call. The registry hands out one shared,
+thread-safe client per (provider, model, temperature, base_url, extra kwargs)
+so that keep-alive connections are reused across requests.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import httpx
+from langchain_core.language_models import BaseChatModel
+from omegaconf import DictConfig
+
+from base.llm_factory import LLMFactory
+from base.rate_limiter import llm_rate_limiter
+from utils.config import ensure_config_dict
+
+logger = logging.getLogger(__name__)
+
+# Providers whose LangChain chat models are built on the OpenAI SDK and
+# therefore accept ``http_client`` / ``http_async_client``.
+HTTPX_POOLED_PROVIDERS = {"openai", "azure_openai", "deepseek", "together", "xai"}
+
+RegistryKey = Tuple[Optional[str], Optional[str], float, Optional[str], str]
+
+
+class ConnectionStats:
+    """Counts requests and newly opened TCP connections through httpx traces."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.new_connections = 0
+
+    def _record(self, event_name: str) -> None:
+        if event_name == "connection.connect_tcp.started":
+            with self._lock:
+                self.new_connections += 1
+
+    def _trace(self, event_name: str, info: Dict[str, Any]) -> None:
+        self._record(event_name)
+
+    async def _atrace(self, event_name: str, info: Dict[str, Any]) -> None:
+        self._record(event_name)
+
+    def on_request(self, request: httpx.Request) -> None:
+        with self._lock:
+            self.requests += 1
+        request.extensions["trace"] = self._trace
+
+    async def on_async_request(self, request: httpx.Request) -> None:
+        with self._lock:
+            self.requests += 1
+        request.extensions["trace"] = self._atrace
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            reused = max(0, self.requests - self.new_connections)
+            return {
+                "requests": self.requests,
+                "new_connections": self.new_connections,
+                "reused_connections": reused,
+                "reuse_ratio": reused / self.requests if self.requests else 0.0,
+            }
+
+
+@dataclass
+class _RegistryEntry:
+    client: BaseChatModel
+    stats: Optional[ConnectionStats]
+    created_at: float = field(default_factory=time.time)
+    last_used: float = field(default_factory=time.time)
+    hits: int = 0
+
+
+class LLMClientRegistry:
+    """Thread-safe, size- and idle-bounded cache of chat model clients."""
+
+    def __init__(
+        self,
+        max_clients: int = 16,
+        idle_ttl_seconds: float = 1800,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry_seconds: float = 60.0,
+        timeout_seconds: float = 120.0,
+    ) -> None:
+        self.max_clients = max(1, int(max_clients))
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry_seconds,
+        )
+        self.timeout = httpx.Timeout(timeout_seconds)
+        self._entries: "OrderedDict[RegistryKey, _RegistryEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._evictions = 0
+
+    @staticmethod
+    def from_config(config: Union[DictConfig, Dict[str, Any]]) -> "LLMClientRegistry":
+        config = ensure_config_dict(config)
+        pool_config = (config.get("llm") or {}).get("client_pool") or {}
+        return LLMClientRegistry(**pool_config)
+
+    @staticmethod
+    def _make_key(
+        model: Optional[str],
+        model_provider: Optional[str],
+        temperature: float,
+        base_url: Optional[str],
+        kwargs: Dict[str, Any],
+    ) -> RegistryKey:
+        extra = json.dumps(kwargs, sort_keys=True, default=repr)
+        return (model_provider, model, float(temperature), base_url, extra)
+
+    def get(
+        self,
+        model: Optional[str] = None,
+        model_provider: Optional[str] = None,
+        temperature: float = 0,
+        base_url: Optional[str] = None,
+        **kwargs: Any,
+    ) -> BaseChatModel:
+        """Return the shared client for these parameters, creating it on first use."""
+        key = self._make_key(model, model_provider, temperature, base_url, kwargs)
+        with self._lock:
+            self._evict_idle()
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._create(model, model_provider, temperature, base_url, kwargs)
+                self._entries[key] = entry
+                while len(self._entries) > self.max_clients:
+                    evicted_key, evicted = self._entries.popitem(last=False)
+                    llm_rate_limiter.unregister_model(evicted.client)
+                    self._evictions += 1
+                    logger.info(f"Evicted least recently used LLM client {evicted_key[:2]}")
+            self._entries.move_to_end(key)
+            entry.hits += 1
+            entry.last_used = time.time()
+            return entry.client
+
+    def _create(
+        self,
+        model: Optional[str],
+        model_provider: Optional[str],
+        temperature: float,
+        base_url: Optional[str],
+        kwargs: Dict[str, Any],
+    ) -> _RegistryEntry:
+        stats = None
+        client_kwargs = dict(kwargs)
+        if model_provider in HTTPX_POOLED_PROVIDERS:
+            stats = ConnectionStats()
+            client_kwargs["http_client"] = httpx.Client(
+                limits=self.limits, timeout=self.timeout, event_hooks={"request": [stats.on_request]}
+            )
+            client_kwargs["http_async_client"] = httpx.AsyncClient(
+                limits=self.limits, timeout=self.timeout, event_hooks={"request": [stats.on_async_request]}
+            )
+        logger.info(f"Creating shared LLM client for {model_provider}:{model}")
+        client = LLMFactory.create(
+            model=model,
+            model_provider=model_provider,
+            temperature=temperature,
+            base_url=base_url,
+            **client_kwargs,
+        )
+        llm_rate_limiter.register_model(client, model_provider, model)
+        return _RegistryEntry(client=client, stats=stats)
+
+    def _evict_idle(self) -> None:
+        # Evicted clients are dropped rather than closed: a request that already
+        # holds the instance can still finish, and the pool is released once the
+        # last reference goes away.
+        if not self.idle_ttl_seconds:
+            return
+        deadline = time.time() - self.idle_ttl_seconds
+        for key in [k for k, e in self._entries.items() if e.last_used < deadline]:
+            llm_rate_limiter.unregister_model(self._entries.pop(key).client)
+            self._evictions += 1
+            logger.info(f"Evicted idle LLM client {key[:2]}")
+
+    def clear(self) -> None:
+        with self._lock:
+            for entry in self._entries.values():
+                llm_rate_limiter.unregister_model(entry.client)
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            clients: List[Dict[str, Any]] = []
+            for (provider, model, temperature, base_url, _), entry in self._entries.items():
+                clients.append({
+                    "model_provider": provider,
+                    "model_name": model,
+                    "temperature": temperature,
+                    "base_url": base_url,
+                    "hits": entry.hits,
+                    "idle_seconds": time.time() - entry.last_used,
+                    "connections": entry.stats.snapshot() if entry.stats else None,
+                })
+            return {
+                "max_clients": self.max_clients,
+                "evictions": self._evictions,
+                "clients": clients,
+            }
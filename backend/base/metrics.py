@@ -0,0 +1,150 @@
+"""Prometheus metrics shared by the agents, the search/RAG stack and the server.
+
+Metrics live in the default ``prometheus_client`` registry and are served by
+``GET /metrics``. Components record into the objects below directly; state that
+already has a ``stats()`` method (pools, queues, caches) is exported at scrape
+time by :class:`server.metrics.StatsCollector` instead of being counted twice.
+"""
+
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+
+from langchain_core.embeddings import Embeddings
+from prometheus_client import Counter, Histogram
+
+from base.tracing import span
+
+# LLM calls take seconds to minutes; web and vector operations milliseconds to seconds.
+LLM_BUCKETS = (0.25, 0.5, 1, 2, 5, 10, 20, 30, 60, 120, 300)
+IO_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "genmentor_http_request_seconds",
+    "HTTP request latency by route, until the last body chunk is sent.",
+    ["method", "route", "status"],
+    buckets=LLM_BUCKETS,
+)
+LLM_CALL_SECONDS = Histogram(
+    "genmentor_llm_call_seconds",
+    "Latency of model calls made by an agent (response cache hits excluded).",
+    ["agent", "method"],
+    buckets=LLM_BUCKETS,
+)
+LLM_CALL_ERRORS = Counter(
+    "genmentor_llm_call_errors_total",
+    "Model calls by an agent that raised.",
+    ["agent"],
+)
+LLM_TOKENS = Counter(
+    "genmentor_llm_tokens_total",
+    "Tokens reported by the provider for an agent's model calls.",
+    ["agent", "kind"],
+)
+SEARCH_SECONDS = Histogram(
+    "genmentor_search_seconds",
+    "Latency of one web search query.",
+    ["provider"],
+    buckets=IO_BUCKETS,
+)
+PAGE_LOAD_SECONDS = Histogram(
+    "genmentor_page_load_seconds",
+    "Latency of loading the pages of one search (all URLs together).",
+    ["loader"],
+    buckets=IO_BUCKETS,
+)
+PAGES_LOADED = Counter(
+    "genmentor_pages_loaded_total",
+    "Pages requested and pages actually loaded by the web document loader.",
+    ["loader", "outcome"],
+)
+EMBEDDING_SECONDS = Histogram(
+    "genmentor_embedding_seconds",
+    "Latency of one embedding call.",
+    ["operation"],
+    buckets=IO_BUCKETS,
+)
+EMBEDDING_BATCH_TEXTS = Histogram(
+    "genmentor_embedding_batch_texts",
+    "Texts per forward pass of the ONNX embedding micro-batcher.",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128),
+)
+EMBEDDED_TEXTS = Counter(
+    "genmentor_embedded_texts_total",
+    "Texts sent to the embedding model.",
+    ["operation"],
+)
+INGESTED = Counter(
+    "genmentor_ingested_total",
+    "Pages and chunks offered to the vector store, new or already stored.",
+    ["unit", "outcome"],
+)
+VECTORSTORE_SECONDS = Histogram(
+    "genmentor_vectorstore_seconds",
+    "Latency of vector store operations, embedding included.",
+    ["operation"],
+    buckets=IO_BUCKETS,
+)
+EXECUTOR_QUEUE_SECONDS = Histogram(
+    "genmentor_executor_queue_seconds",
+    "Time agent work waits for a worker thread.",
+    buckets=IO_BUCKETS,
+)
+
+
+@contextmanager
+def observe_seconds(histogram: Any) -> Iterator[None]:
+    """Observe the duration of the block on ``histogram`` (labels already applied)."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.observe(time.perf_counter() - started)
+
+
+def record_token_usage(agent: str, raw_output: Any) -> Dict[str, int]:
+    """Count the input/output tokens reported on the AI messages of an agent run; returns the totals."""
+    totals = {"input": 0, "output": 0}
+    for message in raw_output.get("messages", []) if isinstance(raw_output, dict) else []:
+        usage = getattr(message, "usage_metadata", None)
+        if not usage:
+            continue
+        for kind in totals:
+            tokens = usage.get(f"{kind}_tokens")
+            if tokens:
+                totals[kind] += tokens
+                LLM_TOKENS.labels(agent=agent, kind=kind).inc(tokens)
+    return totals
+
+
+class InstrumentedEmbeddings(Embeddings):
+    """Embeddings wrapper that times and traces every call of the wrapped model."""
+
+    def __init__(self, embeddings: Embeddings) -> None:
+        self.embeddings = embeddings
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        EMBEDDED_TEXTS.labels(operation="documents").inc(len(texts))
+        with span("embedding.embed_documents", **{"genmentor.texts": len(texts)}), \
+                observe_seconds(EMBEDDING_SECONDS.labels(operation="documents")):
+            return self.embeddings.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        EMBEDDED_TEXTS.labels(operation="query").inc()
+        with span("embedding.embed_query", **{"genmentor.texts": 1}), \
+                observe_seconds(EMBEDDING_SECONDS.labels(operation="query")):
+            return self.embeddings.embed_query(text)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        EMBEDDED_TEXTS.labels(operation="documents").inc(len(texts))
+        with span("embedding.embed_documents", **{"genmentor.texts": len(texts)}), \
+                observe_seconds(EMBEDDING_SECONDS.labels(operation="documents")):
+            return await self.embeddings.aembed_documents(texts)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        EMBEDDED_TEXTS.labels(operation="query").inc()
+        with span("embedding.embed_query", **{"genmentor.texts": 1}), \
+                observe_seconds(EMBEDDING_SECONDS.labels(operation="query")):
+            return await self.embeddings.aembed_query(text)
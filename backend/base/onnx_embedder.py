@@ -0,0 +1,257 @@
+"""Sentence-transformers embeddings on ONNX Runtime, with dynamic micro-batching.
+
+:class:`OnnxEmbeddings` runs the ONNX export that sentence-transformers model
+repositories ship under ``onnx/`` with ONNX Runtime on CPU, using the model's own
+tokenizer, pooling and normalisation settings, so vectors match the PyTorch
+backend. With ``quantize`` it loads the repository's int8 variant instead
+(``quantized_file_name``), or quantises ``file_name`` itself with
+``onnxruntime.quantization`` when the repository has none.
+
+Drafter threads call ``add_documents`` with a few chunks each. A
+:class:`MicroBatcher` thread collects the requests that arrive within
+``max_wait_ms`` of each other (up to ``max_batch_size`` texts) and runs them as
+one forward pass, which uses the CPU far better than many small passes.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from base.metrics import EMBEDDING_BATCH_TEXTS
+
+logger = logging.getLogger(__name__)
+
+MODEL_FILES = ["tokenizer.json", "tokenizer_config.json", "modules.json", "sentence_bert_config.json", "1_Pooling/config.json"]
+
+
+def pool(token_embeddings: np.ndarray, attention_mask: np.ndarray, mode: str = "mean", normalize: bool = True) -> np.ndarray:
+    """Sentence vectors from ``[batch, tokens, dim]`` token embeddings, as sentence-transformers pools them."""
+    if mode == "cls":
+        vectors = token_embeddings[:, 0]
+    else:
+        mask = attention_mask[..., None].astype(token_embeddings.dtype)
+        vectors = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+    if normalize:
+        vectors = vectors / np.clip(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12, None)
+    return vectors
+
+
+class MicroBatcher:
+    """Merges concurrent ``encode`` requests from many threads into batched calls on one worker thread."""
+
+    def __init__(
+        self,
+        encode: Callable[[List[str]], Sequence[Sequence[float]]],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+        name: str = "embed-batcher",
+    ) -> None:
+        self.encode = encode
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait_seconds = max(0.0, float(max_wait_ms)) / 1000
+        self.name = name
+        self._queue: "queue.Queue[Optional[Tuple[List[str], Future]]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.texts = 0
+
+    def submit(self, texts: List[str]) -> List[List[float]]:
+        """Encode ``texts`` in the next batch; blocks until its vectors are ready."""
+        if not texts:
+            return []
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+        future: Future = Future()
+        self._queue.put((list(texts), future))
+        return future.result()
+
+    def _collect(self, first: Tuple[List[str], Future]) -> Tuple[List[Tuple[List[str], Future]], bool]:
+        batch = [first]
+        size = len(first[0])
+        deadline = time.monotonic() + self.max_wait_seconds
+        while size < self.max_batch_size:
+            try:
+                item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+            size += len(item[0])
+        return batch, False
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch, stopping = self._collect(first)
+            texts = [text for request_texts, _ in batch for text in request_texts]
+            try:
+                vectors = self.encode(texts)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+            else:
+                start = 0
+                for request_texts, future in batch:
+                    future.set_result([list(map(float, v)) for v in vectors[start:start + len(request_texts)]])
+                    start += len(request_texts)
+            EMBEDDING_BATCH_TEXTS.observe(len(texts))
+            with self._lock:
+                self.batches += 1
+                self.texts += len(texts)
+            if stopping:
+                return
+
+    def close(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "batches": self.batches,
+                "texts": self.texts,
+                "mean_batch_size": self.texts / self.batches if self.batches else 0.0,
+            }
+
+
+class OnnxEmbeddings(Embeddings):
+    """Embeddings of a sentence-transformers model computed with ONNX Runtime."""
+
+    def __init__(
+        self,
+        model_name: str = "sentence-transformers/all-mpnet-base-v2",
+        quantize: bool = False,
+        file_name: str = "onnx/model.onnx",
+        quantized_file_name: str = "onnx/model_quint8_avx2.onnx",
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+        intra_op_threads: int = 0,
+        cache_dir: Optional[str] = None,
+    ) -> None:
+        import onnxruntime
+        from tokenizers import Tokenizer
+
+        self.model_name = model_name
+        model_dir = self._download(model_name, [file_name, quantized_file_name] if quantize else [file_name], cache_dir)
+        onnx_path = self._model_path(model_dir, file_name, quantized_file_name if quantize else None)
+
+        settings = self._read_json(model_dir, "sentence_bert_config.json")
+        pooling = self._read_json(model_dir, "1_Pooling/config.json")
+        modules = self._read_json(model_dir, "modules.json") or []
+        self.pooling_mode = "cls" if pooling.get("pooling_mode_cls_token") else "mean"
+        # Models without a modules.json are assumed to end with Normalize, like all-mpnet-base-v2.
+        self.normalize = not modules or any(m.get("type", "").endswith("Normalize") for m in modules)
+        tokenizer_config = self._read_json(model_dir, "tokenizer_config.json")
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=int(settings.get("max_seq_length", 512)))
+        pad_token = tokenizer_config.get("pad_token") or "[PAD]"
+        if isinstance(pad_token, dict):
+            pad_token = pad_token.get("content", "[PAD]")
+        # Padded per pass in encode(), not here: the tokenizer would pad every text to the longest.
+        self.tokenizer.no_padding()
+        pad_id = self.tokenizer.token_to_id(pad_token)
+        self.pad_id = 0 if pad_id is None else pad_id
+
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if intra_op_threads:
+            options.intra_op_num_threads = int(intra_op_threads)
+        self.session = onnxruntime.InferenceSession(onnx_path, options, providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.batcher = MicroBatcher(self.encode, max_batch_size=self.max_batch_size, max_wait_ms=max_wait_ms)
+        logger.info(f"ONNX embedding model {model_name} loaded from {onnx_path}")
+
+    @staticmethod
+    def _download(model_name: str, files: List[str], cache_dir: Optional[str]) -> str:
+        if os.path.isdir(model_name):
+            return model_name
+        from huggingface_hub import snapshot_download
+
+        return snapshot_download(model_name, allow_patterns=MODEL_FILES + files, cache_dir=cache_dir)
+
+    @staticmethod
+    def _model_path(model_dir: str, file_name: str, quantized_file_name: Optional[str]) -> str:
+        path = os.path.join(model_dir, file_name)
+        if quantized_file_name is None:
+            return path
+        quantized = os.path.join(model_dir, quantized_file_name)
+        if os.path.exists(quantized):
+            return quantized
+        # No int8 export in the repository: quantise the weights here, once.
+        quantized = os.path.splitext(path)[0] + "_int8_dynamic.onnx"
+        if not os.path.exists(quantized):
+            try:
+                from onnxruntime.quantization import QuantType, quantize_dynamic
+            except ImportError as e:
+                # onnxruntime.quantization needs the ``onnx`` package, which is not a pinned dependency.
+                raise ImportError(
+                    f"The model repository has no int8 export at '{quantized_file_name}' and quantising "
+                    f"'{file_name}' locally needs the 'onnx' package ({e}). Install it with "
+                    "`pip install onnx`, set embedding.onnx.quantized_file_name to an int8 file the "
+                    "repository has, or set embedding.onnx.quantize to false."
+                ) from e
+            quantize_dynamic(path, quantized, weight_type=QuantType.QInt8)
+        return quantized
+
+    @staticmethod
+    def _read_json(model_dir: str, name: str) -> Any:
+        path = os.path.join(model_dir, name)
+        if not os.path.exists(path):
+            return {}
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """One or more forward passes of at most ``max_batch_size`` texts; called by the batcher thread."""
+        encodings = self.tokenizer.encode_batch(texts)
+        # Similar lengths in one pass waste less work on padding.
+        order = sorted(range(len(texts)), key=lambda i: len(encodings[i].ids))
+        vectors: List[Optional[np.ndarray]] = [None] * len(texts)
+        for start in range(0, len(order), self.max_batch_size):
+            indices = order[start:start + self.max_batch_size]
+            width = max(len(encodings[i].ids) for i in indices)
+            input_ids = np.full((len(indices), width), self.pad_id, dtype=np.int64)
+            attention_mask = np.zeros((len(indices), width), dtype=np.int64)
+            for row, i in enumerate(indices):
+                ids = encodings[i].ids
+                input_ids[row, :len(ids)] = ids
+                attention_mask[row, :len(ids)] = 1
+            inputs = {"input_ids": input_ids, "attention_mask": attention_mask}
+            if "token_type_ids" in self.input_names:
+                inputs["token_type_ids"] = np.zeros_like(input_ids)
+            token_embeddings = self.session.run(None, {k: v for k, v in inputs.items() if k in self.input_names})[0]
+            pooled = pool(token_embeddings, attention_mask, self.pooling_mode, self.normalize)
+            for i, vector in zip(indices, pooled):
+                vectors[i] = vector
+        return np.stack(vectors) if vectors else np.zeros((0, 0), dtype=np.float32)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.batcher.submit(list(texts))
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.batcher.submit([text])[0]
+
+    def close(self) -> None:
+        self.batcher.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"model": self.model_name, **self.batcher.stats()}
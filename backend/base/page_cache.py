@@ -0,0 +1,157 @@
+"""Cache of fetched web pages, keyed by normalised URL.
+
+The same pages (documentation sites, Wikipedia) come up in the searches for
+many knowledge points and learners. :class:`PageCache` keeps their extracted
+text and metadata in a :class:`~base.kv_cache.TieredCache`, so a page is
+downloaded and parsed once:
+
+- within ``fresh_seconds`` of the last check a cached page is used as is;
+- after that it is revalidated with ``If-None-Match``/``If-Modified-Since``
+  when the site sent an ``ETag`` or ``Last-Modified``; a ``304`` keeps the
+  cached text, anything else replaces it;
+- entries are dropped ``ttl_seconds`` after they were last stored, and the
+  least recently read go first when the disk tier is over ``disk_max_entries``
+  or ``disk_max_bytes``.
+
+Responses with ``Cache-Control: no-store`` are not cached.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Dict, Mapping, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from langchain_core.documents import Document
+
+from base.kv_cache import TieredCache
+
+TRACKING_PARAMS = {"fbclid", "gclid", "msclkid", "mc_cid", "mc_eid", "ref", "ref_src"}
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url: str) -> str:
+    """Cache key of a URL: lower-case scheme and host, no default port, fragment or tracking parameters, sorted query."""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    query = sorted(
+        (name, value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not name.lower().startswith("utm_") and name.lower() not in TRACKING_PARAMS
+    )
+    return urlunsplit((scheme, host, parts.path or "/", urlencode(query), ""))
+
+
+class PageCache:
+    """Extracted pages with HTTP revalidation; shared by the fetch threads of a process."""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        fresh_seconds: float = 86400,
+        ttl_seconds: Optional[float] = 2592000,
+        max_entries: int = 256,
+        disk_path: Optional[str] = None,
+        disk_max_entries: Optional[int] = 20000,
+        disk_max_bytes: Optional[int] = 1024 * 1024 * 1024,
+    ) -> None:
+        self.enabled = enabled
+        self.fresh_seconds = float(fresh_seconds)
+        self._store = (
+            TieredCache.create(
+                max_entries, ttl_seconds, disk_path, disk_max_entries, table="web_pages", disk_max_bytes=disk_max_bytes
+            )
+            if enabled else None
+        )
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.hits = 0
+        self.revalidated = 0
+        self.skipped = 0
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def lookup(self, url: str) -> Optional[Dict[str, Any]]:
+        """The cached entry of ``url`` (fresh or stale), or ``None``.
+
+        Every lookup not followed by :meth:`hit` or :meth:`not_modified` counts as a miss.
+        """
+        if self._store is None:
+            return None
+        self._count("lookups")
+        return self._store.get(normalize_url(url))
+
+    def is_fresh(self, entry: Mapping[str, Any]) -> bool:
+        return time.time() - entry["checked_at"] < self.fresh_seconds
+
+    @staticmethod
+    def validators(entry: Optional[Mapping[str, Any]]) -> Dict[str, str]:
+        """Conditional request headers for a stale entry."""
+        headers: Dict[str, str] = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    @staticmethod
+    def document(url: str, entry: Mapping[str, Any]) -> Document:
+        # A new Document per use: search results annotate their document's metadata.
+        return Document(page_content=entry["content"], metadata={**entry["metadata"], "source": url})
+
+    def hit(self, url: str, entry: Mapping[str, Any]) -> Document:
+        self._count("hits")
+        return self.document(url, entry)
+
+    def not_modified(self, url: str, entry: Dict[str, Any]) -> Document:
+        """The site answered 304: the cached page is fresh for another ``fresh_seconds``."""
+        self._count("revalidated")
+        entry["checked_at"] = time.time()
+        self._store.set(normalize_url(url), entry)
+        return self.document(url, entry)
+
+    def store(self, url: str, document: Document, headers: Mapping[str, str]) -> None:
+        """Cache a freshly downloaded page."""
+        if self._store is None:
+            return
+        if "no-store" in headers.get("cache-control", "").lower():
+            self._count("skipped")
+            self._store.delete(normalize_url(url))
+            return
+        self._store.set(normalize_url(url), {
+            "content": document.page_content,
+            "metadata": dict(document.metadata),
+            "etag": headers.get("etag"),
+            "last_modified": headers.get("last-modified"),
+            "checked_at": time.time(),
+        })
+
+    def clear(self) -> None:
+        if self._store is not None:
+            self._store.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        if self._store is None:
+            return {"enabled": False}
+        tiers = self._store.stats()
+        with self._lock:
+            answered = self.hits + self.revalidated
+            return {
+                "enabled": True,
+                "fresh_seconds": self.fresh_seconds,
+                "hits": self.hits,
+                "revalidated": self.revalidated,
+                "misses": self.lookups - answered,
+                "not_stored": self.skipped,
+                "hit_rate": answered / self.lookups if self.lookups else 0.0,
+                # Where entries were found (fresh or stale).
+                "memory_entries": tiers["memory_entries"],
+                "memory_hits": tiers["memory_hits"],
+                "disk_hits": tiers["disk_hits"],
+            }
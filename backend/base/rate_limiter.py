@@ -0,0 +1,371 @@
+"""Process-wide rate limiting of LLM calls per provider and model.
+
+Each (provider, model) pair gets a :class:`ModelLimiter` with two token
+buckets, one for requests per minute and one for estimated tokens per minute,
+and a cap on calls in flight. ``BaseAgent`` runs every model call through
+:data:`llm_rate_limiter`, so concurrent requests, parallel drafts and batch
+jobs share one budget instead of each assuming it has the provider to itself.
+
+When the provider answers 429 anyway, the limiter backs off: it pauses that
+model for ``Retry-After`` (or an exponentially growing delay), halves the
+admitted rate and then lets it recover gradually on successful calls.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, Optional, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+LimiterKey = Tuple[str, str]
+
+# Rough prompt size estimate used before the provider reports real usage.
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(*texts: Any) -> int:
+    return sum(len(str(text)) for text in texts if text) // CHARS_PER_TOKEN + 1
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """Whether ``error`` is a provider 429, across the SDKs LangChain wraps."""
+    status = getattr(error, "status_code", None) or getattr(getattr(error, "response", None), "status_code", None)
+    if status == 429:
+        return True
+    return "RateLimit" in type(error).__name__
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        value = headers.get("retry-after")
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """Bucket refilled at ``per_minute / 60`` per second, holding at most ``burst``.
+
+    ``reserve`` takes the amount right away, letting the level go negative, and
+    returns how long the caller has to wait for its share; later callers queue
+    behind it.
+    """
+
+    def __init__(self, per_minute: float, burst: Optional[float] = None) -> None:
+        self.per_minute = float(per_minute)
+        self.capacity = float(burst or per_minute)
+        self.level = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float, rate_factor: float) -> None:
+        rate = self.per_minute * rate_factor / 60.0
+        self.level = min(self.capacity, self.level + (now - self._updated) * rate)
+        self._updated = now
+
+    def reserve(self, amount: float, now: float, rate_factor: float = 1.0) -> float:
+        self._refill(now, rate_factor)
+        self.level -= min(amount, self.capacity)
+        if self.level >= 0:
+            return 0.0
+        return -self.level / (self.per_minute * rate_factor / 60.0)
+
+    def adjust(self, amount: float) -> None:
+        """Give back (negative) or take (positive) tokens after the fact."""
+        self.level = min(self.capacity, self.level - amount)
+
+
+class ModelLimiter:
+    """Request, token and concurrency limits for one (provider, model) pair."""
+
+    def __init__(
+        self,
+        key: LimiterKey,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_concurrent: Optional[int] = None,
+        backoff_base_seconds: float = 1.0,
+        backoff_max_seconds: float = 60.0,
+    ) -> None:
+        self.key = key
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.max_concurrent = max_concurrent
+        self._slots = threading.BoundedSemaphore(max_concurrent) if max_concurrent else None
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self._lock = threading.Lock()
+        self.rate_factor = 1.0
+        self._cooldown_until = 0.0
+        self._consecutive_429 = 0
+        self.in_flight = 0
+        self.waiting = 0
+        self.calls = 0
+        self.rate_limited = 0
+        self.throttled_seconds = 0.0
+        self.tokens_used = 0
+
+    def reserve(self, tokens: int) -> float:
+        """Book one request and ``tokens`` tokens; return the wait before sending it."""
+        now = time.monotonic()
+        with self._lock:
+            wait = max(0.0, self._cooldown_until - now)
+            if self.requests is not None:
+                wait = max(wait, self.requests.reserve(1, now, self.rate_factor))
+            if self.tokens is not None:
+                wait = max(wait, self.tokens.reserve(tokens, now, self.rate_factor))
+            self.throttled_seconds += wait
+            return wait
+
+    def settle(self, estimated_tokens: int, actual_tokens: Optional[int]) -> None:
+        """Correct the token bucket with the usage the provider reported and relax the backoff."""
+        with self._lock:
+            self.calls += 1
+            if actual_tokens:
+                self.tokens_used += actual_tokens
+                if self.tokens is not None:
+                    self.tokens.adjust(actual_tokens - estimated_tokens)
+            self._consecutive_429 = 0
+            # Additive recovery after a multiplicative decrease.
+            self.rate_factor = min(1.0, self.rate_factor + 0.05)
+
+    def on_rate_limited(self, retry_after: Optional[float]) -> float:
+        with self._lock:
+            self.rate_limited += 1
+            self._consecutive_429 += 1
+            delay = retry_after or min(
+                self.backoff_max_seconds, self.backoff_base_seconds * 2 ** (self._consecutive_429 - 1)
+            )
+            self._cooldown_until = max(self._cooldown_until, time.monotonic() + delay)
+            self.rate_factor = max(0.1, self.rate_factor / 2)
+        logger.warning(f"Rate limited by {self.key[0]}:{self.key[1]}; pausing {delay:.1f}s")
+        return delay
+
+    def track(self, counter: str, delta: int) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + delta)
+
+    def acquire_slot(self) -> None:
+        if self._slots is not None:
+            self._slots.acquire()
+
+    async def aacquire_slot(self) -> None:
+        # Polling keeps a cancelled waiter from leaking a slot, which an
+        # ``acquire`` parked in a worker thread would do.
+        if self._slots is None:
+            return
+        delay = 0.01
+        while not self._slots.acquire(blocking=False):
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.25)
+
+    def release_slot(self) -> None:
+        if self._slots is not None:
+            self._slots.release()
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            if self.requests is not None:
+                self.requests._refill(now, self.rate_factor)
+            if self.tokens is not None:
+                self.tokens._refill(now, self.rate_factor)
+            return {
+                "provider": self.key[0],
+                "model_name": self.key[1],
+                "requests_per_minute": self.requests.per_minute if self.requests else None,
+                "tokens_per_minute": self.tokens.per_minute if self.tokens else None,
+                "max_concurrent": self.max_concurrent,
+                "available_requests": round(self.requests.level, 2) if self.requests else None,
+                "available_tokens": round(self.tokens.level) if self.tokens else None,
+                "rate_factor": round(self.rate_factor, 3),
+                "cooldown_seconds": round(max(0.0, self._cooldown_until - now), 2),
+                "in_flight": self.in_flight,
+                "waiting": self.waiting,
+                "calls": self.calls,
+                "rate_limited": self.rate_limited,
+                "throttled_seconds": round(self.throttled_seconds, 3),
+                "tokens_used": self.tokens_used,
+            }
+
+
+class LLMRateLimiter:
+    """Registry of :class:`ModelLimiter` objects with per-provider/model limits from config."""
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        max_retries: int = 3,
+        expected_output_tokens: int = 512,
+        backoff_base_seconds: float = 1.0,
+        backoff_max_seconds: float = 60.0,
+        default: Optional[Dict[str, Any]] = None,
+        providers: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> None:
+        self._lock = threading.Lock()
+        self._limiters: Dict[LimiterKey, ModelLimiter] = {}
+        self._models: Dict[int, LimiterKey] = {}
+        self.configure(enabled, max_retries, expected_output_tokens, backoff_base_seconds, backoff_max_seconds, default, providers)
+
+    def configure(
+        self,
+        enabled: bool = False,
+        max_retries: int = 3,
+        expected_output_tokens: int = 512,
+        backoff_base_seconds: float = 1.0,
+        backoff_max_seconds: float = 60.0,
+        default: Optional[Dict[str, Any]] = None,
+        providers: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> None:
+        with self._lock:
+            self.enabled = enabled
+            self.max_retries = max(0, int(max_retries))
+            self.expected_output_tokens = int(expected_output_tokens)
+            self.backoff_base_seconds = backoff_base_seconds
+            self.backoff_max_seconds = backoff_max_seconds
+            self.default_limits = dict(default or {})
+            self.provider_limits = {name: dict(limits or {}) for name, limits in (providers or {}).items()}
+            self._limiters.clear()
+
+    def register_model(self, model: Any, provider: Optional[str], model_name: Optional[str]) -> None:
+        """Remember which (provider, model) a shared client instance belongs to."""
+        with self._lock:
+            self._models[id(model)] = (provider or "unknown", model_name or "unknown")
+
+    def unregister_model(self, model: Any) -> None:
+        with self._lock:
+            self._models.pop(id(model), None)
+
+    def _key_for(self, model: Any) -> LimiterKey:
+        key = self._models.get(id(model))
+        if key is not None:
+            return key
+        model_name = getattr(model, "model_name", None) or getattr(model, "model", None) or "unknown"
+        return (getattr(model, "_llm_type", type(model).__name__), str(model_name))
+
+    def limiter_for(self, model: Any) -> ModelLimiter:
+        with self._lock:
+            key = self._key_for(model)
+            limiter = self._limiters.get(key)
+            if limiter is None:
+                provider, model_name = key
+                # Model-specific limits override provider limits, which override the defaults.
+                limits = {
+                    **self.default_limits,
+                    **self.provider_limits.get(provider, {}),
+                    **self.provider_limits.get(f"{provider}/{model_name}", {}),
+                }
+                limiter = ModelLimiter(
+                    key,
+                    backoff_base_seconds=self.backoff_base_seconds,
+                    backoff_max_seconds=self.backoff_max_seconds,
+                    **limits,
+                )
+                self._limiters[key] = limiter
+            return limiter
+
+    def estimate(self, *texts: Any) -> int:
+        return estimate_tokens(*texts) + self.expected_output_tokens
+
+    @contextmanager
+    def slot(self, model: Any, tokens: int) -> Iterator[Optional[ModelLimiter]]:
+        """Hold a concurrency slot after waiting for the request and token budget."""
+        if not self.enabled:
+            yield None
+            return
+        limiter = self.limiter_for(model)
+        limiter.track("waiting", 1)
+        try:
+            limiter.acquire_slot()
+        finally:
+            limiter.track("waiting", -1)
+        try:
+            wait = limiter.reserve(tokens)
+            if wait:
+                time.sleep(wait)
+            limiter.track("in_flight", 1)
+            try:
+                yield limiter
+            finally:
+                limiter.track("in_flight", -1)
+        finally:
+            limiter.release_slot()
+
+    @asynccontextmanager
+    async def aslot(self, model: Any, tokens: int) -> AsyncIterator[Optional[ModelLimiter]]:
+        if not self.enabled:
+            yield None
+            return
+        limiter = self.limiter_for(model)
+        limiter.track("waiting", 1)
+        try:
+            await limiter.aacquire_slot()
+        finally:
+            limiter.track("waiting", -1)
+        try:
+            wait = limiter.reserve(tokens)
+            if wait:
+                await asyncio.sleep(wait)
+            limiter.track("in_flight", 1)
+            try:
+                yield limiter
+            finally:
+                limiter.track("in_flight", -1)
+        finally:
+            limiter.release_slot()
+
+    def call(self, model: Any, tokens: int, func: Callable[[], T], usage: Callable[[T], Optional[int]] = lambda _: None) -> T:
+        """Run ``func`` within the limits, retrying after 429s up to ``max_retries`` times."""
+        attempt = 0
+        while True:
+            with self.slot(model, tokens) as limiter:
+                try:
+                    result = func()
+                except Exception as e:
+                    if limiter is None or attempt >= self.max_retries or not is_rate_limit_error(e):
+                        raise
+                    limiter.on_rate_limited(retry_after_seconds(e))
+                    attempt += 1
+                    continue
+                if limiter is not None:
+                    limiter.settle(tokens, usage(result))
+                return result
+
+    async def acall(
+        self,
+        model: Any,
+        tokens: int,
+        func: Callable[[], Awaitable[T]],
+        usage: Callable[[T], Optional[int]] = lambda _: None,
+    ) -> T:
+        attempt = 0
+        while True:
+            async with self.aslot(model, tokens) as limiter:
+                try:
+                    result = await func()
+                except Exception as e:
+                    if limiter is None or attempt >= self.max_retries or not is_rate_limit_error(e):
+                        raise
+                    limiter.on_rate_limited(retry_after_seconds(e))
+                    attempt += 1
+                    continue
+                if limiter is not None:
+                    limiter.settle(tokens, usage(result))
+                return result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            limiters = list(self._limiters.values())
+        return {
+            "enabled": self.enabled,
+            "models": [limiter.stats() for limiter in limiters],
+        }
+
+
+llm_rate_limiter = LLMRateLimiter()
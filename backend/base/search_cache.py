@@ -0,0 +1,70 @@
+"""Cache of raw search provider results, keyed by provider and normalised query.
+
+Drafting and chat search for ``f"{session_title} {knowledge_point_name}"``, so
+learners on the same goal send (nearly) the same queries. Queries are compared
+after lower-casing, collapsing whitespace and dropping English stopwords; word
+order is kept. Only non-empty result lists are cached, so a provider hiccup or
+rate-limit answer is retried on the next call.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from base.kv_cache import TieredCache
+
+# Function words that do not change what a web search returns. Negations are
+# deliberately absent, and so are "it", "who", "can" and "may": they are also
+# acronyms and names ("IT project management", "WHO guidelines", "CAN bus").
+STOPWORDS = frozenset("""
+a an the and or of to in on at for from by with about into over as is are was were be been being
+this that these those its how what which whom why when where do does did could should would
+will shall might must i you we they he she me my your our their
+""".split())
+
+
+def normalize_query(query: str) -> str:
+    words = query.lower().split()
+    kept = [word for word in words if word not in STOPWORDS]
+    # A query of stopwords only ("what is this") is kept as typed.
+    return " ".join(kept or words)
+
+
+class SearchResultCache:
+    """Per-process front end of the search result cache."""
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        max_entries: int = 1024,
+        ttl_seconds: Optional[float] = 86400,
+        disk_path: Optional[str] = None,
+        disk_max_entries: Optional[int] = 50000,
+    ) -> None:
+        self.enabled = enabled
+        self._store = (
+            TieredCache.create(max_entries, ttl_seconds, disk_path, disk_max_entries, table="search_results")
+            if enabled else None
+        )
+
+    @staticmethod
+    def key(provider: str, query: str, max_results: int) -> str:
+        return f"{provider}\x1f{max_results}\x1f{normalize_query(query)}"
+
+    def get(self, provider: str, query: str, max_results: int) -> Optional[List[Dict[str, Any]]]:
+        if self._store is None:
+            return None
+        return self._store.get(self.key(provider, query, max_results))
+
+    def set(self, provider: str, query: str, max_results: int, results: List[Dict[str, Any]]) -> None:
+        if self._store is not None and results:
+            self._store.set(self.key(provider, query, max_results), results)
+
+    def clear(self) -> None:
+        if self._store is not None:
+            self._store.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        if self._store is None:
+            return {"enabled": False}
+        return {"enabled": True, **self._store.stats()}
@@ -1,6 +1,7 @@
 import os
 import logging
-from typing import List, Optional, Dict, Any, Union
+import threading
+from typing import Callable, List, Optional, Dict, Any, Union
 from omegaconf import DictConfig
 
 from langchain_core.documents import Document
@@ -9,9 +10,16 @@ from langchain_core.vectorstores import VectorStore
 from langchain_text_splitters.base import TextSplitter
 
 from base.dataclass import SearchResult
+from base.chunk_ids import chunk_id, document_chunk_id
 from base.embedder_factory import EmbedderFactory
+from base.embedding_cache import CachedEmbeddings
+from base.kv_cache import MemoryTTLCache
+from base.lexical_index import BM25Index, reciprocal_rank_fusion
+from base.metrics import INGESTED, VECTORSTORE_SECONDS, InstrumentedEmbeddings, observe_seconds
+from base.tracing import span
 from base.searcher_factory import SearcherFactory, SearchRunner
 from base.rag_factory import TextSplitterFactory, VectorStoreFactory
+from base.vector_owner import RemoteEmbeddings, RemoteVectorStore, VectorOwnerClient
 from utils.config import ensure_config_dict
 
 logger = logging.getLogger(__name__)
@@ -21,27 +29,128 @@ class SearchRagManager:
 
     def __init__(
         self, 
-        embedder: Embeddings,
+        embedder: Optional[Embeddings] = None,
         text_splitter: Optional[TextSplitter] = None,
         vectorstore: Optional[VectorStore] = None,
         search_runner: Optional[SearchRunner] = None,
         max_retrieval_results: int = 5,
+        *,
+        embedder_factory: Optional[Callable[[], Embeddings]] = None,
+        vectorstore_factory: Optional[Callable[[Embeddings], VectorStore]] = None,
+        retrieval_mode: str = "vector",
+        hybrid_candidates: int = 20,
+        rrf_k: int = 60,
     ):
-        self.embedder = embedder
+        if retrieval_mode not in ("vector", "hybrid"):
+            raise ValueError(f"Unsupported retrieval mode: {retrieval_mode}")
+        self._embedder = embedder
+        self._vectorstore = vectorstore
+        self._embedder_factory = embedder_factory
+        self._vectorstore_factory = vectorstore_factory
+        self._init_lock = threading.Lock()
         self.text_splitter = text_splitter
-        self.vectorstore = vectorstore
         self.search_runner = search_runner
         self.max_retrieval_results = max_retrieval_results
+        self.retrieval_mode = retrieval_mode
+        self.hybrid_candidates = hybrid_candidates
+        self.rrf_k = rrf_k
+        self._lexical_index: Optional[BM25Index] = None
+        # Pages this process has already added, by source and content: not even split again.
+        self._ingested_pages = MemoryTTLCache(max_entries=10000)
+
+    @property
+    def embedder(self) -> Optional[Embeddings]:
+        """The embedding model; with a factory it is loaded on first use."""
+        if self._embedder is None and self._embedder_factory is not None:
+            with self._init_lock:
+                if self._embedder is None:
+                    self._embedder = self._embedder_factory()
+        return self._embedder
+
+    @property
+    def vectorstore(self) -> Optional[VectorStore]:
+        """The vector store; with a factory it is opened on first use."""
+        if self._vectorstore is None and self._vectorstore_factory is not None:
+            embedder = self.embedder
+            with self._init_lock:
+                if self._vectorstore is None:
+                    self._vectorstore = self._vectorstore_factory(embedder)
+        return self._vectorstore
+
+    @property
+    def lexical_index(self) -> Optional[BM25Index]:
+        """BM25 index of the stored chunks for hybrid retrieval, filled from the vector store on first use.
+
+        ``None`` in vector mode, and in workers whose store is the owner's: the owner keeps the index.
+        """
+        if self.retrieval_mode != "hybrid" or isinstance(self.vectorstore, RemoteVectorStore):
+            return None
+        if self._lexical_index is None:
+            vectorstore = self.vectorstore
+            with self._init_lock:
+                if self._lexical_index is None:
+                    index = BM25Index()
+                    with span("rag.lexical_index.load"):
+                        loaded = index.load(vectorstore)
+                    logger.info(f"Indexed {loaded} stored chunks for lexical search.")
+                    self._lexical_index = index
+        return self._lexical_index
+
+    @property
+    def initialized(self) -> bool:
+        """Whether the embedding model and vector store have been created."""
+        return (self._embedder is not None or self._embedder_factory is None) and (
+            self._vectorstore is not None or self._vectorstore_factory is None
+        )
+
+    def warm_up(self) -> None:
+        """Load the embedding model, open the vector store and embed once, ahead of the first request."""
+        if self.embedder is not None:
+            self.embedder.embed_query("warm-up")
+        _ = self.vectorstore
+        _ = self.lexical_index
 
     @staticmethod
     def from_config(
         config: Union[DictConfig, Dict[str, Any]],
     ) -> "SearchRagManager":
+        """Build a manager whose embedding model and vector store are created on first use.
+
+        Call :meth:`warm_up` to create them ahead of time.
+        """
         config = ensure_config_dict(config)
-        embedder = EmbedderFactory.create(
-            model=config.get("embedder", {}).get("model_name", "sentence-transformers/all-mpnet-base-v2"),
-            model_provider=config.get("embedder", {}).get("provider", "huggingface"),
-        )
+        # In multi-process serving the model and the store live in the owner process.
+        owner = VectorOwnerClient.from_env()
+
+        embedding_config = config.get("embedding", {})
+
+        def create_embedder() -> Embeddings:
+            if owner is not None:
+                return InstrumentedEmbeddings(RemoteEmbeddings(owner))
+            model_name = embedding_config.get("model_name", "sentence-transformers/all-mpnet-base-v2")
+            provider = embedding_config.get("provider", "huggingface")
+            # Instrumented inside the cache, so the embedding metrics count model calls only.
+            backend = embedding_config.get("backend", "torch")
+            onnx_config = dict(embedding_config.get("onnx") or {}) if backend == "onnx" else {}
+            embedder = InstrumentedEmbeddings(EmbedderFactory.create(
+                model=model_name, model_provider=provider, backend=backend, **onnx_config
+            ))
+            cache_config = dict(embedding_config.get("cache") or {})
+            if not cache_config.pop("enabled", False):
+                return embedder
+            # Quantised vectors differ from full-precision ones, so they are cached apart.
+            cache_model = f"{provider}:{model_name}" + (":int8" if onnx_config.get("quantize") else "")
+            return CachedEmbeddings(embedder, model=cache_model, **cache_config)
+
+        def create_vectorstore(embedder: Embeddings) -> VectorStore:
+            if owner is not None:
+                return RemoteVectorStore(owner, embedding=embedder)
+            return VectorStoreFactory.create(
+                vectorstore_type=config.get("vectorstore", {}).get("type", "chroma"),
+                collection_name=config.get("vectorstore", {}).get("collection_name", "default_collection"),
+                persist_directory=config.get("vectorstore", {}).get("persist_directory", "./data/vectorstore"),
+                embedder=embedder,
+            )
 
         text_splitter = TextSplitterFactory.create(
             splitter_type=config.get("rag", {}).get("text_splitter_type", "recursive_character"),
@@ -49,26 +158,32 @@ class SearchRagManager:
             chunk_overlap=config.get("rag", {}).get("chunk_overlap", 0),
         )
 
-        vectorstore = VectorStoreFactory.create(
-            vectorstore_type=config.get("vectorstore", {}).get("type", "chroma"),
-            collection_name=config.get("vectorstore", {}).get("collection_name", "default_collection"),
-            persist_directory=config.get("vectorstore", {}).get("persist_directory", "./data/vectorstore"),
-            embedder=embedder,
-        )
-
         search_runner = SearchRunner.from_config(
             config=config
         )
 
         return SearchRagManager(
-            embedder=embedder,
             text_splitter=text_splitter,
-            vectorstore=vectorstore,
             search_runner=search_runner,
             max_retrieval_results=config.get("rag", {}).get("num_retrieval_results", 5),
+            embedder_factory=create_embedder,
+            vectorstore_factory=create_vectorstore,
+            retrieval_mode=config.get("rag", {}).get("retrieval_mode", "vector"),
+            hybrid_candidates=config.get("rag", {}).get("hybrid", {}).get("candidates", 20),
+            rrf_k=config.get("rag", {}).get("hybrid", {}).get("rrf_k", 60),
         )
 
 
+    def stats(self) -> Dict[str, Any]:
+        # Reads the components as they are: stats never load the model.
+        stats: Dict[str, Any] = {"initialized": self.initialized}
+        if isinstance(self._embedder, CachedEmbeddings):
+            stats["embedding_cache"] = self._embedder.stats()
+        stats["retrieval_mode"] = self.retrieval_mode
+        if self._lexical_index is not None:
+            stats["lexical_index"] = self._lexical_index.stats()
+        return stats
+
     def search(self, query: str) -> List[SearchResult]:
         if not self.search_runner:
             raise ValueError("SearcherRunner is not initialized.")
@@ -90,19 +205,94 @@ class SearchRagManager:
         if source_type:
             for doc in documents:
                 doc.metadata["source_type"] = source_type
+        page_keys = {document_chunk_id(doc) for doc in documents}
+        new_pages = [doc for doc in documents if self._ingested_pages.get(document_chunk_id(doc)) is None]
+        INGESTED.labels(unit="page", outcome="existing").inc(len(documents) - len(new_pages))
+        INGESTED.labels(unit="page", outcome="new").inc(len(new_pages))
         if self.text_splitter:
-            split_docs = self.text_splitter.split_documents(documents)
+            with span("rag.split", **{"genmentor.documents": len(new_pages)}):
+                split_docs = self.text_splitter.split_documents(new_pages)
         else:
-            split_docs = documents
-        self.vectorstore.add_documents(split_docs, embedding_function=self.embedder)
-        logger.info(f"Added {len(split_docs)} documents to the vectorstore.")
+            split_docs = new_pages
+        # Stable ids: the same chunk of the same page always gets the same id.
+        chunks: Dict[str, Document] = {}
+        for chunk in split_docs:
+            chunk.id = chunk_id(chunk.metadata.get("source"), chunk.page_content)
+            chunks.setdefault(chunk.id, chunk)
+        stored = self._stored_ids(list(chunks))
+        new_chunks = [chunk for chunk_key, chunk in chunks.items() if chunk_key not in stored]
+        INGESTED.labels(unit="chunk", outcome="existing").inc(len(split_docs) - len(new_chunks))
+        INGESTED.labels(unit="chunk", outcome="new").inc(len(new_chunks))
+        if new_chunks:
+            with span("vectorstore.add_documents", **{"genmentor.chunks": len(new_chunks)}), \
+                    observe_seconds(VECTORSTORE_SECONDS.labels(operation="add_documents")):
+                self.vectorstore.add_documents(new_chunks, embedding_function=self.embedder)
+            # After the store, so the index never returns a chunk the store does not have.
+            if self.lexical_index is not None:
+                self.lexical_index.add_documents(new_chunks)
+        for key in page_keys:
+            self._ingested_pages.set(key, True)
+        logger.info(f"Added {len(new_chunks)} of {len(split_docs)} chunks to the vectorstore.")
+
+    def _stored_ids(self, ids: List[str]) -> set:
+        """The subset of ``ids`` already in the vector store."""
+        if not ids:
+            return set()
+        try:
+            with span("vectorstore.get_by_ids", **{"genmentor.chunks": len(ids)}), \
+                    observe_seconds(VECTORSTORE_SECONDS.labels(operation="get_by_ids")):
+                return {doc.id for doc in self.vectorstore.get_by_ids(ids)}
+        except NotImplementedError:
+            # Stores without lookups still upsert by id, they just embed again.
+            return set()
 
     def retrieve(self, query: str, k: Optional[int] = None) -> List[Document]:
+        """The ``k`` chunks most relevant to ``query``.
+
+        In hybrid mode the top ``hybrid_candidates`` of the vector search and of
+        the BM25 index are merged by reciprocal-rank fusion, so chunks naming the
+        exact terms of the query rank high even when their embeddings do not.
+        """
         k = k or self.max_retrieval_results
         if not self.vectorstore:
             raise ValueError("VectorStore is not initialized.")
-        retrieval = self.vectorstore.similarity_search(query, k=k)
-        return retrieval
+        if self.retrieval_mode != "hybrid":
+            return self._similarity_search(query, k)
+        candidates = max(k, self.hybrid_candidates)
+        with span("rag.hybrid_retrieve", **{"genmentor.k": k, "genmentor.candidates": candidates}):
+            rankings = [self._similarity_search(query, candidates), self._lexical_search(query, candidates)]
+            return reciprocal_rank_fusion(rankings, k=self.rrf_k)[:k]
+
+    def _similarity_search(self, query: str, k: int) -> List[Document]:
+        with span("vectorstore.similarity_search", **{"genmentor.k": k}), \
+                observe_seconds(VECTORSTORE_SECONDS.labels(operation="similarity_search")):
+            return self.vectorstore.similarity_search(query, k=k)
+
+    def _lexical_search(self, query: str, k: int) -> List[Document]:
+        with span("rag.lexical_search", **{"genmentor.k": k}), \
+                observe_seconds(VECTORSTORE_SECONDS.labels(operation="lexical_search")):
+            if isinstance(self.vectorstore, RemoteVectorStore):
+                return self.vectorstore.lexical_search(query, k)
+            return [document for document, _ in self.lexical_index.search(query, k)]
+
+    def prefetch(self, queries: List[str], max_workers: int = 3) -> int:
+        """Search all ``queries`` in one pass and index the pages they return.
+
+        Pages shared by several queries are loaded and embedded once; callers
+        then use :meth:`retrieve` per query instead of :meth:`invoke`.
+        Returns the number of distinct documents indexed.
+        """
+        if not self.search_runner:
+            raise ValueError("SearcherRunner is not initialized.")
+        results_by_query = self.search_runner.invoke_many(queries, max_workers=max_workers)
+        documents = {
+            res.link: res.document
+            for results in results_by_query.values()
+            for res in results
+            if res.document is not None
+        }
+        self.add_documents(documents=list(documents.values()))
+        return len(documents)
 
     def invoke(self, query: str) -> List[Document]:
         results = self.search(query)
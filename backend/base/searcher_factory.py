@@ -6,14 +6,23 @@ instead of hand-written HTTP code. It supports Bing, Tavily, and Serper.dev.
 
 from __future__ import annotations
 
+import logging
 from pydoc import doc
-from typing import Any, Dict, List, Union, cast
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Union, cast
 from langchain_core.documents import Document
+from opentelemetry import trace
 from .dataclass import SearchResult
+from .search_cache import SearchResultCache
+from .metrics import PAGE_LOAD_SECONDS, PAGES_LOADED, SEARCH_SECONDS, observe_seconds
+from .tracing import span, with_current_context
+from .web_fetcher import page_fetcher
 from pydantic import BaseModel
 from omegaconf import OmegaConf, DictConfig
 from utils.config import ensure_config_dict
 
+logger = logging.getLogger(__name__)
+
 
 class SearcherFactory:
     """Create concise searchers backed by LangChain community utilities."""
@@ -45,26 +54,36 @@ class SearcherFactory:
 class WebDocumentLoader:
 
     @staticmethod
-    def invoke(urls: List[str], loader_type: str = "web") -> List[Document]:
-        """Load documents from the provided URLs using the specified loader."""
+    def invoke(urls: List[str], loader_type: str = "web") -> List[Optional[Document]]:
+        """Load documents from the provided URLs using the specified loader.
+
+        The result is aligned with ``urls``: position ``i`` holds the document of
+        ``urls[i]``, or ``None`` if that page could not be loaded.
+        """
         if not urls:
             return []
-        if loader_type == "docling":
-            from langchain_docling import DoclingLoader
-            loader = DoclingLoader(urls)
-        elif loader_type == "web":
-            from langchain_community.document_loaders import WebBaseLoader
-            import bs4
-            # bs4_strainer = bs4.SoupStrainer(class_=("post-title", "post-header", "post-content"))
-            # loader = WebBaseLoader(urls, bs_kwargs={"parse_only": bs4_strainer},)
-            # 'verify':False, 
-            loader = WebBaseLoader(urls, requests_kwargs={'timeout':10})
-        try:
-            documents = loader.load()
-        except Exception as e:
-            print(f"Error loading documents from URLs: {e}")
-            documents = []
-        return documents
+        if loader_type == "web":
+            return page_fetcher.fetch_many(urls)
+        if loader_type != "docling":
+            raise ValueError(f"Unsupported loader type: {loader_type}")
+        from langchain_docling import DoclingLoader
+        loader = DoclingLoader(urls)
+        with span("web_loader.load", **{"genmentor.loader": loader_type, "genmentor.urls": len(urls)}) as current_span:
+            try:
+                with observe_seconds(PAGE_LOAD_SECONDS.labels(loader=loader_type)):
+                    documents = loader.load()
+            except Exception as e:
+                logger.warning(f"Loading {len(urls)} URLs with {loader_type} failed: {e}")
+                current_span.record_exception(e)
+                documents = []
+            current_span.set_attribute("genmentor.documents", len(documents))
+        PAGES_LOADED.labels(loader=loader_type, outcome="requested").inc(len(urls))
+        PAGES_LOADED.labels(loader=loader_type, outcome="loaded").inc(len(documents))
+        # Docling splits a page into several documents; keep the first per source.
+        by_source: Dict[str, Document] = {}
+        for document in documents:
+            by_source.setdefault(document.metadata.get("source", ""), document)
+        return [by_source.get(url) for url in urls]
 
 
 class SearchRunner:
@@ -75,11 +94,13 @@ class SearchRunner:
             searcher: BaseModel,
             loader_type: str = "web",
             max_search_results: int = 5,
+            cache: Optional[SearchResultCache] = None,
             **kwargs: Any
         ) -> None:
         self.searcher = searcher
         self.loader_type = loader_type
         self.max_search_results = max_search_results
+        self.cache = cache or SearchResultCache(enabled=False)
 
     @staticmethod
     def from_config(
@@ -95,16 +116,60 @@ class SearchRunner:
             searcher=searcher,
             loader_type=config_dict.get("search", {}).get("loader_type", "web"),
             max_search_results=config_dict.get("search", {}).get("max_results", 5),
+            cache=SearchResultCache(**(config_dict.get("search", {}).get("cache") or {})),
         )
 
+    def _search(self, query: str) -> List[Dict[str, Any]]:
+        provider = type(self.searcher).__name__
+        with span("search.query", **{"genmentor.search.provider": provider, "genmentor.search.query": query}) as current_span:
+            results = self.cache.get(provider, query, self.max_search_results)
+            current_span.set_attribute("genmentor.cache_hit", results is not None)
+            if results is None:
+                with observe_seconds(SEARCH_SECONDS.labels(provider=provider)):
+                    results = self.searcher.results(query, max_results=self.max_search_results)
+                self.cache.set(provider, query, self.max_search_results, results)
+            current_span.set_attribute("genmentor.search.results", len(results))
+            return results
+
+    def stats(self) -> Dict[str, Any]:
+        return {"provider": type(self.searcher).__name__, "cache": self.cache.stats()}
+
     def invoke(self, query: str) -> List[SearchResult]:
         """Perform a search and return structured results."""
-        raw_results = self.searcher.results(query, max_results=self.max_search_results)
-        urls = [item.get("link", "") for item in raw_results if item.get("link")]
-        url_contents = WebDocumentLoader.invoke(urls, loader_type=self.loader_type)
-        url_docs_dict = {url: doc for url, doc in zip(urls, url_contents)}
-        url_content_dict = {url: doc.page_content for url, doc in url_docs_dict.items()}
+        with span("search.invoke", **{"genmentor.search.query": query}):
+            raw_results = self._search(query)
+            urls = [item.get("link", "") for item in raw_results if item.get("link")]
+            url_contents = WebDocumentLoader.invoke(urls, loader_type=self.loader_type)
+            url_docs_dict = {url: doc for url, doc in zip(urls, url_contents) if doc is not None}
+            return self._structure_results(raw_results, url_docs_dict)
+
+    def invoke_many(self, queries: Sequence[str], max_workers: int = 3) -> Dict[str, List[SearchResult]]:
+        """Search several queries at once, loading each distinct URL only once."""
+        queries = list(dict.fromkeys(q for q in queries if q))
+        if not queries:
+            return {}
+        def search_one(query: str) -> List[Dict[str, Any]]:
+            try:
+                return self._search(query)
+            except Exception as e:
+                # One failed query leaves the others' results; it searches as finding nothing.
+                logger.warning(f"Search for '{query}' failed: {e}")
+                trace.get_current_span().record_exception(e, attributes={"genmentor.search.query": query})
+                return []
+
+        with span("search.invoke_many", **{"genmentor.search.queries": len(queries)}):
+            with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+                raw_by_query = dict(zip(queries, executor.map(with_current_context(search_one), queries)))
+            urls = list(dict.fromkeys(
+                item.get("link", "") for raw in raw_by_query.values() for item in raw if item.get("link")
+            ))
+            url_contents = WebDocumentLoader.invoke(urls, loader_type=self.loader_type)
+            url_docs_dict = {url: doc for url, doc in zip(urls, url_contents) if doc is not None}
+            return {query: self._structure_results(raw, url_docs_dict) for query, raw in raw_by_query.items()}
 
+    @staticmethod
+    def _structure_results(raw_results: List[Dict[str, Any]], url_docs_dict: Dict[str, Document]) -> List[SearchResult]:
+        url_content_dict = {url: doc.page_content for url, doc in url_docs_dict.items()}
         structured_results: List[SearchResult] = []
         for item in raw_results:
             doc = url_docs_dict.get(item.get("link", ""), None)
@@ -0,0 +1,139 @@
+"""OpenTelemetry tracing for the agent and search/RAG pipeline.
+
+Components create spans through :func:`span` on the ``genmentor`` tracer. Until
+:func:`setup_tracing` installs an SDK provider those spans are no-ops, so
+library code and scripts pay nothing when tracing is off.
+
+Exporters:
+
+- ``console``: human-readable spans on stdout
+- ``otlp_file``: one OTLP/JSON ``ExportTraceServiceRequest`` per line, the
+  format read by the OpenTelemetry Collector ``otlpjsonfile`` receiver and
+  importable into Jaeger or similar tools for offline critical-path analysis
+- ``otlp``: OTLP/gRPC to a collector at ``endpoint``
+
+Trace context lives in context variables: asyncio tasks, ``asyncio.to_thread``
+and :class:`server.executor.AgentExecutor` carry it along. Plain thread pools do
+not, so functions submitted to them are wrapped with :func:`with_current_context`.
+"""
+
+from __future__ import annotations
+
+import functools
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Sequence, TypeVar, Union
+
+from omegaconf import DictConfig
+from google.protobuf.json_format import MessageToJson
+from opentelemetry import context as otel_context
+from opentelemetry import trace
+from opentelemetry.exporter.otlp.proto.common.trace_encoder import encode_spans
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter, SpanExporter, SpanExportResult
+from opentelemetry.sdk.trace.sampling import ParentBasedTraceIdRatio
+from opentelemetry.trace import Span
+
+from utils.config import ensure_config_dict
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+tracer = trace.get_tracer("genmentor")
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Span]:
+    """Start a child span of the current one; ``None`` attributes are skipped.
+
+    Exceptions leaving the block are recorded on the span and mark it as failed.
+    """
+    with tracer.start_as_current_span(name) as current:
+        for key, value in attributes.items():
+            if value is not None:
+                current.set_attribute(key, value)
+        yield current
+
+
+def with_current_context(func: Callable[..., T]) -> Callable[..., T]:
+    """Bind ``func`` to the caller's trace context, for submission to a thread pool."""
+    parent = otel_context.get_current()
+
+    @functools.wraps(func)
+    def run(*args: Any, **kwargs: Any) -> T:
+        token = otel_context.attach(parent)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            otel_context.detach(token)
+
+    return run
+
+
+class OTLPJsonFileSpanExporter(SpanExporter):
+    """Appends finished spans to a file as OTLP/JSON lines."""
+
+    def __init__(self, file_path: str) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+        self._file = open(file_path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        line = MessageToJson(encode_spans(spans), indent=None).replace("\n", "")
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+        return SpanExportResult.SUCCESS
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        with self._lock:
+            self._file.flush()
+        return True
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+def _make_exporter(exporter: str, file_path: str, endpoint: Optional[str]) -> SpanExporter:
+    if exporter == "console":
+        return ConsoleSpanExporter()
+    if exporter == "otlp_file":
+        return OTLPJsonFileSpanExporter(file_path)
+    if exporter == "otlp":
+        from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+        return OTLPSpanExporter(endpoint=endpoint) if endpoint else OTLPSpanExporter()
+    raise ValueError(f"Unsupported tracing exporter: {exporter}. Choose from 'console', 'otlp_file', 'otlp'.")
+
+
+def setup_tracing(config: Union[DictConfig, Dict[str, Any]]) -> bool:
+    """Install a tracer provider from the ``tracing`` config section; returns whether tracing is on."""
+    config = ensure_config_dict(config)
+    tracing_config = config.get("tracing") or {}
+    if not tracing_config.get("enabled", False):
+        return False
+    exporter_name = tracing_config.get("exporter", "otlp_file")
+    exporter = _make_exporter(
+        exporter_name,
+        tracing_config.get("file_path", "data/traces.jsonl"),
+        tracing_config.get("endpoint"),
+    )
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": tracing_config.get("service_name", "genmentor-backend")}),
+        sampler=ParentBasedTraceIdRatio(float(tracing_config.get("sample_ratio", 1.0))),
+    )
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+    logger.info(f"Tracing enabled with the {exporter_name} exporter")
+    return True
+
+
+def shutdown_tracing() -> None:
+    """Flush and stop the SDK provider, if one was installed."""
+    provider = trace.get_tracer_provider()
+    if hasattr(provider, "shutdown"):
+        provider.shutdown()
@@ -0,0 +1,278 @@
+"""One process owns the embedding model and the vector store; server workers call it over local IPC.
+
+With several server workers (see ``serve.py``) each would otherwise load its own
+copy of the embedding model and write to the same persistent Chroma directory.
+Instead the master starts one owner process running :func:`run_vector_owner`,
+and :meth:`SearchRagManager.from_config` hands every worker a
+:class:`RemoteEmbeddings` and :class:`RemoteVectorStore` when
+``GENMENTOR_VECTOR_OWNER`` names the owner's socket. Web search, page loading
+and text splitting stay in the workers; only embedding and vector store calls
+cross the socket. Requests and replies are pickled over
+``multiprocessing.connection``; the owner applies writes one at a time.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from multiprocessing.connection import Client, Connection, Listener
+from multiprocessing import AuthenticationError
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+from omegaconf import DictConfig
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+from base.chunk_ids import chunk_id
+from base.lexical_index import BM25Index
+
+logger = logging.getLogger(__name__)
+
+VECTOR_OWNER_ENV = "GENMENTOR_VECTOR_OWNER"
+VECTOR_OWNER_AUTHKEY_ENV = "GENMENTOR_VECTOR_OWNER_AUTHKEY"
+
+
+class VectorOwnerError(RuntimeError):
+    """Raised in a worker when the owner process fails a request or cannot be reached."""
+
+
+class VectorOwnerClient:
+    """Worker side of the owner socket; one connection per thread, reopened after fork."""
+
+    def __init__(self, address: str, authkey: bytes, connect_timeout_seconds: float = 60.0) -> None:
+        self.address = address
+        self.authkey = authkey
+        self.connect_timeout_seconds = connect_timeout_seconds
+        self._local = threading.local()
+
+    @staticmethod
+    def from_env() -> Optional["VectorOwnerClient"]:
+        address = os.environ.get(VECTOR_OWNER_ENV)
+        if not address:
+            return None
+        return VectorOwnerClient(address, bytes.fromhex(os.environ.get(VECTOR_OWNER_AUTHKEY_ENV, "")))
+
+    def _connect(self) -> Connection:
+        # The owner may still be loading its model (or restarting), so keep trying for a while.
+        deadline = time.monotonic() + self.connect_timeout_seconds
+        while True:
+            try:
+                return Client(self.address, family="AF_UNIX", authkey=self.authkey)
+            except (FileNotFoundError, ConnectionRefusedError) as e:
+                if time.monotonic() >= deadline:
+                    raise VectorOwnerError(f"Vector owner at {self.address} is not reachable: {e}") from e
+                time.sleep(0.1)
+
+    def _connection(self) -> Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = self._connect()
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _drop_connection(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        self._local.conn = None
+        if conn is not None:
+            try:
+                conn.close()
+            except OSError:
+                pass
+
+    def call(self, op: str, *args: Any) -> Any:
+        try:
+            conn = self._connection()
+            conn.send((op, args))
+        except (OSError, EOFError):
+            # A connection left over from before an owner restart; the request was not sent.
+            self._drop_connection()
+            conn = self._connection()
+            conn.send((op, args))
+        try:
+            status, payload = conn.recv()
+        except (OSError, EOFError) as e:
+            # The request may or may not have been applied, so it is not retried.
+            self._drop_connection()
+            raise VectorOwnerError(f"Lost the vector owner connection during '{op}'") from e
+        if status == "error":
+            raise VectorOwnerError(payload)
+        return payload
+
+    def ping(self) -> bool:
+        return self.call("ping") == "pong"
+
+    def stats(self) -> Dict[str, Any]:
+        return self.call("stats")
+
+    def close(self) -> None:
+        self._drop_connection()
+
+
+class RemoteEmbeddings(Embeddings):
+    """Embeddings computed by the owner process's model."""
+
+    def __init__(self, client: VectorOwnerClient) -> None:
+        self.client = client
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.client.call("embed_documents", list(texts))
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.client.call("embed_query", text)
+
+
+class RemoteVectorStore(VectorStore):
+    """Vector store living in the owner process; documents are embedded there."""
+
+    def __init__(self, client: VectorOwnerClient, embedding: Optional[Embeddings] = None) -> None:
+        self.client = client
+        self._embedding = embedding
+
+    @property
+    def embeddings(self) -> Optional[Embeddings]:
+        return self._embedding
+
+    def add_texts(self, texts: Iterable[str], metadatas: Optional[List[dict]] = None, **kwargs: Any) -> List[str]:
+        return self.client.call("add_texts", list(texts), metadatas)
+
+    def add_documents(self, documents: List[Document], **kwargs: Any) -> List[str]:
+        # Keyword arguments such as ``embedding_function`` refer to worker-side
+        # objects; the owner always embeds with its own model.
+        return self.client.call("add_documents", list(documents))
+
+    def similarity_search(self, query: str, k: int = 4, **kwargs: Any) -> List[Document]:
+        return self.client.call("similarity_search", query, k, kwargs)
+
+    def get_by_ids(self, ids: Sequence[str], /) -> List[Document]:
+        return self.client.call("get_by_ids", list(ids))
+
+    def lexical_search(self, query: str, k: int = 4) -> List[Document]:
+        """BM25 search of the owner's lexical index; empty when the owner keeps none."""
+        return self.client.call("lexical_search", query, k)
+
+    @classmethod
+    def from_texts(cls, texts: List[str], embedding: Embeddings, metadatas: Optional[List[dict]] = None, **kwargs: Any) -> "RemoteVectorStore":
+        raise NotImplementedError("RemoteVectorStore connects to a running owner process; see VectorOwnerClient.")
+
+
+class VectorOwner:
+    """Serves embedding and vector store calls for the server workers."""
+
+    def __init__(self, embedder: Embeddings, vectorstore: VectorStore, lexical_index: Optional[BM25Index] = None) -> None:
+        self.embedder = embedder
+        self.vectorstore = vectorstore
+        self.lexical_index = lexical_index
+        self._write_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._requests: Dict[str, int] = defaultdict(int)
+        self._errors: Dict[str, int] = defaultdict(int)
+        self._connections = 0
+
+    def handle(self, op: str, args: tuple) -> Any:
+        if op == "ping":
+            return "pong"
+        if op == "stats":
+            return self.stats()
+        if op == "embed_documents":
+            return self.embedder.embed_documents(*args)
+        if op == "embed_query":
+            return self.embedder.embed_query(*args)
+        if op == "similarity_search":
+            query, k, kwargs = args
+            return self.vectorstore.similarity_search(query, k=k, **kwargs)
+        if op == "get_by_ids":
+            return self.vectorstore.get_by_ids(*args)
+        if op == "lexical_search":
+            query, k = args
+            if self.lexical_index is None:
+                return []
+            return [document for document, _ in self.lexical_index.search(query, k)]
+        if op == "add_documents":
+            with self._write_lock:
+                ids = self.vectorstore.add_documents(*args)
+                if self.lexical_index is not None:
+                    self.lexical_index.add_documents(*args)
+                return ids
+        if op == "add_texts":
+            texts, metadatas = args
+            metadatas = [metadata or {} for metadata in (metadatas or [None] * len(texts))]
+            ids = [chunk_id(metadata.get("source"), text) for text, metadata in zip(texts, metadatas)]
+            # Stored under stable ids, like the chunks of add_documents, so the store and the index agree.
+            documents = {
+                document_id: Document(id=document_id, page_content=text, metadata=metadata)
+                for document_id, text, metadata in zip(ids, texts, metadatas)
+            }
+            with self._write_lock:
+                self.vectorstore.add_documents(list(documents.values()))
+                if self.lexical_index is not None:
+                    self.lexical_index.add_documents(documents.values())
+            return ids
+        raise ValueError(f"Unsupported vector owner operation: {op}")
+
+    def _serve_connection(self, conn: Connection) -> None:
+        with conn:
+            while True:
+                try:
+                    op, args = conn.recv()
+                except (EOFError, OSError):
+                    return
+                with self._stats_lock:
+                    self._requests[op] += 1
+                try:
+                    reply = ("ok", self.handle(op, args))
+                except Exception as e:
+                    logger.exception(f"Vector owner failed '{op}'")
+                    with self._stats_lock:
+                        self._errors[op] += 1
+                    reply = ("error", f"{type(e).__name__}: {e}")
+                try:
+                    conn.send(reply)
+                except (EOFError, OSError):
+                    return
+
+    def serve_forever(self, address: str, authkey: bytes) -> None:
+        if os.path.exists(address):
+            os.unlink(address)
+        with Listener(address, family="AF_UNIX", authkey=authkey) as listener:
+            os.chmod(address, 0o600)
+            logger.info(f"Vector owner listening on {address}")
+            while True:
+                try:
+                    conn = listener.accept()
+                except AuthenticationError:
+                    logger.warning("Rejected a vector owner connection with a bad auth key")
+                    continue
+                with self._stats_lock:
+                    self._connections += 1
+                threading.Thread(target=self._serve_connection, args=(conn,), daemon=True).start()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats = {
+                "pid": os.getpid(),
+                "connections": self._connections,
+                "requests": dict(self._requests),
+                "errors": dict(self._errors),
+            }
+        if hasattr(self.embedder, "stats"):
+            stats["embedding_cache"] = self.embedder.stats()
+        if self.lexical_index is not None:
+            stats["lexical_index"] = self.lexical_index.stats()
+        return stats
+
+
+def run_vector_owner(config: Union[DictConfig, Dict[str, Any]], address: str, authkey: bytes) -> None:
+    """Load the embedding model and open the vector store from ``config``, then serve ``address``."""
+    from base.search_rag import SearchRagManager
+
+    # Built before the owner environment variable can apply: this process is the local end.
+    os.environ.pop(VECTOR_OWNER_ENV, None)
+    manager = SearchRagManager.from_config(config)
+    # Load everything before listening, so a successful ping means the owner is ready.
+    manager.warm_up()
+    VectorOwner(manager.embedder, manager.vectorstore, manager.lexical_index).serve_forever(address, authkey)
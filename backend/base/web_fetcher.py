@@ -0,0 +1,245 @@
+"""Concurrent web page fetching for search results.
+
+One process-wide :data:`page_fetcher` holds a pooled ``httpx.Client`` and a
+small thread pool. :meth:`WebPageFetcher.fetch_many` loads a batch of URLs
+concurrently: at most ``per_host`` requests go to the same host at once, the
+whole batch is bounded by ``deadline_seconds`` (pages not done by then are
+dropped, so one slow site cannot stall a search), and at most ``max_bytes`` of
+a page are read. Results are returned in the order of the URLs, with ``None``
+for pages that could not be loaded. Pages are parsed like LangChain's
+``WebBaseLoader`` (BeautifulSoup ``get_text()``, title/description/language
+metadata), so documents look the same as before. Parsed pages are kept in a
+:class:`~base.page_cache.PageCache` when the ``cache`` section enables it.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+from langchain_core.documents import Document
+
+from .page_cache import PageCache
+from .metrics import PAGE_LOAD_SECONDS, PAGES_LOADED, observe_seconds
+from .tracing import span, with_current_context
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = "Mozilla/5.0 (compatible; GenMentor/1.0; +https://github.com/GeminiLight/gen-mentor)"
+HTML_TYPES = {"text/html", "application/xhtml+xml"}
+TEXT_TYPES = {"text/plain", "text/markdown"}
+
+# Outcomes of one fetch, also used as ``genmentor_pages_loaded_total`` labels.
+LOADED = "loaded"
+CACHED = "cached"
+REVALIDATED = "revalidated"
+TRUNCATED = "truncated"
+FAILED = "failed"
+TIMED_OUT = "timed_out"
+UNSUPPORTED = "unsupported"
+
+
+def _page_to_document(url: str, body: bytes, content_type: str, encoding: Optional[str]) -> Document:
+    if content_type in TEXT_TYPES:
+        return Document(page_content=body.decode(encoding or "utf-8", errors="replace"), metadata={"source": url})
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(body, "html.parser", from_encoding=encoding)
+    metadata: Dict[str, Any] = {"source": url}
+    if title := soup.find("title"):
+        metadata["title"] = title.get_text()
+    if description := soup.find("meta", attrs={"name": "description"}):
+        metadata["description"] = description.get("content", "No description found.")
+    if html := soup.find("html"):
+        metadata["language"] = html.get("lang", "No language found.")
+    return Document(page_content=soup.get_text(), metadata=metadata)
+
+
+class WebPageFetcher:
+    """Pooled, deadline-bounded fetching of web pages as LangChain documents."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._client: Optional[httpx.Client] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._outcomes: Dict[str, int] = {}
+        self._in_flight = 0
+        self.page_cache = PageCache(enabled=False)
+        self.configure()
+
+    def configure(
+        self,
+        max_concurrency: int = 16,
+        per_host: int = 2,
+        connect_timeout_seconds: float = 5.0,
+        read_timeout_seconds: float = 10.0,
+        deadline_seconds: float = 20.0,
+        max_bytes: int = 2 * 1024 * 1024,
+        user_agent: str = DEFAULT_USER_AGENT,
+        cache: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        page_cache = PageCache(**cache) if cache else PageCache(enabled=False)
+        with self._lock:
+            self.page_cache = page_cache
+            self.max_concurrency = max(1, int(max_concurrency))
+            self.per_host = max(1, int(per_host))
+            self.connect_timeout_seconds = float(connect_timeout_seconds)
+            self.read_timeout_seconds = float(read_timeout_seconds)
+            self.deadline_seconds = float(deadline_seconds)
+            self.max_bytes = int(max_bytes)
+            self.user_agent = user_agent
+            # Clients and threads are (re)created on first use with the new settings.
+            if self._client is not None:
+                self._client.close()
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+            self._client = None
+            self._executor = None
+            self._host_slots = {}
+
+    def _resources(self) -> Tuple[httpx.Client, ThreadPoolExecutor]:
+        with self._lock:
+            if self._client is None:
+                self._client = httpx.Client(
+                    limits=httpx.Limits(
+                        max_connections=self.max_concurrency,
+                        max_keepalive_connections=self.max_concurrency,
+                    ),
+                    follow_redirects=True,
+                    headers={
+                        "User-Agent": self.user_agent,
+                        "Accept": "text/html,application/xhtml+xml,text/plain;q=0.9,*/*;q=0.5",
+                    },
+                )
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="page-fetch")
+            return self._client, self._executor
+
+    def _host_slot(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = self._host_slots[host] = threading.BoundedSemaphore(self.per_host)
+            return slot
+
+    def _count(self, outcome: str, amount: int = 1) -> None:
+        PAGES_LOADED.labels(loader="web", outcome=outcome).inc(amount)
+        with self._lock:
+            self._outcomes[outcome] = self._outcomes.get(outcome, 0) + amount
+
+    def _fetch(self, client: httpx.Client, url: str, deadline: float) -> Tuple[Optional[Document], str]:
+        page_cache = self.page_cache
+        entry = page_cache.lookup(url)
+        if entry is not None and page_cache.is_fresh(entry):
+            return page_cache.hit(url, entry), CACHED
+        slot = self._host_slot(urlsplit(url).hostname or "")
+        if not slot.acquire(timeout=max(0.0, deadline - time.monotonic())):
+            return None, TIMED_OUT
+        with self._lock:
+            self._in_flight += 1
+        try:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None, TIMED_OUT
+            timeout = httpx.Timeout(
+                min(self.read_timeout_seconds, remaining),
+                connect=min(self.connect_timeout_seconds, remaining),
+            )
+            with client.stream("GET", url, headers=page_cache.validators(entry), timeout=timeout) as response:
+                if response.status_code == 304 and entry is not None:
+                    return page_cache.not_modified(url, entry), REVALIDATED
+                if response.status_code >= 400:
+                    return None, FAILED
+                content_type = response.headers.get("content-type", "").split(";")[0].strip().lower()
+                if content_type and content_type not in HTML_TYPES | TEXT_TYPES:
+                    return None, UNSUPPORTED
+                body = bytearray()
+                truncated = False
+                for chunk in response.iter_bytes():
+                    body.extend(chunk)
+                    if len(body) >= self.max_bytes:
+                        truncated = len(body) > self.max_bytes
+                        del body[self.max_bytes:]
+                        break
+                    if time.monotonic() > deadline:
+                        return None, TIMED_OUT
+                encoding = response.charset_encoding
+            document = _page_to_document(url, bytes(body), content_type or "text/html", encoding)
+            if truncated:
+                document.metadata["truncated"] = True
+            page_cache.store(url, document, response.headers)
+            if truncated:
+                return document, TRUNCATED
+            return document, LOADED
+        except httpx.TimeoutException:
+            return None, TIMED_OUT
+        except (httpx.HTTPError, ValueError) as e:
+            logger.debug(f"Fetching {url} failed: {e}")
+            return None, FAILED
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+            slot.release()
+
+    def fetch_many(self, urls: Sequence[str], deadline_seconds: Optional[float] = None) -> List[Optional[Document]]:
+        """Fetch ``urls`` concurrently; the result at position ``i`` belongs to ``urls[i]`` (``None`` if not loaded)."""
+        if not urls:
+            return []
+        unique = list(dict.fromkeys(urls))
+        client, executor = self._resources()
+        deadline = time.monotonic() + (self.deadline_seconds if deadline_seconds is None else deadline_seconds)
+        with span("web_loader.load", **{"genmentor.loader": "web", "genmentor.urls": len(unique)}) as current_span, \
+                observe_seconds(PAGE_LOAD_SECONDS.labels(loader="web")):
+            futures: Dict[str, Future] = {
+                url: executor.submit(with_current_context(self._fetch), client, url, deadline) for url in unique
+            }
+            wait(futures.values(), timeout=max(0.0, deadline - time.monotonic()))
+            by_url: Dict[str, Optional[Document]] = {}
+            outcomes: Dict[str, int] = {}
+            for url, future in futures.items():
+                if future.done() and not future.cancelled():
+                    document, outcome = future.result()
+                else:
+                    # Still queued or running at the deadline; its slot is freed when it ends.
+                    future.cancel()
+                    document, outcome = None, TIMED_OUT
+                by_url[url] = document
+                outcomes[outcome] = outcomes.get(outcome, 0) + 1
+            loaded = sum(1 for document in by_url.values() if document is not None)
+            current_span.set_attribute("genmentor.documents", loaded)
+        self._count("requested", len(unique))
+        self._count(LOADED, loaded)
+        for outcome, count in outcomes.items():
+            if outcome != LOADED:
+                self._count(outcome, count)
+        return [by_url[url] for url in urls]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "max_concurrency": self.max_concurrency,
+                "per_host": self.per_host,
+                "deadline_seconds": self.deadline_seconds,
+                "in_flight": self._in_flight,
+                "hosts_seen": len(self._host_slots),
+                "outcomes": dict(self._outcomes),
+                "cache": self.page_cache.stats(),
+            }
+
+
+page_fetcher = WebPageFetcher()
@@ -0,0 +1,68 @@
+"""Measure per-request agent construction cost with and without the graph cache.
+
+Simulates the agents built by one /tailor-knowledge-content request (explorer,
+one drafter per knowledge point, integrator, quiz generator) against a shared
+offline chat model, so only graph compilation is measured.
+
+Run from the repo root:
+    python backend/benchmarks/bench_agent_cache.py [--requests 20] [--knowledge-points 6]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+
+from base.agent_cache import agent_graph_cache
+from modules.personalized_resource_delivery.agents import (
+    DocumentQuizGenerator,
+    GoalOrientedKnowledgeExplorer,
+    LearningDocumentIntegrator,
+    SearchEnhancedKnowledgeDrafter,
+)
+
+
+def build_request_agents(llm, knowledge_points: int) -> None:
+    GoalOrientedKnowledgeExplorer(llm)
+    for _ in range(knowledge_points):
+        SearchEnhancedKnowledgeDrafter(llm, use_search=False)
+    LearningDocumentIntegrator(llm)
+    DocumentQuizGenerator(llm)
+
+
+def run(llm, requests: int, knowledge_points: int) -> float:
+    started = time.perf_counter()
+    for _ in range(requests):
+        build_request_agents(llm, knowledge_points)
+    return (time.perf_counter() - started) / requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--knowledge-points", type=int, default=6)
+    args = parser.parse_args()
+
+    llm = GenericFakeChatModel(messages=iter([]))
+
+    agent_graph_cache.configure(enabled=False)
+    uncached = run(llm, args.requests, args.knowledge_points)
+
+    agent_graph_cache.configure(enabled=True)
+    agent_graph_cache.clear()
+    cached = run(llm, args.requests, args.knowledge_points)
+
+    agents_per_request = args.knowledge_points + 3
+    print(f"Agents per request: {agents_per_request} ({args.requests} requests)")
+    print(f"Without graph cache: {uncached * 1000:8.2f} ms/request")
+    print(f"With graph cache:    {cached * 1000:8.2f} ms/request")
+    print(f"Speed-up:            {uncached / cached if cached else float('inf'):8.1f}x")
+    print(f"Cache stats: {agent_graph_cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
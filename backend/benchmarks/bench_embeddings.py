@@ -0,0 +1,122 @@
+"""Compare embedding backends: throughput and latency under concurrent callers, and vector agreement.
+
+Each backend is built by ``EmbedderFactory`` as the server builds it. Several
+threads (like drafter threads calling ``add_documents``) each send a number of
+``embed_documents`` calls of a few chunk-sized texts. Reported per backend:
+texts per second over the run, p50/p95 latency of one call, and the mean cosine
+similarity of its vectors to the PyTorch backend's on the same texts.
+
+Backends: ``torch`` (HuggingFaceEmbeddings), ``onnx`` (ONNX Runtime with the
+micro-batcher) and ``onnx-int8`` (the same with int8 weights).
+
+Run from the repo root:
+    python backend/benchmarks/bench_embeddings.py [--backends torch onnx onnx-int8] [--threads 8] [--calls 20] [--texts 4]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+from typing import Dict, List
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from base.embedder_factory import EmbedderFactory
+
+WORDS = (
+    "python function decorator closure scope variable class method inheritance module package import "
+    "generator iterator exception context manager thread process queue lock memory garbage collection "
+    "list dictionary tuple set comprehension lambda argument keyword default annotation type hint"
+).split()
+
+
+def make_texts(count: int, seed: int) -> List[str]:
+    rng = random.Random(seed)
+    # Chunk-sized texts of varying length, like split web pages.
+    return [" ".join(rng.choice(WORDS) for _ in range(rng.randint(40, 160))) for _ in range(count)]
+
+
+def build(backend: str, model: str, max_batch_size: int, max_wait_ms: float):
+    if backend == "torch":
+        return EmbedderFactory.create(model=model, model_provider="huggingface")
+    return EmbedderFactory.create(
+        model=model,
+        model_provider="huggingface",
+        backend="onnx",
+        quantize=backend == "onnx-int8",
+        max_batch_size=max_batch_size,
+        max_wait_ms=max_wait_ms,
+    )
+
+
+def run(embedder, threads: int, calls: int, texts_per_call: int) -> Dict[str, float]:
+    latencies: List[float] = []
+    lock = threading.Lock()
+
+    def caller(seed: int) -> None:
+        for call in range(calls):
+            texts = make_texts(texts_per_call, seed * 10000 + call)
+            started = time.perf_counter()
+            embedder.embed_documents(texts)
+            elapsed = time.perf_counter() - started
+            with lock:
+                latencies.append(elapsed)
+
+    workers = [threading.Thread(target=caller, args=(seed,)) for seed in range(threads)]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    wall = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "texts_per_second": threads * calls * texts_per_call / wall,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))] * 1000,
+    }
+
+
+def mean_cosine(a: List[List[float]], b: List[List[float]]) -> float:
+    a, b = np.asarray(a), np.asarray(b)
+    a = a / np.linalg.norm(a, axis=1, keepdims=True)
+    b = b / np.linalg.norm(b, axis=1, keepdims=True)
+    return float((a * b).sum(axis=1).mean())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default="sentence-transformers/all-mpnet-base-v2")
+    parser.add_argument("--backends", nargs="+", default=["torch", "onnx", "onnx-int8"], choices=["torch", "onnx", "onnx-int8"])
+    parser.add_argument("--threads", type=int, default=8, help="concurrent callers")
+    parser.add_argument("--calls", type=int, default=20, help="embed_documents calls per caller")
+    parser.add_argument("--texts", type=int, default=4, help="texts per call")
+    parser.add_argument("--max-batch-size", type=int, default=32)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    sample = make_texts(64, seed=-1)
+    reference = None
+    print(f"{args.threads} callers x {args.calls} calls x {args.texts} texts, model {args.model}\n")
+    print(f"{'backend':<10} {'texts/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'cos vs torch':>13}")
+    # PyTorch first: it is the reference for the others' vectors.
+    for backend in sorted(args.backends, key=lambda name: name != "torch"):
+        embedder = build(backend, args.model, args.max_batch_size, args.max_wait_ms)
+        vectors = embedder.embed_documents(sample)  # also warms the model up
+        if backend == "torch":
+            reference = vectors
+        result = run(embedder, args.threads, args.calls, args.texts)
+        agreement = f"{mean_cosine(vectors, reference):.4f}" if reference is not None else "-"
+        print(f"{backend:<10} {result['texts_per_second']:>9.1f} {result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f} {agreement:>13}")
+        if hasattr(embedder, "stats"):
+            stats = embedder.stats()
+            print(f"{'':<10} {stats['batches']} forward passes, {stats['mean_batch_size']:.1f} texts each on average")
+
+
+if __name__ == "__main__":
+    main()
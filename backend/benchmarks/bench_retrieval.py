@@ -0,0 +1,137 @@
+"""Compare vector and hybrid (vector + BM25) retrieval: recall@k and per-query latency.
+
+The corpus is the documentation of standard-library functions, one chunk per
+function as a documentation page would show it (qualified name, signature and
+docstring), added through ``SearchRagManager.add_documents`` into an in-memory
+vector store. Two query sets target one chunk each:
+
+- ``named``: a question naming the function (``How do I use json.dumps?``), the
+  exact-term lookups learners ask the tutor;
+- ``described``: the first line of the function's docstring, without its name.
+
+Reported per retrieval mode and query set: the fraction of queries whose chunk
+is in the top k for each k, and p50/p95 latency of ``retrieve``.
+
+Run from the repo root:
+    python backend/benchmarks/bench_retrieval.py [--k 1 3 5 10] [--modules json os.path ...] [--fake-embeddings]
+"""
+
+import argparse
+import importlib
+import inspect
+import os
+import statistics
+import sys
+import time
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_core.vectorstores import InMemoryVectorStore
+
+from base.embedder_factory import EmbedderFactory
+from base.search_rag import SearchRagManager
+
+MODULES = [
+    "asyncio", "collections", "concurrent.futures", "contextlib", "csv", "datetime", "functools", "hashlib",
+    "heapq", "itertools", "json", "logging", "math", "os", "os.path", "pathlib", "random", "re", "shutil",
+    "socket", "sqlite3", "statistics", "string", "subprocess", "tempfile", "textwrap", "threading", "time",
+    "typing", "urllib.parse", "uuid", "zipfile",
+]
+
+
+def build_corpus(modules: List[str], max_docs: int) -> Tuple[List[Document], List[Tuple[str, str, str]]]:
+    """Chunks of function documentation, and ``(query set, query, source)`` triples."""
+    documents: List[Document] = []
+    queries: List[Tuple[str, str, str]] = []
+    seen = set()
+    for module_name in modules:
+        module = importlib.import_module(module_name)
+        for name, obj in sorted(vars(module).items()):
+            if name.startswith("_") or not callable(obj) or inspect.isclass(obj):
+                continue
+            doc = inspect.getdoc(obj)
+            first_line = doc.strip().splitlines()[0].strip() if doc and doc.strip() else ""
+            qualified = f"{module_name}.{name}"
+            if len(first_line) < 20 or first_line in seen:
+                continue
+            seen.add(first_line)
+            try:
+                signature = str(inspect.signature(obj))
+            except (TypeError, ValueError):
+                signature = "(...)"
+            source = f"https://docs.python.org/3/library/{module_name}#{qualified}"
+            documents.append(Document(page_content=f"{qualified}{signature}\n\n{doc}", metadata={"source": source}))
+            queries.append(("named", f"How do I use {qualified}?", source))
+            queries.append(("described", first_line, source))
+            if len(documents) >= max_docs:
+                return documents, queries
+    return documents, queries
+
+
+def evaluate(manager: SearchRagManager, queries: List[Tuple[str, str, str]], ks: List[int]) -> Dict[str, Dict[str, float]]:
+    results: Dict[str, Dict[str, float]] = {}
+    for query_set in sorted({query_set for query_set, _, _ in queries}):
+        hits = {k: 0 for k in ks}
+        latencies: List[float] = []
+        selected = [(query, source) for name, query, source in queries if name == query_set]
+        for query, source in selected:
+            started = time.perf_counter()
+            retrieved = manager.retrieve(query, k=max(ks))
+            latencies.append(time.perf_counter() - started)
+            sources = [doc.metadata.get("source") for doc in retrieved]
+            for k in ks:
+                hits[k] += source in sources[:k]
+        latencies.sort()
+        results[query_set] = {
+            **{f"recall@{k}": hits[k] / len(selected) for k in ks},
+            "p50_ms": statistics.median(latencies) * 1000,
+            "p95_ms": latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))] * 1000,
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default="sentence-transformers/all-mpnet-base-v2")
+    parser.add_argument("--fake-embeddings", action="store_true", help="hash-based vectors: latency only, no model download")
+    parser.add_argument("--modules", nargs="+", default=MODULES)
+    parser.add_argument("--max-docs", type=int, default=2000)
+    parser.add_argument("--k", type=int, nargs="+", default=[1, 3, 5, 10])
+    parser.add_argument("--candidates", type=int, default=20, help="chunks taken from each ranking in hybrid mode")
+    parser.add_argument("--rrf-k", type=int, default=60)
+    args = parser.parse_args()
+
+    documents, queries = build_corpus(args.modules, args.max_docs)
+    if args.fake_embeddings:
+        embedder = DeterministicFakeEmbedding(size=768)
+    else:
+        embedder = EmbedderFactory.create(model=args.model, model_provider="huggingface")
+    manager = SearchRagManager(
+        embedder=embedder,
+        vectorstore=InMemoryVectorStore(embedding=embedder),
+        retrieval_mode="hybrid",
+        hybrid_candidates=args.candidates,
+        rrf_k=args.rrf_k,
+    )
+    started = time.perf_counter()
+    manager.add_documents(documents)
+    print(f"{len(documents)} chunks from {len(args.modules)} modules indexed in {time.perf_counter() - started:.1f}s, "
+          f"{len(queries) // 2} queries per set, embeddings: {'fake' if args.fake_embeddings else args.model}\n")
+
+    columns = [f"recall@{k}" for k in args.k] + ["p50_ms", "p95_ms"]
+    print(f"{'mode':<8} {'queries':<10} " + " ".join(f"{column:>10}" for column in columns))
+    for mode in ["vector", "hybrid"]:
+        manager.retrieval_mode = mode
+        manager.retrieve("warm-up")
+        for query_set, result in evaluate(manager, queries, args.k).items():
+            print(f"{mode:<8} {query_set:<10} " + " ".join(
+                f"{result[column]:>10.3f}" if column.startswith("recall") else f"{result[column]:>10.2f}"
+                for column in columns
+            ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Measure backend cold start: importing ``main`` with a per-import breakdown, and time to ready.
+
+Each run imports ``main`` in a fresh interpreter under ``python -X importtime``
+and reports the wall time, the slowest imports (cumulative, including their own
+imports) and the self time per top-level package. With ``--serve`` it also starts
+uvicorn and reports when ``/healthz`` (listening) and ``/readyz`` (warm-up done)
+first answer 200.
+
+Run from the repo root:
+    python backend/benchmarks/bench_startup.py [--runs 3] [--top 20] [--serve] [--port 5099]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+IMPORT_MAIN = "import time; started = time.perf_counter(); import main; print(time.perf_counter() - started)"
+
+
+def import_main() -> Tuple[float, List[Tuple[int, int, int, str]]]:
+    """Return the wall time of ``import main`` and ``(self_us, cumulative_us, depth, module)`` per import."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", IMPORT_MAIN],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        sys.exit(f"Importing main failed:\n{result.stderr[-4000:]}")
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip())) // 2
+        imports.append((int(self_us), int(cumulative_us), depth, name.strip()))
+    return float(result.stdout.strip().splitlines()[-1]), imports
+
+
+def by_package(imports: List[Tuple[int, int, int, str]]) -> Dict[str, int]:
+    totals: Dict[str, int] = defaultdict(int)
+    for self_us, _, _, name in imports:
+        totals[name.split(".")[0]] += self_us
+    return totals
+
+
+def wait_for(url: str, deadline: float) -> float:
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200:
+                    return time.monotonic()
+        except (urllib.error.URLError, ConnectionError, TimeoutError):
+            pass
+        time.sleep(0.05)
+    raise TimeoutError(f"{url} did not answer 200 in time")
+
+
+def serve(port: int, timeout: float) -> Tuple[float, float]:
+    started = time.monotonic()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+    )
+    try:
+        deadline = started + timeout
+        listening = wait_for(f"http://127.0.0.1:{port}/healthz", deadline)
+        ready = wait_for(f"http://127.0.0.1:{port}/readyz", deadline)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+    return listening - started, ready - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3, help="fresh-interpreter imports; the median is reported")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--serve", action="store_true", help="also measure time to /healthz and /readyz")
+    parser.add_argument("--port", type=int, default=5099)
+    parser.add_argument("--timeout", type=float, default=600.0)
+    args = parser.parse_args()
+
+    walls = []
+    for _ in range(max(1, args.runs)):
+        wall, imports = import_main()
+        walls.append(wall)
+    print(f"import main: median {statistics.median(walls):.2f}s over {len(walls)} runs ({', '.join(f'{w:.2f}' for w in walls)})")
+
+    print(f"\nSlowest imports (cumulative, last run):")
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for self_us, cumulative_us, depth, name in sorted(imports, key=lambda i: i[1], reverse=True)[:args.top]:
+        print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {'  ' * depth}{name}")
+
+    print(f"\nSelf time by top-level package (last run):")
+    for package, self_us in sorted(by_package(imports).items(), key=lambda i: i[1], reverse=True)[:args.top]:
+        print(f"{self_us / 1000:>10.1f} ms  {package}")
+
+    if args.serve:
+        listening, ready = serve(args.port, args.timeout)
+        print(f"\nuvicorn: listening after {listening:.2f}s, ready after {ready:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
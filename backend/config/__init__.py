@@ -1 +1,9 @@
-from .loader import load_config, default_config
\ No newline at end of file
+from .loader import load_config
+
+
+def __getattr__(name):
+    # Keeps ``from config import default_config`` lazy, see loader.__getattr__.
+    if name == "default_config":
+        from .loader import default_config
+        return default_config
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
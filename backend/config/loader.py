@@ -1,14 +1,18 @@
 from __future__ import annotations
 
 import os
+import threading
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Tuple
 
 from omegaconf import OmegaConf, DictConfig
 from hydra import compose, initialize_config_module
 
 from .schemas import AppConfig
 
+_loaded: Dict[Tuple[str, str], DictConfig] = {}
+_load_lock = threading.Lock()
+
 
 def load_config(
     *,
@@ -19,15 +23,27 @@ def load_config(
     """Compose Hydra config from a config module with optional env overrides.
 
     Uses hydra.initialize_config_module to avoid relative-path issues.
+    Composition is done once per ``(config_name, config_module)``; later calls
+    return the same object (treat it as read-only). ``env_overrides`` always
+    recompose, since they can change interpolated values.
     """
 
     if env_overrides:
         os.environ.update(env_overrides)
 
-    with initialize_config_module(version_base=None, config_module=config_module):
-        cfg = compose(config_name=config_name)
-        _ = OmegaConf.structured(AppConfig)
+    key = (config_name, config_module)
+    with _load_lock:
+        if key in _loaded and not env_overrides:
+            return _loaded[key]
+        with initialize_config_module(version_base=None, config_module=config_module):
+            cfg = compose(config_name=config_name)
+            _ = OmegaConf.structured(AppConfig)
+        _loaded[key] = cfg
         return cfg
 
 
-default_config = load_config()
+def __getattr__(name: str) -> Any:
+    # ``default_config`` is composed on first use rather than at import time.
+    if name == "default_config":
+        return load_config()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
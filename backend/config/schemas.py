@@ -1,7 +1,18 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class LLMClientPoolConfig:
+    """Shared client registry and HTTP connection-pool limits."""
+    max_clients: int = 16
+    idle_ttl_seconds: float = 1800
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry_seconds: float = 60.0
+    timeout_seconds: float = 120.0
 
 
 @dataclass
@@ -10,18 +21,72 @@ class LLMConfig:
     provider: str = "openai"  # e.g., openai, azure-openai, ollama, anthropic, groq
     model_name: str = "gpt-4o"
     base_url: Optional[str] = None
+    client_pool: LLMClientPoolConfig = field(default_factory=LLMClientPoolConfig)
+
+
+@dataclass
+class EmbeddingCacheConfig:
+    enabled: bool = True
+    max_entries: int = 10000  # in-memory tier, per process
+    disk_path: Optional[str] = "data/embedding_cache.sqlite3"  # null disables the on-disk tier
+    disk_max_entries: Optional[int] = 1000000
+
+
+@dataclass
+class OnnxEmbeddingConfig:
+    quantize: bool = False
+    file_name: str = "onnx/model.onnx"
+    quantized_file_name: str = "onnx/model_quint8_avx2.onnx"
+    max_batch_size: int = 32
+    max_wait_ms: float = 5.0
+    intra_op_threads: int = 0
 
 
 @dataclass
 class EmbeddingConfig:
     provider: str = "huggingface"
     model_name: str = "sentence-transformers/all-mpnet-base-v2"
+    backend: str = "torch"  # torch | onnx
+    onnx: OnnxEmbeddingConfig = field(default_factory=OnnxEmbeddingConfig)
+    cache: EmbeddingCacheConfig = field(default_factory=EmbeddingCacheConfig)
+
+
+@dataclass
+class SearchCacheConfig:
+    enabled: bool = True
+    max_entries: int = 1024  # in-memory tier, per process
+    ttl_seconds: Optional[float] = 86400
+    disk_path: Optional[str] = "data/search_cache.sqlite3"  # null disables the on-disk tier
+    disk_max_entries: Optional[int] = 50000
 
 
 @dataclass
 class SearchConfig:
     provider: str = "duckduckgo"  # tavily, serper, bing, duckduckgo, brave, searx, you
     max_results: int = 5
+    cache: SearchCacheConfig = field(default_factory=SearchCacheConfig)
+
+
+@dataclass
+class PageCacheConfig:
+    enabled: bool = True
+    fresh_seconds: float = 86400
+    ttl_seconds: Optional[float] = 2592000
+    max_entries: int = 256
+    disk_path: Optional[str] = "data/page_cache.sqlite3"
+    disk_max_entries: Optional[int] = 20000
+    disk_max_bytes: Optional[int] = 1024 * 1024 * 1024
+
+
+@dataclass
+class WebFetchConfig:
+    max_concurrency: int = 16
+    per_host: int = 2
+    connect_timeout_seconds: float = 5.0
+    read_timeout_seconds: float = 10.0
+    deadline_seconds: float = 20.0
+    max_bytes: int = 2 * 1024 * 1024
+    cache: PageCacheConfig = field(default_factory=PageCacheConfig)
 
 
 @dataclass
@@ -29,12 +94,139 @@ class VectorstoreConfig:
     persist_directory: str = "data/vectorstore"
     collection_name: str = "genmentor"
 
+@dataclass
+class HybridRetrievalConfig:
+    candidates: int = 20  # chunks taken from each ranking before merging
+    rrf_k: int = 60
+
+
 @dataclass
 class RAGConfig:
     chunk_size: int = 1000
     num_retrieval_results: int = 5
     allow_parallel: bool = True
     max_workers: int = 3
+    retrieval_mode: str = "hybrid"  # vector or hybrid
+    hybrid: HybridRetrievalConfig = field(default_factory=HybridRetrievalConfig)
+
+
+@dataclass
+class AgentCacheConfig:
+    enabled: bool = True
+    max_size: int = 128  # compiled agent graphs kept per process
+
+
+@dataclass
+class LLMCacheConfig:
+    enabled: bool = True  # reuse replies of temperature-0 agent calls
+    max_entries: int = 1024  # in-memory tier, per process
+    ttl_seconds: Optional[float] = 86400
+    disk_path: Optional[str] = "data/llm_cache.sqlite3"  # null disables the on-disk tier
+    disk_max_entries: Optional[int] = 100000
+    agents: Dict[str, bool] = field(default_factory=lambda: {"AITutorChatbot": False})
+
+
+@dataclass
+class RateLimitConfig:
+    requests_per_minute: Optional[float] = 500
+    tokens_per_minute: Optional[float] = 200000
+    max_concurrent: Optional[int] = 16
+
+
+@dataclass
+class LLMRateLimitConfig:
+    enabled: bool = True
+    max_retries: int = 3  # retries of a call answered with 429
+    expected_output_tokens: int = 512
+    backoff_base_seconds: float = 1.0
+    backoff_max_seconds: float = 60.0
+    default: RateLimitConfig = field(default_factory=RateLimitConfig)
+    providers: Dict[str, Any] = field(default_factory=dict)  # keyed by provider or provider/model
+
+
+@dataclass
+class BatchConfig:
+    llm_concurrency: int = 8  # LLM calls in flight across all batch requests
+    max_concurrent_sessions: int = 3  # sessions drafted at the same time per batch
+
+
+@dataclass
+class JobsConfig:
+    db_path: str = "data/jobs.sqlite3"
+    concurrency: int = 2
+    poll_interval_seconds: float = 2.0
+    heartbeat_seconds: float = 10.0
+    stale_after_seconds: float = 60.0  # running jobs without a heartbeat this long are requeued
+    max_attempts: Optional[int] = 3  # stale jobs claimed this often fail instead; None retries forever
+    retention_seconds: float = 604800  # finished jobs are purged after a week
+
+
+@dataclass
+class PriorityClassConfig:
+    weight: float = 1.0  # share of freed slots relative to other classes
+    max_concurrent: Optional[int] = None
+    max_queue: int = 32  # waiting requests beyond this get 429
+    max_wait_seconds: Optional[float] = None  # queued longer than this gets 429
+    endpoints: List[str] = field(default_factory=list)
+
+
+@dataclass
+class AdmissionConfig:
+    enabled: bool = True
+    max_concurrent: int = 16
+    default_class: str = "standard"
+    exempt: List[str] = field(default_factory=lambda: ["jobs"])
+    classes: Dict[str, PriorityClassConfig] = field(default_factory=dict)
+
+
+@dataclass
+class TracingConfig:
+    enabled: bool = False
+    exporter: str = "otlp_file"  # console | otlp_file | otlp
+    file_path: str = "data/traces.jsonl"
+    endpoint: Optional[str] = None
+    service_name: str = "genmentor-backend"
+    sample_ratio: float = 1.0
+
+
+@dataclass
+class PDFCacheConfig:
+    max_entries: int = 128
+    ttl_seconds: Optional[float] = 604800
+    disk_path: Optional[str] = "data/pdf_cache.sqlite3"
+    disk_max_entries: Optional[int] = 5000
+
+
+@dataclass
+class PDFConfig:
+    max_bytes: int = 50 * 1024 * 1024
+    max_pages: int = 500
+    pages_per_task: int = 8
+    max_processes: int = 4
+    timeout_seconds: float = 300.0
+    cache: PDFCacheConfig = field(default_factory=PDFCacheConfig)
+
+
+@dataclass
+class WarmupConfig:
+    enabled: bool = True
+    retry_seconds: Optional[float] = 30.0
+
+
+@dataclass
+class ServingConfig:
+    workers: int = 4
+    vector_owner: bool = True  # required with more than one worker: the vector store has one writer
+    socket_path: str = "data/vector_owner.sock"
+    owner_start_timeout_seconds: float = 300.0
+    graceful_timeout_seconds: float = 30.0
+
+
+@dataclass
+class ServerConfig:
+    host: str = "127.0.0.1"
+    port: int = 5000
+    max_workers: Optional[int] = 16  # agent worker pool; falls back to rag.max_workers when null
 
 
 @dataclass
@@ -44,6 +236,19 @@ class AppConfig:
     log_level: str = "INFO"
 
     llm: LLMConfig = field(default_factory=LLMConfig)
+    embedding: EmbeddingConfig = field(default_factory=EmbeddingConfig)
     search: SearchConfig = field(default_factory=SearchConfig)
+    web_fetch: WebFetchConfig = field(default_factory=WebFetchConfig)
     vectorstore: VectorstoreConfig = field(default_factory=VectorstoreConfig)
     rag: RAGConfig = field(default_factory=RAGConfig)
+    server: ServerConfig = field(default_factory=ServerConfig)
+    serving: ServingConfig = field(default_factory=ServingConfig)
+    warmup: WarmupConfig = field(default_factory=WarmupConfig)
+    pdf: PDFConfig = field(default_factory=PDFConfig)
+    agent_cache: AgentCacheConfig = field(default_factory=AgentCacheConfig)
+    llm_cache: LLMCacheConfig = field(default_factory=LLMCacheConfig)
+    llm_rate_limit: LLMRateLimitConfig = field(default_factory=LLMRateLimitConfig)
+    batch: BatchConfig = field(default_factory=BatchConfig)
+    jobs: JobsConfig = field(default_factory=JobsConfig)
+    admission: AdmissionConfig = field(default_factory=AdmissionConfig)
+    tracing: TracingConfig = field(default_factory=TracingConfig)
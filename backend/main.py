@@ -1,29 +1,88 @@
 import ast
+import asyncio
+import functools
 import json
+import os
 import time
+from typing import Any, Dict
+from contextlib import asynccontextmanager
+import orjson
 import uvicorn
 import hydra
 from omegaconf import DictConfig, OmegaConf
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi import FastAPI, HTTPException, UploadFile, File
-from io import BytesIO
-import pdfplumber
-from base.llm_factory import LLMFactory
+from fastapi import APIRouter, Body, FastAPI, HTTPException, UploadFile, File
+from fastapi.exceptions import RequestValidationError
+from base.agent_cache import agent_graph_cache
+from base.llm_cache import llm_response_cache
+from base.rate_limiter import llm_rate_limiter
+from base.llm_registry import LLMClientRegistry
 from base.searcher_factory import SearchRunner
+from base.web_fetcher import page_fetcher
+from base.tracing import setup_tracing, shutdown_tracing
 from base.search_rag import SearchRagManager
-from fastapi.responses import JSONResponse
+from base.vector_owner import VectorOwnerClient
+from fastapi.responses import JSONResponse, ORJSONResponse, Response, StreamingResponse
+from prometheus_client import CONTENT_TYPE_LATEST
+from pydantic import ValidationError
 from modules.skill_gap_identification import *
 from modules.adaptive_learner_modeling import *
 from modules.personalized_resource_delivery import *
 from modules.personalized_resource_delivery.agents.learning_path_scheduler import refine_learning_path_with_llm
-from modules.ai_chatbot_tutor import chat_with_tutor_with_llm
+from modules.ai_chatbot_tutor import chat_with_tutor_with_llm, achat_with_tutor_with_llm, astream_chat_with_tutor_with_llm
 from api_schemas import *
 from config import load_config
+from server import AdmissionController, AdmissionMiddleware, AgentExecutor, JobQueue, SingleFlight
+from server.jobs import PENDING_STATUSES
+from server.pdf_extraction import PDFExtractor, PDFLimitExceeded
+from server.metrics import MetricsMiddleware, register_stats_collector, render_metrics
+from server.tracing import TracingMiddleware
+from server.warmup import Warmup
 
 app_config = load_config(config_name="main")
+setup_tracing(app_config)
+# Embedding model and vector store are created on first use or by the warm-up below.
 search_rag_manager = SearchRagManager.from_config(app_config)
+vector_owner = VectorOwnerClient.from_env()
+agent_executor = AgentExecutor.from_config(app_config)
+job_queue = JobQueue.from_config(app_config)
+single_flight = SingleFlight()
+admission = AdmissionController.from_config(app_config)
+llm_registry = LLMClientRegistry.from_config(app_config)
+pdf_extractor = PDFExtractor.from_config(app_config)
+batch_config = app_config.get("batch", {})
+# Shared by every batch request in this process: the global cap on batch LLM calls.
+batch_llm_semaphore = asyncio.Semaphore(int(batch_config.get("llm_concurrency", 8)))
+agent_graph_cache.configure(**app_config.get("agent_cache", {}))
+llm_response_cache.configure(**app_config.get("llm_cache", {}))
+llm_rate_limiter.configure(**app_config.get("llm_rate_limit", {}))
+page_fetcher.configure(**app_config.get("web_fetch", {}))
+warmup = Warmup.from_config(app_config)
+warmup.add("search_rag", search_rag_manager.warm_up)
+warmup.add("llm_client", lambda: get_llm(), required=False)
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    job_queue.start()
+    # Runs in the background: the port is bound while the models load.
+    warmup.start()
+    yield
+    await warmup.stop()
+    await job_queue.stop()
+    agent_executor.shutdown(wait=False)
+    pdf_extractor.shutdown()
+    page_fetcher.close()
+    shutdown_tracing()
+
+
+app = FastAPI(lifespan=lifespan)
+# Added before CORS so that CORS wraps it and 429 responses carry CORS headers.
+app.add_middleware(AdmissionMiddleware, controller=admission)
+# Outside admission so that queueing time and 429s show up in request latency.
+app.add_middleware(MetricsMiddleware)
+# Outermost of ours: admission waits and 429s are part of the request's root span.
+app.add_middleware(TracingMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -35,19 +94,56 @@ app.add_middleware(
 def get_llm(model_provider: str | None = None, model_name: str | None = None, **kwargs):
     model_provider = model_provider or app_config.llm.provider
     model_name = model_name or app_config.llm.model_name
-    return LLMFactory.create(model=model_name, model_provider=model_provider, **kwargs)
+    return llm_registry.get(model=model_name, model_provider=model_provider, **kwargs)
+
+def coalesce(endpoint: str):
+    """Let concurrent identical requests to ``endpoint`` share one in-flight computation.
+
+    The key covers the validated request body, defaults included, and the
+    model it resolves to.
+    """
+    def decorator(handler):
+        @functools.wraps(handler)
+        async def wrapper(request):
+            model = (
+                getattr(request, "model_provider", None) or app_config.llm.provider,
+                getattr(request, "model_name", None) or app_config.llm.model_name,
+            )
+            payload = request.model_dump(mode="json", exclude={"model_provider", "model_name"})
+            key = SingleFlight.make_key(endpoint, payload, model)
+            return await single_flight.do(endpoint, key, lambda: handler(request))
+        return wrapper
+    return decorator
 
 @app.post("/extract-pdf-text")
 async def extract_pdf_text(file: UploadFile = File(...)):
     """Extract text from an uploaded PDF file."""
     try:
-        contents = await file.read()
-        with pdfplumber.open(BytesIO(contents)) as pdf:
-            text = "\n".join(page.extract_text() or "" for page in pdf.pages)
-        return {"text": text}
+        return await pdf_extractor.extract(file)
+    except PDFLimitExceeded as e:
+        raise HTTPException(status_code=413, detail=str(e))
     except Exception as e:
         return JSONResponse(status_code=500, content={"detail": str(e)})
 
+@app.post("/extract-pdf-text/stream")
+async def stream_pdf_text(file: UploadFile = File(...)):
+    """NDJSON stream of ``meta``, one ``page`` event per page and ``done`` while the PDF is extracted."""
+    # Spool and check the limits before the 200 is sent, so oversized uploads still get a 413.
+    events = pdf_extractor.iter_pages(file)
+    try:
+        first = await events.__anext__()
+    except PDFLimitExceeded as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except Exception as e:
+        return JSONResponse(status_code=500, content={"detail": str(e)})
+
+    async def all_events():
+        yield first
+        async for event in events:
+            yield event
+
+    return ndjson_response(all_events())
+
 @app.get("/list-llm-models")
 async def list_llm_models():
     try:
@@ -60,7 +156,64 @@ async def list_llm_models():
     except Exception as e:
         return JSONResponse(status_code=500, content={"detail": str(e)})
 
+@app.get("/server-stats")
+async def server_stats():
+    stats = {
+        "pid": os.getpid(),
+        "executor": agent_executor.stats(),
+        "llm_clients": llm_registry.stats(),
+        "agent_graphs": agent_graph_cache.stats(),
+        "llm_cache": llm_response_cache.stats(),
+        "rate_limits": llm_rate_limiter.stats(),
+        "jobs": await asyncio.to_thread(job_queue.stats),  # counts jobs in SQLite
+        "single_flight": single_flight.stats(),
+        "admission": admission.stats(),
+        "warmup": warmup.stats(),
+        "pdf": pdf_extractor.stats(),
+        "rag": search_rag_manager.stats(),
+        "search": search_rag_manager.search_runner.stats(),
+        "web_fetch": page_fetcher.stats(),
+    }
+    if vector_owner is not None:
+        stats["vector_owner"] = await asyncio.to_thread(vector_owner.stats)
+    return stats
+
+register_stats_collector({
+    "executor": agent_executor.stats,
+    "admission": admission.stats,
+    "agent_graphs": agent_graph_cache.stats,
+    "llm_cache": llm_response_cache.stats,
+    "single_flight": single_flight.stats,
+    "rate_limits": llm_rate_limiter.stats,
+    "jobs": job_queue.stats,
+    "pdf": pdf_extractor.stats,
+    "rag": search_rag_manager.stats,
+    "search": search_rag_manager.search_runner.stats,
+    "web_fetch": page_fetcher.stats,
+})
+
+@app.get("/healthz", include_in_schema=False)
+async def healthz():
+    """Liveness: the process is up and its event loop answers."""
+    return {"status": "ok"}
+
+@app.get("/readyz", include_in_schema=False)
+async def readyz():
+    """Readiness: required warm-up steps have finished; 503 until then."""
+    body = {"status": "ready" if warmup.ready else "starting", **warmup.stats()}
+    return JSONResponse(status_code=200 if warmup.ready else 503, content=body)
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    # Collecting reads the job store and other locked stats; keep it off the event loop.
+    return Response(await asyncio.to_thread(render_metrics), media_type=CONTENT_TYPE_LATEST)
+
+@app.get("/rate-limits")
+async def rate_limits():
+    return llm_rate_limiter.stats()
+
 @app.post("/chat-with-tutor")
+@coalesce("chat-with-tutor")
 async def chat_with_autor(request: ChatWithAutorRequest):
     llm = get_llm(request.model_provider, request.model_name)
     learner_profile = request.learner_profile
@@ -69,7 +222,8 @@ async def chat_with_autor(request: ChatWithAutorRequest):
             converted_messages = ast.literal_eval(request.messages)
         else:
             return JSONResponse(status_code=400, content={"detail": "messages must be a JSON array string"})
-        response = chat_with_tutor_with_llm(
+        response = await agent_executor.run(
+            chat_with_tutor_with_llm,
             llm,
             converted_messages,
             learner_profile,
@@ -81,15 +235,17 @@ async def chat_with_autor(request: ChatWithAutorRequest):
         return JSONResponse(status_code=500, content={"detail": str(e)})
 
 @app.post("/refine-learning-goal")
+@coalesce("refine-learning-goal")
 async def refine_learning_goal(request: LearningGoalRefinementRequest):
     llm = get_llm(request.model_provider, request.model_name)
     try:
-        refined_learning_goal = refine_learning_goal_with_llm(llm, request.learning_goal, request.learner_information)
+        refined_learning_goal = await agent_executor.run(refine_learning_goal_with_llm, llm, request.learning_goal, request.learner_information)
         return refined_learning_goal
     except Exception as e:
         return JSONResponse(status_code=500, content={"detail": str(e)})
 
 @app.post("/identify-skill-gap-with-info")
+@coalesce("identify-skill-gap-with-info")
 async def identify_skill_gap_with_info(request: SkillGapIdentificationRequest):
     llm = get_llm(request.model_provider, request.model_name)
     learning_goal = request.learning_goal
@@ -100,8 +256,8 @@ async def identify_skill_gap_with_info(request: SkillGapIdentificationRequest):
             skill_requirements = ast.literal_eval(skill_requirements)
         if not isinstance(skill_requirements, dict):
             skill_requirements = None
-        skill_gaps, skill_requirements = identify_skill_gap_with_llm(
-            llm, learning_goal, learner_information, skill_requirements
+        skill_gaps, skill_requirements = await agent_executor.run(
+            identify_skill_gap_with_llm, llm, learning_goal, learner_information, skill_requirements
         )
         results = {**skill_gaps, **skill_requirements}
         return results
@@ -110,6 +266,7 @@ async def identify_skill_gap_with_info(request: SkillGapIdentificationRequest):
 
 
 @app.post("/create-learner-profile-with-info")
+@coalesce("create-learner-profile-with-info")
 async def create_learner_profile_with_info(request: LearnerProfileInitializationWithInfoRequest):
     llm = get_llm(request.model_provider, request.model_name)
     learner_information = request.learner_information
@@ -126,14 +283,15 @@ async def create_learner_profile_with_info(request: LearnerProfileInitialization
                 skill_gaps = ast.literal_eval(skill_gaps)
             except Exception:
                 skill_gaps = {"raw": skill_gaps}
-        learner_profile = initialize_learner_profile_with_llm(
-            llm, learning_goal, learner_information, skill_gaps
+        learner_profile = await agent_executor.run(
+            initialize_learner_profile_with_llm, llm, learning_goal, learner_information, skill_gaps
         )
         return {"learner_profile": learner_profile}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/update-learner-profile")
+@coalesce("update-learner-profile")
 async def update_learner_profile(request: LearnerProfileUpdateRequest):
     llm = get_llm(request.model_provider, request.model_name)
     learner_profile = request.learner_profile
@@ -149,7 +307,8 @@ async def update_learner_profile(request: LearnerProfileUpdateRequest):
                 except Exception:
                     if name != "session_information":
                         locals()[name] = {"raw": val}
-        learner_profile = update_learner_profile_with_llm(
+        learner_profile = await agent_executor.run(
+            update_learner_profile_with_llm,
             llm,
             locals()["learner_profile"],
             locals()["learner_interactions"],
@@ -161,6 +320,7 @@ async def update_learner_profile(request: LearnerProfileUpdateRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/schedule-learning-path")
+@coalesce("schedule-learning-path")
 async def schedule_learning_path(request: LearningPathSchedulingRequest):
     llm = get_llm(request.model_provider, request.model_name)
     learner_profile = request.learner_profile
@@ -170,12 +330,13 @@ async def schedule_learning_path(request: LearningPathSchedulingRequest):
             learner_profile = ast.literal_eval(learner_profile)
         if not isinstance(learner_profile, dict):
             learner_profile = {}
-        learning_path = schedule_learning_path_with_llm(llm, learner_profile, session_count)
+        learning_path = await agent_executor.run(schedule_learning_path_with_llm, llm, learner_profile, session_count)
         return learning_path
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/reschedule-learning-path")
+@coalesce("reschedule-learning-path")
 async def reschedule_learning_path(request: LearningPathReschedulingRequest):
     llm = get_llm(request.model_provider, request.model_name)
     learner_profile = request.learner_profile
@@ -194,14 +355,15 @@ async def reschedule_learning_path(request: LearningPathReschedulingRequest):
                 other_feedback = ast.literal_eval(other_feedback)
             except Exception:
                 pass
-        learning_path = reschedule_learning_path_with_llm(
-            llm, learning_path, learner_profile, session_count, other_feedback
+        learning_path = await agent_executor.run(
+            reschedule_learning_path_with_llm, llm, learning_path, learner_profile, session_count, other_feedback
         )
         return learning_path
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/explore-knowledge-points")
+@coalesce("explore-knowledge-points")
 async def explore_knowledge_points(request: KnowledgePointExplorationRequest):
     llm = get_llm()
     learner_profile = request.learner_profile
@@ -214,12 +376,13 @@ async def explore_knowledge_points(request: KnowledgePointExplorationRequest):
     if isinstance(learning_session, str) and learning_session.strip():
         learning_session = ast.literal_eval(learning_session)
     try:
-        knowledge_points = explore_knowledge_points_with_llm(llm, learner_profile, learning_path, learning_session)
+        knowledge_points = await agent_executor.run(explore_knowledge_points_with_llm, llm, learner_profile, learning_path, learning_session)
         return knowledge_points
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/draft-knowledge-point")
+@coalesce("draft-knowledge-point")
 async def draft_knowledge_point(request: KnowledgePointDraftingRequest):
     llm = get_llm()
     learner_profile = request.learner_profile
@@ -229,12 +392,13 @@ async def draft_knowledge_point(request: KnowledgePointDraftingRequest):
     knowledge_point = request.knowledge_point
     use_search = request.use_search
     try:
-        knowledge_draft = draft_knowledge_point_with_llm(llm, learner_profile, learning_path, learning_session, knowledge_points, knowledge_point, use_search)
+        knowledge_draft = await agent_executor.run(draft_knowledge_point_with_llm, llm, learner_profile, learning_path, learning_session, knowledge_points, knowledge_point, use_search, search_rag_manager=search_rag_manager)
         return {"knowledge_draft": knowledge_draft}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/draft-knowledge-points")
+@coalesce("draft-knowledge-points")
 async def draft_knowledge_points(request: KnowledgePointsDraftingRequest):
     llm = get_llm()
     learner_profile = request.learner_profile
@@ -244,12 +408,13 @@ async def draft_knowledge_points(request: KnowledgePointsDraftingRequest):
     use_search = request.use_search
     allow_parallel = request.allow_parallel
     try:
-        knowledge_drafts = draft_knowledge_points_with_llm(llm, learner_profile, learning_path, learning_session, knowledge_points, allow_parallel, use_search)
+        knowledge_drafts = await agent_executor.run(draft_knowledge_points_with_llm, llm, learner_profile, learning_path, learning_session, knowledge_points, allow_parallel, use_search, search_rag_manager=search_rag_manager)
         return {"knowledge_drafts": knowledge_drafts}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/integrate-learning-document")
+@coalesce("integrate-learning-document")
 async def integrate_learning_document(request: LearningDocumentIntegrationRequest):
     llm = get_llm()
     learner_profile = request.learner_profile
@@ -259,12 +424,13 @@ async def integrate_learning_document(request: LearningDocumentIntegrationReques
     knowledge_drafts = request.knowledge_drafts
     output_markdown = request.output_markdown
     try:
-        learning_document = integrate_learning_document_with_llm(llm, learner_profile, learning_path, learning_session, knowledge_points, knowledge_drafts, output_markdown)
+        learning_document = await agent_executor.run(integrate_learning_document_with_llm, llm, learner_profile, learning_path, learning_session, knowledge_points, knowledge_drafts, output_markdown)
         return {"learning_document": learning_document}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/generate-document-quizzes")
+@coalesce("generate-document-quizzes")
 async def generate_document_quizzes(request: KnowledgeQuizGenerationRequest):
     llm = get_llm()
     learner_profile = request.learner_profile
@@ -274,12 +440,13 @@ async def generate_document_quizzes(request: KnowledgeQuizGenerationRequest):
     true_false_count = request.true_false_count
     short_answer_count = request.short_answer_count
     try:
-        document_quiz = generate_document_quizzes_with_llm(llm, learner_profile, learning_document, single_choice_count, multiple_choice_count, true_false_count, short_answer_count)
+        document_quiz = await agent_executor.run(generate_document_quizzes_with_llm, llm, learner_profile, learning_document, single_choice_count, multiple_choice_count, true_false_count, short_answer_count)
         return {"document_quiz": document_quiz}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/tailor-knowledge-content")
+@coalesce("tailor-knowledge-content")
 async def tailor_knowledge_content(request: TailoredContentGenerationRequest):
     llm = get_llm()
     learning_path = request.learning_path
@@ -289,14 +456,17 @@ async def tailor_knowledge_content(request: TailoredContentGenerationRequest):
     allow_parallel = request.allow_parallel
     with_quiz = request.with_quiz
     try:
-        tailored_content = create_learning_content_with_llm(
-            llm, learner_profile, learning_path, learning_session, allow_parallel=allow_parallel, with_quiz=with_quiz, use_search=use_search
+        tailored_content = await agent_executor.run(
+            create_learning_content_with_llm,
+            llm, learner_profile, learning_path, learning_session, allow_parallel=allow_parallel, with_quiz=with_quiz, use_search=use_search,
+            search_rag_manager=search_rag_manager,
         )
         return {"tailored_content": tailored_content}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/simulate-path-feedback")
+@coalesce("simulate-path-feedback")
 async def simulate_path_feedback(request: LearningPathFeedbackRequest):
     llm = get_llm(request.model_provider, request.model_name)
     learner_profile = request.learner_profile
@@ -306,12 +476,13 @@ async def simulate_path_feedback(request: LearningPathFeedbackRequest):
             learner_profile = ast.literal_eval(learner_profile)
         if isinstance(learning_path, str) and learning_path.strip():
             learning_path = ast.literal_eval(learning_path)
-        feedback = simulate_path_feedback_with_llm(llm, learner_profile, learning_path)
+        feedback = await agent_executor.run(simulate_path_feedback_with_llm, llm, learner_profile, learning_path)
         return {"feedback": feedback}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/simulate-content-feedback")
+@coalesce("simulate-content-feedback")
 async def simulate_content_feedback(request: LearningContentFeedbackRequest):
     llm = get_llm(request.model_provider, request.model_name)
     learner_profile = request.learner_profile
@@ -321,12 +492,13 @@ async def simulate_content_feedback(request: LearningContentFeedbackRequest):
             learner_profile = ast.literal_eval(learner_profile)
         if isinstance(learning_content, str) and learning_content.strip():
             learning_content = ast.literal_eval(learning_content)
-        feedback = simulate_content_feedback_with_llm(llm, learner_profile, learning_content)
+        feedback = await agent_executor.run(simulate_content_feedback_with_llm, llm, learner_profile, learning_content)
         return {"feedback": feedback}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/refine-learning-path")
+@coalesce("refine-learning-path")
 async def refine_learning_path(request: LearningPathRefinementRequest):
     llm = get_llm(request.model_provider, request.model_name)
     learning_path = request.learning_path
@@ -336,12 +508,13 @@ async def refine_learning_path(request: LearningPathRefinementRequest):
             learning_path = ast.literal_eval(learning_path)
         if isinstance(feedback, str) and feedback.strip():
             feedback = ast.literal_eval(feedback)
-        refined_path = refine_learning_path_with_llm(llm, learning_path, feedback)
+        refined_path = await agent_executor.run(refine_learning_path_with_llm, llm, learning_path, feedback)
         return {"refined_learning_path": refined_path}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/iterative-refine-path")
+@coalesce("iterative-refine-path")
 async def iterative_refine_path(request: IterativeRefinementRequest):
     llm = get_llm(request.model_provider, request.model_name)
     learner_profile = request.learner_profile
@@ -358,13 +531,13 @@ async def iterative_refine_path(request: IterativeRefinementRequest):
 
         for i in range(max_iterations):
             # Simulate feedback for current path
-            feedback = simulate_path_feedback_with_llm(llm, learner_profile, current_path)
+            feedback = await agent_executor.run(simulate_path_feedback_with_llm, llm, learner_profile, current_path)
             iterations.append({
                 "iteration": i + 1,
                 "feedback": feedback
             })
             # Refine path based on feedback
-            refined_result = refine_learning_path_with_llm(llm, current_path, feedback)
+            refined_result = await agent_executor.run(refine_learning_path_with_llm, llm, current_path, feedback)
             current_path = refined_result.get("learning_path", current_path)
 
         return {
@@ -374,6 +547,411 @@ async def iterative_refine_path(request: IterativeRefinementRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+
+# ---------------------------------------------------------------------------
+# v2: typed JSON bodies (see api_schemas *V2 models), orjson-encoded responses.
+# Same routes and response shapes as v1, without the str()/literal_eval round-trip.
+# ---------------------------------------------------------------------------
+
+v2 = APIRouter(prefix="/v2", default_response_class=ORJSONResponse)
+
+NDJSON_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def ndjson_response(events):
+    """Stream an async iterator of event dicts as newline-delimited JSON.
+
+    A failure mid-stream cannot change the status code any more, so it is
+    reported as a final ``{"event": "error"}`` line instead.
+    """
+    async def body():
+        try:
+            async for event in events:
+                yield orjson.dumps(event) + b"\n"
+        except Exception as e:
+            yield orjson.dumps({"event": "error", "detail": str(e)}) + b"\n"
+
+    return StreamingResponse(body(), media_type="application/x-ndjson", headers=NDJSON_HEADERS)
+
+
+@v2.post("/chat-with-tutor")
+@coalesce("v2/chat-with-tutor")
+async def chat_with_tutor_v2(request: ChatWithTutorRequestV2):
+    llm = get_llm(request.model_provider, request.model_name)
+    messages = [message.model_dump() for message in request.messages]
+    try:
+        response = await achat_with_tutor_with_llm(
+            llm,
+            messages,
+            request.learner_profile,
+            search_rag_manager=search_rag_manager,
+            use_search=request.use_search,
+        )
+        return {"response": response}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@v2.post("/chat-with-tutor/stream")
+async def stream_chat_with_tutor_v2(request: ChatWithTutorRequestV2):
+    """NDJSON stream of ``retrieval``, ``token`` ... and ``done`` events for one tutor turn."""
+    llm = get_llm(request.model_provider, request.model_name)
+    messages = [message.model_dump() for message in request.messages]
+    events = astream_chat_with_tutor_with_llm(
+        llm,
+        messages,
+        request.learner_profile,
+        search_rag_manager=search_rag_manager,
+        use_search=request.use_search,
+    )
+    return ndjson_response(events)
+
+@v2.post("/refine-learning-goal")
+@coalesce("v2/refine-learning-goal")
+async def refine_learning_goal_v2(request: LearningGoalRefinementRequest):
+    llm = get_llm(request.model_provider, request.model_name)
+    try:
+        return await agent_executor.run(refine_learning_goal_with_llm, llm, request.learning_goal, request.learner_information)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@v2.post("/identify-skill-gap-with-info")
+@coalesce("v2/identify-skill-gap-with-info")
+async def identify_skill_gap_with_info_v2(request: SkillGapIdentificationRequestV2):
+    llm = get_llm(request.model_provider, request.model_name)
+    try:
+        skill_gaps, skill_requirements = await agent_executor.run(
+            identify_skill_gap_with_llm, llm, request.learning_goal, request.learner_information, request.skill_requirements
+        )
+        return {**skill_gaps, **skill_requirements}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@v2.post("/create-learner-profile-with-info")
+@coalesce("v2/create-learner-profile-with-info")
+async def create_learner_profile_with_info_v2(request: LearnerProfileInitializationRequestV2):
+    llm = get_llm(request.model_provider, request.model_name)
+    try:
+        learner_profile = await agent_executor.run(
+            initialize_learner_profile_with_llm, llm, request.learning_goal, request.learner_information, request.skill_gaps
+        )
+        return {"learner_profile": learner_profile}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@v2.post("/update-learner-profile")
+@coalesce("v2/update-learner-profile")
+async def update_learner_profile_v2(request: LearnerProfileUpdateRequestV2):
+    llm = get_llm(request.model_provider, request.model_name)
+    try:
+        learner_profile = await agent_executor.run(
+            update_learner_profile_with_llm,
+            llm,
+            request.learner_profile,
+            request.learner_interactions,
+            request.learner_information,
+            request.session_information,
+        )
+        return {"learner_profile": learner_profile}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@v2.post("/schedule-learning-path")
+@coalesce("v2/schedule-learning-path")
+async def schedule_learning_path_v2(request: LearningPathSchedulingRequestV2):
+    llm = get_llm(request.model_provider, request.model_name)
+    try:
+        return await agent_executor.run(schedule_learning_path_with_llm, llm, request.learner_profile, request.session_count)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@v2.post("/reschedule-learning-path")
+@coalesce("v2/reschedule-learning-path")
+async def reschedule_learning_path_v2(request: LearningPathReschedulingRequestV2):
+    llm = get_llm(request.model_provider, request.model_name)
+    try:
+        return await agent_executor.run(
+            reschedule_learning_path_with_llm,
+            llm,
+            request.learning_path,
+            request.learner_profile,
+            request.session_count,
+            request.other_feedback,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@v2.post("/explore-knowledge-points")
+@coalesce("v2/explore-knowledge-points")
+async def explore_knowledge_points_v2(request: KnowledgePointExplorationRequestV2):
+    llm = get_llm(request.model_provider, request.model_name)
+    try:
+        return await agent_executor.run(
+            explore_knowledge_points_with_llm, llm, request.learner_profile, request.learning_path, request.learning_session
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@v2.post("/draft-knowledge-point")
+@coalesce("v2/draft-knowledge-point")
+async def draft_knowledge_point_v2(request: KnowledgePointDraftingRequestV2):
+    llm = get_llm(request.model_provider, request.model_name)
+    try:
+        knowledge_draft = await agent_executor.run(
+            draft_knowledge_point_with_llm,
+            llm,
+            request.learner_profile,
+            request.learning_path,
+            request.learning_session,
+            request.knowledge_points,
+            request.knowledge_point,
+            request.use_search,
+            search_rag_manager=search_rag_manager,
+        )
+        return {"knowledge_draft": knowledge_draft}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@v2.post("/draft-knowledge-points")
+@coalesce("v2/draft-knowledge-points")
+async def draft_knowledge_points_v2(request: KnowledgePointsDraftingRequestV2):
+    llm = get_llm(request.model_provider, request.model_name)
+    try:
+        knowledge_drafts = await agent_executor.run(
+            draft_knowledge_points_with_llm,
+            llm,
+            request.learner_profile,
+            request.learning_path,
+            request.learning_session,
+            request.knowledge_points,
+            request.allow_parallel,
+            request.use_search,
+            search_rag_manager=search_rag_manager,
+        )
+        return {"knowledge_drafts": knowledge_drafts}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@v2.post("/integrate-learning-document")
+@coalesce("v2/integrate-learning-document")
+async def integrate_learning_document_v2(request: LearningDocumentIntegrationRequestV2):
+    llm = get_llm(request.model_provider, request.model_name)
+    try:
+        learning_document = await agent_executor.run(
+            integrate_learning_document_with_llm,
+            llm,
+            request.learner_profile,
+            request.learning_path,
+            request.learning_session,
+            request.knowledge_points,
+            request.knowledge_drafts,
+            request.output_markdown,
+        )
+        return {"learning_document": learning_document}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@v2.post("/generate-document-quizzes")
+@coalesce("v2/generate-document-quizzes")
+async def generate_document_quizzes_v2(request: KnowledgeQuizGenerationRequestV2):
+    llm = get_llm(request.model_provider, request.model_name)
+    try:
+        document_quiz = await agent_executor.run(
+            generate_document_quizzes_with_llm,
+            llm,
+            request.learner_profile,
+            request.learning_document,
+            request.single_choice_count,
+            request.multiple_choice_count,
+            request.true_false_count,
+            request.short_answer_count,
+        )
+        return {"document_quiz": document_quiz}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@v2.post("/tailor-knowledge-content")
+@coalesce("v2/tailor-knowledge-content")
+async def tailor_knowledge_content_v2(request: TailoredContentGenerationRequestV2):
+    llm = get_llm(request.model_provider, request.model_name)
+    try:
+        tailored_content = await agent_executor.run(
+            create_learning_content_with_llm,
+            llm,
+            request.learner_profile,
+            request.learning_path,
+            request.learning_session,
+            allow_parallel=request.allow_parallel,
+            with_quiz=request.with_quiz,
+            use_search=request.use_search,
+            search_rag_manager=search_rag_manager,
+        )
+        return {"tailored_content": tailored_content}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@v2.post("/tailor-knowledge-content/stream")
+async def stream_tailor_knowledge_content_v2(request: TailoredContentStreamRequestV2):
+    """NDJSON stream of ``knowledge_points``, ``knowledge_draft`` ..., ``document``, ``quizzes`` and ``done`` events."""
+    llm = get_llm(request.model_provider, request.model_name)
+    events = astream_learning_content_with_llm(
+        llm,
+        request.learner_profile,
+        request.learning_path,
+        request.learning_session,
+        allow_parallel=request.allow_parallel,
+        with_quiz=request.with_quiz,
+        use_search=request.use_search,
+        output_markdown=request.output_markdown,
+        method_name=request.method_name,
+        quiz_counts={
+            "single_choice_count": request.single_choice_count,
+            "multiple_choice_count": request.multiple_choice_count,
+            "true_false_count": request.true_false_count,
+            "short_answer_count": request.short_answer_count,
+        },
+        search_rag_manager=search_rag_manager,
+    )
+    return ndjson_response(events)
+
+@v2.post("/learning-path-content/stream")
+async def stream_learning_path_content_v2(request: LearningPathContentBatchRequestV2):
+    """NDJSON stream of per-session content for a whole learning path (see ``astream_learning_path_content_with_llm``)."""
+    llm = get_llm(request.model_provider, request.model_name)
+    events = astream_learning_path_content_with_llm(
+        llm,
+        request.learner_profile,
+        request.learning_path,
+        session_indices=request.session_indices,
+        with_quiz=request.with_quiz,
+        use_search=request.use_search,
+        output_markdown=request.output_markdown,
+        max_concurrent_sessions=int(batch_config.get("max_concurrent_sessions", 3)),
+        quiz_counts={
+            "single_choice_count": request.single_choice_count,
+            "multiple_choice_count": request.multiple_choice_count,
+            "true_false_count": request.true_false_count,
+            "short_answer_count": request.short_answer_count,
+        },
+        search_max_workers=int(app_config.get("rag", {}).get("max_workers", 3)),
+        search_rag_manager=search_rag_manager,
+        llm_semaphore=batch_llm_semaphore,
+    )
+    return ndjson_response(events)
+
+@v2.post("/simulate-path-feedback")
+@coalesce("v2/simulate-path-feedback")
+async def simulate_path_feedback_v2(request: LearningPathFeedbackRequestV2):
+    llm = get_llm(request.model_provider, request.model_name)
+    try:
+        feedback = await agent_executor.run(simulate_path_feedback_with_llm, llm, request.learner_profile, request.learning_path)
+        return {"feedback": feedback}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@v2.post("/simulate-content-feedback")
+@coalesce("v2/simulate-content-feedback")
+async def simulate_content_feedback_v2(request: LearningContentFeedbackRequestV2):
+    llm = get_llm(request.model_provider, request.model_name)
+    try:
+        feedback = await agent_executor.run(simulate_content_feedback_with_llm, llm, request.learner_profile, request.learning_content)
+        return {"feedback": feedback}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@v2.post("/refine-learning-path")
+@coalesce("v2/refine-learning-path")
+async def refine_learning_path_v2(request: LearningPathRefinementRequestV2):
+    llm = get_llm(request.model_provider, request.model_name)
+    try:
+        refined_path = await agent_executor.run(refine_learning_path_with_llm, llm, request.learning_path, request.feedback)
+        return {"refined_learning_path": refined_path}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@v2.post("/iterative-refine-path")
+@coalesce("v2/iterative-refine-path")
+async def iterative_refine_path_v2(request: IterativeRefinementRequestV2):
+    llm = get_llm(request.model_provider, request.model_name)
+    max_iterations = min(request.max_iterations, 5)  # Cap at 5 iterations
+    try:
+        iterations = []
+        current_path = request.learning_path
+        for i in range(max_iterations):
+            feedback = await agent_executor.run(simulate_path_feedback_with_llm, llm, request.learner_profile, current_path)
+            iterations.append({"iteration": i + 1, "feedback": feedback})
+            refined_result = await agent_executor.run(refine_learning_path_with_llm, llm, current_path, feedback)
+            current_path = refined_result.get("learning_path", current_path)
+        return {"final_learning_path": current_path, "iterations": iterations}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+app.include_router(v2)
+
+
+# ---------------------------------------------------------------------------
+# Background jobs: the v2 handlers above, run by the job queue and persisted in
+# SQLite so a dropped connection or a frontend rerun does not lose the work.
+# ---------------------------------------------------------------------------
+
+JOB_PIPELINES = {
+    "schedule-learning-path": (LearningPathSchedulingRequestV2, schedule_learning_path_v2),
+    "explore-knowledge-points": (KnowledgePointExplorationRequestV2, explore_knowledge_points_v2),
+    "draft-knowledge-points": (KnowledgePointsDraftingRequestV2, draft_knowledge_points_v2),
+    "integrate-learning-document": (LearningDocumentIntegrationRequestV2, integrate_learning_document_v2),
+    "generate-document-quizzes": (KnowledgeQuizGenerationRequestV2, generate_document_quizzes_v2),
+    "tailor-knowledge-content": (TailoredContentGenerationRequestV2, tailor_knowledge_content_v2),
+    "iterative-refine-path": (IterativeRefinementRequestV2, iterative_refine_path_v2),
+}
+
+
+def _job_runner(request_model, handler):
+    async def run(payload):
+        return await handler(request_model.model_validate(payload))
+    return run
+
+
+for _pipeline, (_request_model, _handler) in JOB_PIPELINES.items():
+    job_queue.register(_pipeline, _job_runner(_request_model, _handler), _request_model)
+
+
+def _job_status(job):
+    return {key: job[key] for key in ("id", "pipeline", "status", "error", "attempts", "created_at", "started_at", "finished_at")}
+
+jobs = APIRouter(prefix="/jobs", default_response_class=ORJSONResponse)
+
+@jobs.post("/{pipeline}", status_code=202)
+async def submit_job(pipeline: str, payload: Dict[str, Any] = Body(...), force: bool = False):
+    """Queue ``pipeline`` with the v2 request body; an identical pending or finished job is returned instead."""
+    if pipeline not in JOB_PIPELINES:
+        raise HTTPException(status_code=404, detail=f"Unknown pipeline '{pipeline}'")
+    try:
+        job, created = await job_queue.submit(pipeline, payload, force=force)
+    except ValidationError as e:
+        # The same 422 a malformed body gets on the pipeline's own endpoint.
+        errors = [{**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)]
+        raise RequestValidationError(errors, body=payload)
+    return {**_job_status(job), "created": created}
+
+@jobs.get("/{job_id}")
+async def get_job(job_id: str):
+    job = await job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job '{job_id}'")
+    return _job_status(job)
+
+@jobs.get("/{job_id}/result")
+async def get_job_result(job_id: str):
+    job = await job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job '{job_id}'")
+    if job["status"] in PENDING_STATUSES:
+        return ORJSONResponse(status_code=202, content=_job_status(job))
+    if job["error"] is not None:
+        raise HTTPException(status_code=500, detail=job["error"])
+    return {**_job_status(job), "result": job["result"]}
+
+app.include_router(jobs)
+
 if __name__ == "__main__":
     server_cfg = app_config.get("server", {})
     host = app_config.get("server", {}).get("host", "127.0.0.1")
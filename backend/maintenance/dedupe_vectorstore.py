@@ -0,0 +1,51 @@
+"""Remove duplicate chunks from the persistent Chroma collection and give the rest stable ids.
+
+Before chunk ids were derived from source and content, every search added the
+pages it fetched again under random ids. This keeps one record per (source,
+text), moves it to its stable id so later ingestion recognises it, and deletes
+the other copies. Stored embeddings are reused; nothing is re-embedded.
+
+Stop the server first: with multi-process serving the vector owner keeps the
+collection open.
+
+Run from the repo root:
+    python backend/maintenance/dedupe_vectorstore.py [--dry-run] [--config main]
+"""
+
+import argparse
+import json
+import os
+import sys
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, BACKEND_DIR)
+
+from base.chunk_ids import dedupe_collection
+from config import load_config
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--config", default="main", help="config name, as for the server")
+    parser.add_argument("--persist-directory", help="defaults to vectorstore.persist_directory")
+    parser.add_argument("--collection", help="defaults to vectorstore.collection_name")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--dry-run", action="store_true", help="only count duplicates")
+    args = parser.parse_args()
+
+    vectorstore_config = load_config(config_name=args.config).get("vectorstore", {})
+    import chromadb
+
+    # Relative paths in the config are relative to backend/, where the server runs.
+    persist_directory = args.persist_directory or os.path.join(
+        BACKEND_DIR, vectorstore_config.get("persist_directory", "./data/vectorstore")
+    )
+    client = chromadb.PersistentClient(path=persist_directory)
+    collection = client.get_collection(args.collection or vectorstore_config.get("collection_name", "default_collection"))
+    summary = dedupe_collection(collection, batch_size=args.batch_size, dry_run=args.dry_run)
+    summary["remaining"] = collection.count()
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,2 +1,2 @@
-from .ai_chatbot_tutor import AITutorChatbot, chat_with_tutor_with_llm
-from .skill_gap_identification import SkillGapIdentifier, identify_skill_gap_with_llm, LearningGoalRefiner, refine_learning_goal_with_llm
\ No newline at end of file
+from .ai_chatbot_tutor import AITutorChatbot, chat_with_tutor_with_llm, achat_with_tutor_with_llm, astream_chat_with_tutor_with_llm
+from .skill_gap_identification import SkillGapIdentifier, identify_skill_gap_with_llm, LearningGoalRefiner, refine_learning_goal_with_llm, aidentify_skill_gap_with_llm, arefine_learning_goal_with_llm
\ No newline at end of file
@@ -63,6 +63,22 @@ class AdaptiveLearnerProfiler(BaseAgent):
         validated_output = LearnerProfile.model_validate(raw_output)
         return validated_output.model_dump()
 
+    async def ainitialize_profile(self, input_dict: Dict[str, Any]) -> Dict[str, Any]:
+        """Async variant of :meth:`initialize_profile`."""
+        task_prompt = adaptive_learner_profiler_task_prompt_initialization
+        payload_dict = LearnerProfileInitializationPayload(**input_dict).model_dump()
+        raw_output = await self.ainvoke(payload_dict, task_prompt=task_prompt)
+        validated_output = LearnerProfile.model_validate(raw_output)
+        return validated_output.model_dump()
+
+    async def aupdate_profile(self, input_dict: Dict[str, Any]) -> Dict[str, Any]:
+        """Async variant of :meth:`update_profile`."""
+        task_prompt = adaptive_learner_profiler_task_prompt_update
+        payload_dict = LearnerProfileUpdatePayload(**input_dict).model_dump()
+        raw_output = await self.ainvoke(payload_dict, task_prompt=task_prompt)
+        validated_output = LearnerProfile.model_validate(raw_output)
+        return validated_output.model_dump()
+
 
 def initialize_learner_profile_with_llm(
     llm: Any,
@@ -99,6 +115,41 @@ def update_learner_profile_with_llm(
     }
     return learner_profiler.update_profile(payload_dict)
 
+
+async def ainitialize_learner_profile_with_llm(
+    llm: Any,
+    learning_goal: str,
+    learner_information: Union[str, Mapping[str, Any]],
+    skill_gaps: Union[str, Mapping[str, Any], List[Any]],
+) -> Dict[str, Any]:
+    """Async variant of :func:`initialize_learner_profile_with_llm`."""
+    learner_profiler = AdaptiveLearnerProfiler(llm)
+    payload_dict = {
+        "learning_goal": learning_goal,
+        "learner_information": learner_information,
+        "skill_gaps": skill_gaps,
+    }
+    return await learner_profiler.ainitialize_profile(payload_dict)
+
+
+async def aupdate_learner_profile_with_llm(
+    llm: Any,
+    learner_profile: Union[str, Mapping[str, Any]],
+    learner_interactions: Union[str, Mapping[str, Any]],
+    learner_information: Union[str, Mapping[str, Any]],
+    session_information: Optional[Union[str, Mapping[str, Any]]] = None,
+) -> Dict[str, Any]:
+    """Async variant of :func:`update_learner_profile_with_llm`."""
+
+    learner_profiler = AdaptiveLearnerProfiler(llm)
+    payload_dict = {
+        "learner_profile": learner_profile,
+        "learner_interactions": learner_interactions,
+        "learner_information": learner_information,
+        "session_information": session_information,
+    }
+    return await learner_profiler.aupdate_profile(payload_dict)
+
 if __name__ == "__main__":
     from base.llm_factory import LLMFactory
 
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import ast
-from typing import Any, List, Mapping, Optional, Sequence
+import asyncio
+import time
+from typing import Any, AsyncIterator, Dict, List, Mapping, Optional, Sequence
 
 from pydantic import BaseModel, field_validator
 
@@ -77,15 +79,7 @@ class AITutorChatbot(BaseAgent):
 		super().__init__(model=model, system_prompt=ai_tutor_chatbot_system_prompt, jsonalize_output=False)
 		self.search_rag_manager = search_rag_manager
 
-	def chat(self, payload: TutorChatPayload | Mapping[str, Any] | str):
-		if not isinstance(payload, TutorChatPayload):
-			payload = TutorChatPayload.model_validate(payload)
-
-		data = payload.model_dump()
-		messages = data.get("messages")
-		history_text = _stringify_history(messages)
-		query = _last_user_query(messages)
-
+	def _retrieve_context(self, data: Mapping[str, Any], query: str) -> str:
 		external_context = data.get("external_resources") or ""
 		if self.search_rag_manager is not None and query:
 			try:
@@ -99,15 +93,77 @@ class AITutorChatbot(BaseAgent):
 					external_context = f"{external_context}\n{context}" if external_context else context
 			except Exception:
 				pass
+		return external_context
+
+	def chat(self, payload: TutorChatPayload | Mapping[str, Any] | str):
+		if not isinstance(payload, TutorChatPayload):
+			payload = TutorChatPayload.model_validate(payload)
+
+		data = payload.model_dump()
+		messages = data.get("messages")
+		history_text = _stringify_history(messages)
+		query = _last_user_query(messages)
 
 		input_vars = {
 			"learner_profile": data.get("learner_profile", ""),
 			"messages": history_text,
-			"external_resources": external_context,
+			"external_resources": self._retrieve_context(data, query),
 		}
 		raw_reply = self.invoke(input_vars, task_prompt=ai_tutor_chatbot_task_prompt)
 		return raw_reply
 
+	async def achat(self, payload: TutorChatPayload | Mapping[str, Any] | str):
+		if not isinstance(payload, TutorChatPayload):
+			payload = TutorChatPayload.model_validate(payload)
+
+		data = payload.model_dump()
+		messages = data.get("messages")
+		history_text = _stringify_history(messages)
+		query = _last_user_query(messages)
+
+		# Search, page loading and embedding are blocking; keep them off the event loop.
+		external_context = await asyncio.to_thread(self._retrieve_context, data, query)
+		input_vars = {
+			"learner_profile": data.get("learner_profile", ""),
+			"messages": history_text,
+			"external_resources": external_context,
+		}
+		return await self.ainvoke(input_vars, task_prompt=ai_tutor_chatbot_task_prompt)
+
+	async def astream_chat(self, payload: TutorChatPayload | Mapping[str, Any] | str) -> AsyncIterator[Dict[str, Any]]:
+		"""Stream a chat turn as events.
+
+		Yields ``{"event": "retrieval", ...}`` once context retrieval finishes,
+		one ``{"event": "token", "text": ...}`` per generated chunk and a final
+		``{"event": "done", "response": ...}`` carrying the full reply.
+		"""
+		if not isinstance(payload, TutorChatPayload):
+			payload = TutorChatPayload.model_validate(payload)
+
+		data = payload.model_dump()
+		messages = data.get("messages")
+		history_text = _stringify_history(messages)
+		query = _last_user_query(messages)
+
+		started = time.perf_counter()
+		external_context = await asyncio.to_thread(self._retrieve_context, data, query)
+		yield {
+			"event": "retrieval",
+			"context_chars": len(external_context),
+			"elapsed_seconds": time.perf_counter() - started,
+		}
+
+		input_vars = {
+			"learner_profile": data.get("learner_profile", ""),
+			"messages": history_text,
+			"external_resources": external_context,
+		}
+		parts: List[str] = []
+		async for text in self.astream(input_vars, task_prompt=ai_tutor_chatbot_task_prompt):
+			parts.append(text)
+			yield {"event": "token", "text": text}
+		yield {"event": "done", "response": "".join(parts).strip()}
+
 
 def chat_with_tutor_with_llm(
 	llm: Any,
@@ -132,3 +188,43 @@ def chat_with_tutor_with_llm(
 		"top_k": top_k,
 	}
 	return agent.chat(payload)
+
+
+async def achat_with_tutor_with_llm(
+	llm: Any,
+	messages: Optional[Sequence[Mapping[str, Any]]] | str = None,
+	learner_profile: Any = "",
+	*,
+	search_rag_manager: Optional[SearchRagManager] = None,
+	use_search: bool = True,
+	top_k: int = 5,
+):
+	"""Async variant of :func:`chat_with_tutor_with_llm`."""
+	agent = AITutorChatbot(llm, search_rag_manager=search_rag_manager)
+	payload = {
+		"learner_profile": learner_profile,
+		"messages": messages,
+		"use_search": use_search,
+		"top_k": top_k,
+	}
+	return await agent.achat(payload)
+
+
+def astream_chat_with_tutor_with_llm(
+	llm: Any,
+	messages: Optional[Sequence[Mapping[str, Any]]] | str = None,
+	learner_profile: Any = "",
+	*,
+	search_rag_manager: Optional[SearchRagManager] = None,
+	use_search: bool = True,
+	top_k: int = 5,
+) -> AsyncIterator[Dict[str, Any]]:
+	"""Streaming variant of :func:`chat_with_tutor_with_llm`; see :meth:`AITutorChatbot.astream_chat`."""
+	agent = AITutorChatbot(llm, search_rag_manager=search_rag_manager)
+	payload = {
+		"learner_profile": learner_profile,
+		"messages": messages,
+		"use_search": use_search,
+		"top_k": top_k,
+	}
+	return agent.astream_chat(payload)
@@ -93,6 +93,21 @@ class GroundTruthProfileCreator(BaseAgent):
         validated = parse_ground_truth_profile_result(raw_output)
         return validated.model_dump()
 
+    async def acreate_profile(self, input_dict: Mapping[str, Any]) -> Dict[str, Any]:
+        payload = GroundTruthProfileCreatePayload(**input_dict).model_dump()
+        task_prompt = ground_truth_profile_creator_task_prompt
+        raw_output = await self.ainvoke(payload, task_prompt=task_prompt)
+        validated = parse_ground_truth_profile_result(raw_output)
+        return validated.model_dump()
+
+    async def aprogress_profile(self, input_dict: Mapping[str, Any]) -> Dict[str, Any]:
+        """Async variant of :meth:`progress_profile`."""
+        payload = GroundTruthProfileProgressPayload(**input_dict).model_dump()
+        task_prompt = ground_truth_profile_creator_task_prompt_progress
+        raw_output = await self.ainvoke(payload, task_prompt=task_prompt)
+        validated = parse_ground_truth_profile_result(raw_output)
+        return validated.model_dump()
+
 def create_ground_truth_profile_with_llm(
     llm: Any,
     learning_goal: str,
@@ -107,3 +122,19 @@ def create_ground_truth_profile_with_llm(
             "skill_requirements": skill_requirements,
         }
     )
+
+
+async def acreate_ground_truth_profile_with_llm(
+    llm: Any,
+    learning_goal: str,
+    learner_information: Union[str, Mapping[str, Any]] = "",
+    skill_requirements: Optional[Union[str, Mapping[str, Any]]] = None,
+) -> Dict[str, Any]:
+    creator = GroundTruthProfileCreator(llm)
+    return await creator.acreate_profile(
+        {
+            "learning_goal": learning_goal,
+            "learner_information": learner_information,
+            "skill_requirements": skill_requirements,
+        }
+    )
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import ast
+import asyncio
 import json
 import os
 from typing import Any, Dict, Mapping, Union
@@ -63,6 +64,14 @@ class LearnerInteractionSimulator(BaseAgent):
         validated = parse_learner_behavior_log(raw_output)
         return validated.model_dump()
 
+    async def asimulate_interactions(self, input_dict: Mapping[str, Any]) -> Dict[str, Any]:
+        """Async variant of :meth:`simulate_interactions`."""
+        payload = LearnerInteractionPayload(**input_dict).model_dump()
+        task_prompt = learner_interaction_simulator_task_prompt
+        raw_output = await self.ainvoke(payload, task_prompt=task_prompt)
+        validated = parse_learner_behavior_log(raw_output)
+        return validated.model_dump()
+
 
 def simulate_learner_interactions_with_llm(
     llm: Any,
@@ -84,10 +93,36 @@ def simulate_learner_interactions_with_llm(
         )
         behavior_logs.append(behavior_log)
 
+    _save_behavior_logs(behavior_logs)
+    return behavior_logs
+
+
+async def asimulate_learner_interactions_with_llm(
+    llm: Any,
+    ground_truth_profile: Union[str, Mapping[str, Any]],
+    session_count: int = 5,
+) -> list[Dict[str, Any]]:
+    """Async variant of :func:`simulate_learner_interactions_with_llm`; sessions are simulated concurrently."""
+
+    learner_behavior_simulator = LearnerInteractionSimulator(llm)
+    behavior_logs = await asyncio.gather(*[
+        learner_behavior_simulator.asimulate_interactions(
+            {
+                "ground_truth_profile": ground_truth_profile,
+                "session_number": session,
+            }
+        )
+        for session in range(1, session_count + 1)
+    ])
+    behavior_logs = list(behavior_logs)
+    _save_behavior_logs(behavior_logs)
+    return behavior_logs
+
+
+def _save_behavior_logs(behavior_logs: list[Dict[str, Any]]) -> None:
     # Save logs to data/output/behavior_logs.json
     out_dir = os.path.join("data", "output")
     os.makedirs(out_dir, exist_ok=True)
     out_path = os.path.join(out_dir, "behavior_logs.json")
     with open(out_path, "w", encoding="utf-8") as f:
         json.dump(behavior_logs, f, ensure_ascii=False, indent=2)
-    return behavior_logs
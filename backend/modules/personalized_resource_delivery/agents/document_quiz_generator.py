@@ -45,6 +45,13 @@ class DocumentQuizGenerator(BaseAgent):
         validated_output = DocumentQuiz.model_validate(raw_output)
         return validated_output.model_dump()
 
+    async def agenerate(self, payload: DocumentQuizPayload | Mapping[str, Any] | str):
+        if not isinstance(payload, DocumentQuizPayload):
+            payload = DocumentQuizPayload.model_validate(payload)
+        raw_output = await self.ainvoke(payload.model_dump(), task_prompt=document_quiz_generator_task_prompt)
+        validated_output = DocumentQuiz.model_validate(raw_output)
+        return validated_output.model_dump()
+
 
 def generate_document_quizzes_with_llm(
     llm,
@@ -65,3 +72,24 @@ def generate_document_quizzes_with_llm(
     }
     gen = DocumentQuizGenerator(llm)
     return gen.generate(payload)
+
+
+async def agenerate_document_quizzes_with_llm(
+    llm,
+    learner_profile,
+    learning_document,
+    single_choice_count: int = 3,
+    multiple_choice_count: int = 0,
+    true_false_count: int = 0,
+    short_answer_count: int = 0,
+):
+    payload = {
+        "learner_profile": learner_profile,
+        "learning_document": learning_document,
+        "single_choice_count": single_choice_count,
+        "multiple_choice_count": multiple_choice_count,
+        "true_false_count": true_false_count,
+        "short_answer_count": short_answer_count,
+    }
+    gen = DocumentQuizGenerator(llm)
+    return await gen.agenerate(payload)
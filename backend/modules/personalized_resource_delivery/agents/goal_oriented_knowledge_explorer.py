@@ -30,6 +30,13 @@ class GoalOrientedKnowledgeExplorer(BaseAgent):
         validated_output = KnowledgePoints.model_validate(raw_output)
         return validated_output.model_dump()
 
+    async def aexplore(self, payload: KnowledgeExplorePayload | Mapping[str, Any] | str | dict):
+        if not isinstance(payload, KnowledgeExplorePayload):
+            payload = KnowledgeExplorePayload.model_validate(payload)
+        raw_output = await self.ainvoke(payload.model_dump(), task_prompt=goal_oriented_knowledge_explorer_task_prompt)
+        validated_output = KnowledgePoints.model_validate(raw_output)
+        return validated_output.model_dump()
+
 
 def explore_knowledge_points_with_llm(llm, learner_profile, learning_path, learning_session):
     """Convenience wrapper to explore knowledge points for a session using the agent.
@@ -43,3 +50,15 @@ def explore_knowledge_points_with_llm(llm, learner_profile, learning_path, learn
     }
     explorer = GoalOrientedKnowledgeExplorer(llm)
     return explorer.explore(input_dict)
+
+
+async def aexplore_knowledge_points_with_llm(llm, learner_profile, learning_path, learning_session):
+    """Async variant of :func:`explore_knowledge_points_with_llm`."""
+    input_dict = {
+        "learner_profile": learner_profile,
+        "learning_path": learning_path,
+        "learning_session": learning_session,
+    }
+    explorer = GoalOrientedKnowledgeExplorer(llm)
+    return await explorer.aexplore(input_dict)
+
@@ -58,6 +58,22 @@ class LearnerFeedbackSimulator(BaseAgent):
         validated_output = LearnerFeedback.model_validate(raw_output)
         return validated_output.model_dump()
 
+    async def afeedback_path(self, payload: LearningPathFeedbackPayload | Mapping[str, Any] | str):
+        task_prompt = learner_feedback_simulator_task_prompt_path
+        if not isinstance(payload, LearningPathFeedbackPayload):
+            payload = LearningPathFeedbackPayload.model_validate(payload)
+        raw_output = await self.ainvoke(payload.model_dump(), task_prompt=task_prompt)
+        validated_output = LearnerFeedback.model_validate(raw_output)
+        return validated_output.model_dump()
+
+    async def afeedback_content(self, payload: LearningContentFeedbackPayload | Mapping[str, Any] | str):
+        task_prompt = learner_feedback_simulator_task_prompt_content
+        if not isinstance(payload, LearningContentFeedbackPayload):
+            payload = LearningContentFeedbackPayload.model_validate(payload)
+        raw_output = await self.ainvoke(payload.model_dump(), task_prompt=task_prompt)
+        validated_output = LearnerFeedback.model_validate(raw_output)
+        return validated_output.model_dump()
+
 
 def simulate_path_feedback_with_llm(
     llm: Any,
@@ -84,4 +100,32 @@ def simulate_content_feedback_with_llm(
         "learner_profile": learner_profile,
         "learning_content": learning_content,
     }
-    return simulator.feedback_content(payload)
\ No newline at end of file
+    return simulator.feedback_content(payload)
+
+
+async def asimulate_path_feedback_with_llm(
+    llm: Any,
+    learner_profile: Mapping[str, Any],
+    learning_path: Any,
+) -> dict:
+    """Async variant of :func:`simulate_path_feedback_with_llm`."""
+    simulator = LearnerFeedbackSimulator(llm)
+    payload = {
+        "learner_profile": learner_profile,
+        "learning_path": learning_path,
+    }
+    return await simulator.afeedback_path(payload)
+
+
+async def asimulate_content_feedback_with_llm(
+    llm: Any,
+    learner_profile: Mapping[str, Any],
+    learning_content: Any,
+) -> dict:
+    """Async variant of :func:`simulate_content_feedback_with_llm`."""
+    simulator = LearnerFeedbackSimulator(llm)
+    payload = {
+        "learner_profile": learner_profile,
+        "learning_content": learning_content,
+    }
+    return await simulator.afeedback_content(payload)
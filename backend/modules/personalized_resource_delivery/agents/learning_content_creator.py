@@ -1,10 +1,13 @@
 from __future__ import annotations
 
-from typing import Any, Mapping, Optional
+import asyncio
+import logging
+import time
+from typing import Any, AsyncIterator, Dict, Mapping, Optional
 
 from pydantic import BaseModel, Field, field_validator
 
-from base import BaseAgent
+from base import BaseAgent, use_llm_call_limit
 from base.search_rag import SearchRagManager, format_docs
 from modules.personalized_resource_delivery.prompts.learning_content_creator import (
     learning_content_creator_system_prompt,
@@ -14,6 +17,7 @@ from modules.personalized_resource_delivery.prompts.learning_content_creator imp
 )
 from modules.personalized_resource_delivery.schemas import ContentOutline, KnowledgeDraft, LearningContent
 
+logger = logging.getLogger(__name__)
 
 class ContentBasePayload(BaseModel):
     learner_profile: Any
@@ -54,6 +58,34 @@ class LearningContentCreator(BaseAgent):
         validated_output = LearningContent.model_validate(raw_output)
         return validated_output.model_dump()
 
+    async def aprepare_outline(self, payload: ContentBasePayload | Mapping[str, Any] | str):
+        if not isinstance(payload, ContentBasePayload):
+            payload = ContentBasePayload.model_validate(payload)
+        raw_output = await self.ainvoke(payload.model_dump(), task_prompt=learning_content_creator_task_prompt_outline)
+        validated_output = ContentOutline.model_validate(raw_output)
+        return validated_output.model_dump()
+
+    async def adraft_section(self, payload: ContentDraftPayload | Mapping[str, Any] | str):
+        if not isinstance(payload, ContentDraftPayload):
+            payload = ContentDraftPayload.model_validate(payload)
+        raw_output = await self.ainvoke(payload.model_dump(), task_prompt=learning_content_creator_task_prompt_draft)
+        validated_output = KnowledgeDraft.model_validate(raw_output)
+        return validated_output.model_dump()
+
+    async def acreate_content(self, payload: ContentBasePayload | Mapping[str, Any] | str):
+        if not isinstance(payload, ContentBasePayload):
+            payload = ContentBasePayload.model_validate(payload)
+        raw_output = await self.ainvoke(payload.model_dump(), task_prompt=learning_content_creator_task_prompt_content)
+        validated_output = LearningContent.model_validate(raw_output)
+        return validated_output.model_dump()
+
+
+def _unwrap_knowledge_points(knowledge_points):
+    """The explorer returns ``{"knowledge_points": [...]}``; the drafter expects the list."""
+    if isinstance(knowledge_points, Mapping) and "knowledge_points" in knowledge_points:
+        return knowledge_points["knowledge_points"]
+    return knowledge_points
+
 
 def prepare_content_outline_with_llm(llm, learner_profile, learning_path, learning_session, *, search_rag_manager: Optional[SearchRagManager] = None):
     creator = LearningContentCreator(llm, search_rag_manager=search_rag_manager)
@@ -65,6 +97,16 @@ def prepare_content_outline_with_llm(llm, learner_profile, learning_path, learni
     return creator.prepare_outline(payload)
 
 
+async def aprepare_content_outline_with_llm(llm, learner_profile, learning_path, learning_session, *, search_rag_manager: Optional[SearchRagManager] = None):
+    creator = LearningContentCreator(llm, search_rag_manager=search_rag_manager)
+    payload = {
+        "learner_profile": learner_profile,
+        "learning_path": learning_path,
+        "learning_session": learning_session,
+    }
+    return await creator.aprepare_outline(payload)
+
+
 def create_learning_content_with_llm(
     llm,
     learner_profile,
@@ -86,9 +128,9 @@ def create_learning_content_with_llm(
     from .document_quiz_generator import generate_document_quizzes_with_llm
 
     if method_name == "genmentor":
-        knowledge_points = explore_knowledge_points_with_llm(
+        knowledge_points = _unwrap_knowledge_points(explore_knowledge_points_with_llm(
             llm, learner_profile, learning_path, learning_session
-        )
+        ))
         knowledge_drafts = draft_knowledge_points_with_llm(
             llm,
             learner_profile,
@@ -141,3 +183,330 @@ def create_learning_content_with_llm(
             "external_resources": "",
         }
         return creator.create_content(payload)
+
+
+async def acreate_learning_content_with_llm(
+    llm,
+    learner_profile,
+    learning_path,
+    learning_session,
+    document_outline=None,
+    allow_parallel=True,
+    with_quiz=True,
+    max_workers=3,
+    use_search=True,
+    output_markdown=True,
+    method_name="genmentor",
+    *,
+    search_rag_manager: Optional[SearchRagManager] = None,
+):
+    """Async variant of :func:`create_learning_content_with_llm`."""
+    from .goal_oriented_knowledge_explorer import aexplore_knowledge_points_with_llm
+    from .search_enhanced_knowledge_drafter import adraft_knowledge_points_with_llm
+    from .learning_document_integrator import aintegrate_learning_document_with_llm
+    from .document_quiz_generator import agenerate_document_quizzes_with_llm
+
+    if method_name == "genmentor":
+        knowledge_points = _unwrap_knowledge_points(await aexplore_knowledge_points_with_llm(
+            llm, learner_profile, learning_path, learning_session
+        ))
+        knowledge_drafts = await adraft_knowledge_points_with_llm(
+            llm,
+            learner_profile,
+            learning_path,
+            learning_session,
+            knowledge_points,
+            allow_parallel=allow_parallel,
+            use_search=use_search,
+            max_workers=max_workers,
+            search_rag_manager=search_rag_manager,
+        )
+        learning_document = await aintegrate_learning_document_with_llm(
+            llm,
+            learner_profile,
+            learning_path,
+            learning_session,
+            knowledge_points,
+            knowledge_drafts,
+            output_markdown=output_markdown,
+        )
+        learning_content = {"document": learning_document}
+        if not with_quiz:
+            return learning_content
+        document_quiz = await agenerate_document_quizzes_with_llm(
+            llm,
+            learner_profile,
+            learning_document,
+            single_choice_count=3,
+            multiple_choice_count=0,
+            true_false_count=0,
+            short_answer_count=0,
+        )
+        learning_content["quizzes"] = document_quiz
+        return learning_content
+    else:
+        creator = LearningContentCreator(llm, search_rag_manager=search_rag_manager)
+        if document_outline is None:
+            document_outline = await aprepare_content_outline_with_llm(
+                llm,
+                learner_profile,
+                learning_path,
+                learning_session,
+                search_rag_manager=search_rag_manager,
+            )
+        payload = {
+            "learner_profile": learner_profile,
+            "learning_path": learning_path,
+            "learning_session": learning_session,
+            "external_resources": "",
+        }
+        return await creator.acreate_content(payload)
+
+
+async def astream_learning_content_with_llm(
+    llm,
+    learner_profile,
+    learning_path,
+    learning_session,
+    allow_parallel=True,
+    with_quiz=True,
+    max_workers=3,
+    use_search=True,
+    output_markdown=True,
+    method_name="genmentor",
+    quiz_counts: Optional[Mapping[str, int]] = None,
+    *,
+    search_rag_manager: Optional[SearchRagManager] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Run the content pipeline and yield each stage's result as soon as it is ready.
+
+    Events, in order: ``knowledge_points``; one ``knowledge_draft`` per point in
+    completion order (with its ``index`` into the knowledge points); ``document``;
+    ``quizzes`` when ``with_quiz``; and a final ``done``. Methods other than
+    ``genmentor`` have no intermediate stages and yield a single ``document``.
+    """
+    from .goal_oriented_knowledge_explorer import aexplore_knowledge_points_with_llm
+    from .search_enhanced_knowledge_drafter import adraft_knowledge_point_with_llm
+    from .learning_document_integrator import aintegrate_learning_document_with_llm
+    from .document_quiz_generator import agenerate_document_quizzes_with_llm
+
+    if method_name != "genmentor":
+        learning_content = await acreate_learning_content_with_llm(
+            llm,
+            learner_profile,
+            learning_path,
+            learning_session,
+            method_name=method_name,
+            search_rag_manager=search_rag_manager,
+        )
+        yield {"event": "document", "learning_document": learning_content}
+        yield {"event": "done"}
+        return
+
+    knowledge_points = _unwrap_knowledge_points(await aexplore_knowledge_points_with_llm(
+        llm, learner_profile, learning_path, learning_session
+    ))
+    yield {"event": "knowledge_points", "knowledge_points": knowledge_points}
+
+    semaphore = asyncio.Semaphore(max(1, max_workers if allow_parallel else 1))
+
+    async def draft_one(index, knowledge_point):
+        async with semaphore:
+            draft = await adraft_knowledge_point_with_llm(
+                llm,
+                learner_profile,
+                learning_path,
+                learning_session,
+                knowledge_points,
+                knowledge_point,
+                use_search=use_search,
+                search_rag_manager=search_rag_manager,
+            )
+        return index, draft
+
+    knowledge_drafts = [None] * len(knowledge_points)
+    tasks = [asyncio.create_task(draft_one(i, kp)) for i, kp in enumerate(knowledge_points)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            index, draft = await next_done
+            knowledge_drafts[index] = draft
+            yield {
+                "event": "knowledge_draft",
+                "index": index,
+                "knowledge_point": knowledge_points[index],
+                "knowledge_draft": draft,
+            }
+    finally:
+        # The consumer may stop early (client disconnect, failed draft).
+        for task in tasks:
+            task.cancel()
+
+    learning_document = await aintegrate_learning_document_with_llm(
+        llm,
+        learner_profile,
+        learning_path,
+        learning_session,
+        knowledge_points,
+        knowledge_drafts,
+        output_markdown=output_markdown,
+    )
+    yield {"event": "document", "learning_document": learning_document}
+
+    if with_quiz:
+        counts = {"single_choice_count": 3, "multiple_choice_count": 0, "true_false_count": 0, "short_answer_count": 0}
+        counts.update(quiz_counts or {})
+        document_quiz = await agenerate_document_quizzes_with_llm(llm, learner_profile, learning_document, **counts)
+        yield {"event": "quizzes", "document_quiz": document_quiz}
+    yield {"event": "done"}
+
+
+async def astream_learning_path_content_with_llm(
+    llm,
+    learner_profile,
+    learning_path,
+    session_indices=None,
+    with_quiz=True,
+    use_search=True,
+    output_markdown=True,
+    max_concurrent_sessions=3,
+    llm_concurrency: Optional[int] = None,
+    quiz_counts: Optional[Mapping[str, int]] = None,
+    search_max_workers=3,
+    *,
+    search_rag_manager: Optional[SearchRagManager] = None,
+    llm_semaphore: Optional[asyncio.Semaphore] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Generate content for several sessions of a learning path, yielding each session when done.
+
+    Knowledge points are explored for every session first, so that the web
+    searches for all of them run as one :meth:`SearchRagManager.prefetch` pass
+    and drafts read their context back from the vectorstore. Sessions are then
+    drafted, integrated and quizzed concurrently. Every LLM call of the batch
+    waits on ``llm_semaphore`` (or a fresh one of size ``llm_concurrency``).
+
+    Events: ``knowledge_points`` (or ``session_error``) per session, one
+    ``search`` after the shared pass, then ``session`` (or ``session_error``)
+    per session in completion order, and a final ``done``. A session that fails
+    does not stop the others; if the shared search fails, sessions are drafted
+    without search context.
+    """
+    from .goal_oriented_knowledge_explorer import aexplore_knowledge_points_with_llm
+    from .search_enhanced_knowledge_drafter import adraft_knowledge_point_with_llm, knowledge_point_search_query
+    from .learning_document_integrator import aintegrate_learning_document_with_llm
+    from .document_quiz_generator import agenerate_document_quizzes_with_llm
+
+    if isinstance(learning_path, Mapping):
+        learning_path = learning_path.get("learning_path", [])
+    if session_indices is None:
+        session_indices = list(range(len(learning_path)))
+    invalid = [index for index in session_indices if not 0 <= index < len(learning_path)]
+    if invalid:
+        raise ValueError(f"session_indices {invalid} are not sessions of a {len(learning_path)}-session learning path")
+    session_indices = list(dict.fromkeys(session_indices))
+    if llm_semaphore is None and llm_concurrency:
+        llm_semaphore = asyncio.Semaphore(llm_concurrency)
+    counts = {"single_choice_count": 3, "multiple_choice_count": 0, "true_false_count": 0, "short_answer_count": 0}
+    counts.update(quiz_counts or {})
+    use_shared_search = use_search and search_rag_manager is not None
+
+    async def limited(coro):
+        # Runs inside its own task, so the limit only applies to this batch's calls.
+        with use_llm_call_limit(llm_semaphore):
+            return await coro
+
+    async def explore(index):
+        session = learning_path[index]
+        try:
+            points = await aexplore_knowledge_points_with_llm(llm, learner_profile, learning_path, session)
+            return index, _unwrap_knowledge_points(points), None
+        except Exception as e:
+            return index, None, e
+
+    async def build_session(index, knowledge_points):
+        session = learning_path[index]
+
+        async def draft(knowledge_point):
+            context = ""
+            if use_shared_search:
+                query = knowledge_point_search_query(session, knowledge_point)
+                docs = await asyncio.to_thread(search_rag_manager.retrieve, query)
+                context = format_docs(docs)
+            return await adraft_knowledge_point_with_llm(
+                llm,
+                learner_profile,
+                learning_path,
+                session,
+                knowledge_points,
+                knowledge_point,
+                use_search=False,
+                external_resources=context,
+            )
+
+        knowledge_drafts = list(await asyncio.gather(*(draft(kp) for kp in knowledge_points)))
+        learning_document = await aintegrate_learning_document_with_llm(
+            llm,
+            learner_profile,
+            learning_path,
+            session,
+            knowledge_points,
+            knowledge_drafts,
+            output_markdown=output_markdown,
+        )
+        learning_content = {"document": learning_document}
+        if with_quiz:
+            learning_content["quizzes"] = await agenerate_document_quizzes_with_llm(
+                llm, learner_profile, learning_document, **counts
+            )
+        return learning_content
+
+    session_slots = asyncio.Semaphore(max(1, max_concurrent_sessions))
+
+    async def run_session(index, knowledge_points):
+        async with session_slots:
+            try:
+                return index, await build_session(index, knowledge_points), None
+            except Exception as e:
+                return index, None, e
+
+    tasks = [asyncio.create_task(limited(explore(i))) for i in session_indices]
+    try:
+        knowledge_points_by_session = {}
+        for next_done in asyncio.as_completed(tasks):
+            index, knowledge_points, error = await next_done
+            if error is not None:
+                yield {"event": "session_error", "session_index": index, "detail": str(error)}
+                continue
+            knowledge_points_by_session[index] = knowledge_points
+            yield {"event": "knowledge_points", "session_index": index, "knowledge_points": knowledge_points}
+
+        if use_shared_search:
+            queries = [
+                knowledge_point_search_query(learning_path[index], kp)
+                for index, points in knowledge_points_by_session.items()
+                for kp in points
+            ]
+            started = time.perf_counter()
+            search_event = {"event": "search", "queries": len(set(queries))}
+            try:
+                search_event["documents"] = await asyncio.to_thread(search_rag_manager.prefetch, queries, search_max_workers)
+            except Exception as e:
+                logger.warning(f"Shared search for {len(queries)} queries failed, drafting without search context: {e}")
+                search_event.update(documents=0, error=str(e))
+                use_shared_search = False
+            search_event["elapsed_seconds"] = time.perf_counter() - started
+            yield search_event
+
+        tasks = [
+            asyncio.create_task(limited(run_session(index, points)))
+            for index, points in knowledge_points_by_session.items()
+        ]
+        for next_done in asyncio.as_completed(tasks):
+            index, learning_content, error = await next_done
+            if error is not None:
+                yield {"event": "session_error", "session_index": index, "detail": str(error)}
+            else:
+                yield {"event": "session", "session_index": index, "learning_content": learning_content}
+    finally:
+        for task in tasks:
+            task.cancel()
+    yield {"event": "done"}
@@ -44,6 +44,13 @@ class LearningDocumentIntegrator(BaseAgent):
         validated_output = DocumentStructure.model_validate(raw_output)
         return validated_output.model_dump()
 
+    async def aintegrate(self, payload: IntegratedDocPayload | Mapping[str, Any] | str):
+        if not isinstance(payload, IntegratedDocPayload):
+            payload = IntegratedDocPayload.model_validate(payload)
+        raw_output = await self.ainvoke(payload.model_dump(), task_prompt=integrated_document_generator_task_prompt)
+        validated_output = DocumentStructure.model_validate(raw_output)
+        return validated_output.model_dump()
+
 
 def integrate_learning_document_with_llm(llm, learner_profile, learning_path, learning_session, knowledge_points, knowledge_drafts, output_markdown=True):
     logger.info(f'Integrating learning document with {len(knowledge_points)} knowledge points and {len(knowledge_drafts)} drafts...')
@@ -62,6 +69,23 @@ def integrate_learning_document_with_llm(llm, learner_profile, learning_path, le
     return prepare_markdown_document(document_structure, knowledge_points, knowledge_drafts)
 
 
+async def aintegrate_learning_document_with_llm(llm, learner_profile, learning_path, learning_session, knowledge_points, knowledge_drafts, output_markdown=True):
+    logger.info(f'Integrating learning document with {len(knowledge_points)} knowledge points and {len(knowledge_drafts)} drafts...')
+    input_dict = {
+        'learner_profile': learner_profile,
+        'learning_path': learning_path,
+        'learning_session': learning_session,
+        'knowledge_points': knowledge_points,
+        'knowledge_drafts': knowledge_drafts
+    }
+    learning_document_integrator = LearningDocumentIntegrator(llm)
+    document_structure = await learning_document_integrator.aintegrate(input_dict)
+    if not output_markdown:
+        return document_structure
+    logger.info('Preparing markdown document...')
+    return prepare_markdown_document(document_structure, knowledge_points, knowledge_drafts)
+
+
 def prepare_markdown_document(document_structure, knowledge_points, knowledge_drafts):
     """Render a markdown learning document from the integrated structure and drafts.
 
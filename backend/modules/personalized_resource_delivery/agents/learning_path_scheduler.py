@@ -74,6 +74,30 @@ class LearningPathScheduler(BaseAgent):
         validated = LearningPath.model_validate(raw_output)
         return validated.model_dump()
 
+    async def aschedule_session(self, input_dict: Dict[str, Any]) -> JSONDict:
+        """Async variant of :meth:`schedule_session`."""
+        payload_dict = SessionSchedulePayload(**input_dict).model_dump()
+        task_prompt = learning_path_scheduler_task_prompt_session
+        raw_output = await self.ainvoke(payload_dict, task_prompt=task_prompt)
+        validated_output = LearningPath.model_validate(raw_output)
+        return validated_output.model_dump()
+
+    async def areflexion(self, input_dict: Dict[str, Any]) -> JSONDict:
+        """Async variant of :meth:`reflexion`."""
+        payload_dict = LearningPathRefinementPayload(**input_dict).model_dump()
+        task_prompt = learning_path_scheduler_task_prompt_reflexion
+        raw_output = await self.ainvoke(payload_dict, task_prompt=task_prompt)
+        validated = LearningPath.model_validate(raw_output)
+        return validated.model_dump()
+
+    async def areschedule(self, input_dict: Dict[str, Any]) -> JSONDict:
+        """Async variant of :meth:`reschedule`."""
+        payload_dict = LearningPathReschedulePayload(**input_dict).model_dump()
+        task_prompt = learning_path_scheduler_task_prompt_reschedule
+        raw_output = await self.ainvoke(payload_dict, task_prompt=task_prompt)
+        validated = LearningPath.model_validate(raw_output)
+        return validated.model_dump()
+
 
 def schedule_learning_path_with_llm(
     llm: Any,
@@ -130,6 +154,55 @@ def refine_learning_path_with_llm(
     return learning_path_scheduler.reflexion(payload_dict)
 
 
+async def aschedule_learning_path_with_llm(
+    llm: Any,
+    learner_profile: Mapping[str, Any],
+    session_count: int = 0,
+) -> JSONDict:
+    """Async variant of :func:`schedule_learning_path_with_llm`."""
+
+    learning_path_scheduler = LearningPathScheduler(llm)
+    payload_dict = {
+        "learner_profile": learner_profile,
+        "session_count": session_count,
+    }
+    return await learning_path_scheduler.aschedule_session(payload_dict)
+
+
+async def areschedule_learning_path_with_llm(
+    llm: Any,
+    learning_path: Sequence[Any],
+    learner_profile: Mapping[str, Any],
+    session_count: Optional[int] = None,
+    other_feedback: Optional[Union[str, Mapping[str, Any]]] = None,
+) -> JSONDict:
+    """Async variant of :func:`reschedule_learning_path_with_llm`."""
+
+    learning_path_scheduler = LearningPathScheduler(llm)
+    payload_dict = {
+        "learner_profile": learner_profile,
+        "learning_path": learning_path,
+        "session_count": session_count,
+        "other_feedback": other_feedback,
+    }
+    return await learning_path_scheduler.areschedule(payload_dict)
+
+
+async def arefine_learning_path_with_llm(
+    llm: Any,
+    learning_path: Sequence[Any],
+    feedback: Mapping[str, Any],
+) -> JSONDict:
+    """Async variant of :func:`refine_learning_path_with_llm`."""
+
+    learning_path_scheduler = LearningPathScheduler(llm)
+    payload_dict = {
+        "learning_path": learning_path,
+        "feedback": feedback,
+    }
+    return await learning_path_scheduler.areflexion(payload_dict)
+
+
 __all__ = [
     "LearningPathScheduler",
     "LearningPathRefinementPayload",
@@ -138,4 +211,7 @@ __all__ = [
     "schedule_learning_path_with_llm",
     "refine_learning_path_with_llm",
     "reschedule_learning_path_with_llm",
+    "aschedule_learning_path_with_llm",
+    "arefine_learning_path_with_llm",
+    "areschedule_learning_path_with_llm",
 ]
\ No newline at end of file
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import ast
+import asyncio
 from typing import Any, Mapping, Optional, List
 from concurrent.futures import ThreadPoolExecutor
 
@@ -8,12 +9,13 @@ from pydantic import BaseModel, field_validator
 
 from base import BaseAgent
 from base.search_rag import SearchRagManager, format_docs
+from base.tracing import with_current_context
 from modules.personalized_resource_delivery.prompts.search_enhanced_knowledge_drafter import (
     search_enhanced_knowledge_drafter_system_prompt,
     search_enhanced_knowledge_drafter_task_prompt,
 )
 from modules.personalized_resource_delivery.schemas import KnowledgeDraft
-from config.loader import default_config
+from config.loader import load_config
 
 
 class KnowledgeDraftPayload(BaseModel):
@@ -36,35 +38,59 @@ class KnowledgeDraftPayload(BaseModel):
         return v
 
 
+def default_max_workers() -> int:
+    """Parallel drafts per request, from ``rag.max_workers``."""
+    return int((load_config().get("rag") or {}).get("max_workers", 3))
+
+
+def knowledge_point_search_query(learning_session: Any, knowledge_point: Any) -> str:
+    """Web search query used to enrich the draft of ``knowledge_point``."""
+    session = learning_session or {}
+    session_title = str(session.get("title", "")).strip() or "learning_session"
+    knowledge_point = knowledge_point or {}
+    knowledge_point_name = str(knowledge_point.get('name', '')).strip()
+    return f"{session_title} {knowledge_point_name}".strip()
+
+
 class SearchEnhancedKnowledgeDrafter(BaseAgent):
 
     name: str = "SearchEnhancedKnowledgeDrafter"
 
     def __init__(self, model: Any, *, search_rag_manager: Optional[SearchRagManager] = None, use_search: bool = True):
         super().__init__(model=model, system_prompt=search_enhanced_knowledge_drafter_system_prompt, jsonalize_output=True)
-        self.search_rag_manager = search_rag_manager or SearchRagManager.from_config(default_config)
+        if search_rag_manager is None and use_search:
+            search_rag_manager = SearchRagManager.from_config(load_config())
+        self.search_rag_manager = search_rag_manager
         self.use_search = use_search
 
-    def draft(self, payload: KnowledgeDraftPayload | Mapping[str, Any] | str):
-        if not isinstance(payload, KnowledgeDraftPayload):
-            payload = KnowledgeDraftPayload.model_validate(payload)
-        data = payload.model_dump()
-        # Optionally enrich external resources using the search RAG manager
+    def _enrich_with_search(self, data: dict) -> dict:
+        """Optionally enrich external resources using the search RAG manager."""
         if self.use_search and self.search_rag_manager is not None:
-            session = data.get("learning_session") or {}
-            session_title = str(session.get("title", "")).strip() or "learning_session"
-            knowledge_point = data.get("knowledge_point") or {}
-            knowledge_point_name = str(knowledge_point.get('name', '')).strip()
-            query = f"{session_title} {knowledge_point_name}".strip()
+            query = knowledge_point_search_query(data.get("learning_session"), data.get("knowledge_point"))
             docs = self.search_rag_manager.invoke(query)
             context = format_docs(docs)
             if context:
                 ext = data.get("external_resources") or ""
                 data["external_resources"] = f"{ext}{context}"
+        return data
+
+    def draft(self, payload: KnowledgeDraftPayload | Mapping[str, Any] | str):
+        if not isinstance(payload, KnowledgeDraftPayload):
+            payload = KnowledgeDraftPayload.model_validate(payload)
+        data = self._enrich_with_search(payload.model_dump())
         raw_output = self.invoke(data, task_prompt=search_enhanced_knowledge_drafter_task_prompt)
         validated_output = KnowledgeDraft.model_validate(raw_output)
         return validated_output.model_dump()
 
+    async def adraft(self, payload: KnowledgeDraftPayload | Mapping[str, Any] | str):
+        if not isinstance(payload, KnowledgeDraftPayload):
+            payload = KnowledgeDraftPayload.model_validate(payload)
+        # Search, page loading and embedding are blocking; keep them off the event loop.
+        data = await asyncio.to_thread(self._enrich_with_search, payload.model_dump())
+        raw_output = await self.ainvoke(data, task_prompt=search_enhanced_knowledge_drafter_task_prompt)
+        validated_output = KnowledgeDraft.model_validate(raw_output)
+        return validated_output.model_dump()
+
 def draft_knowledge_point_with_llm(
     llm,
     learner_profile,
@@ -75,6 +101,7 @@ def draft_knowledge_point_with_llm(
     use_search: bool = True,
     *,
     search_rag_manager: Optional[SearchRagManager] = None,
+    external_resources: str = "",
 ):
     """Draft a single knowledge point using the agent, optionally enriching with a SearchRagManager."""
     drafter = SearchEnhancedKnowledgeDrafter(llm, search_rag_manager=search_rag_manager, use_search=use_search)
@@ -84,6 +111,7 @@ def draft_knowledge_point_with_llm(
         "learning_session": learning_session,
         "knowledge_points": knowledge_points,
         "knowledge_point": knowledge_point,
+        "external_resources": external_resources,
     }
     return drafter.draft(payload)
 
@@ -96,17 +124,21 @@ def draft_knowledge_points_with_llm(
     knowledge_points,
     allow_parallel: bool = True,
     use_search: bool = True,
-    max_workers: int = 8,
+    max_workers: Optional[int] = None,
     *,
     search_rag_manager: Optional[SearchRagManager] = None,
 ):
-    """Draft multiple knowledge points in parallel or sequentially using the agent."""
+    """Draft multiple knowledge points in parallel or sequentially using the agent.
+
+    ``max_workers`` defaults to ``rag.max_workers``; provider limits across
+    requests are enforced by the shared LLM rate limiter.
+    """
     if isinstance(learning_session, str):
         learning_session = ast.literal_eval(learning_session)
     if isinstance(knowledge_points, str):
         knowledge_points = ast.literal_eval(knowledge_points)
     if search_rag_manager is None and use_search:
-        search_rag_manager = SearchRagManager.from_config(default_config)
+        search_rag_manager = SearchRagManager.from_config(load_config())
     def draft_one(kp):
         return draft_knowledge_point_with_llm(
             llm,
@@ -120,8 +152,8 @@ def draft_knowledge_points_with_llm(
         )
 
     if allow_parallel:
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            return list(executor.map(draft_one, knowledge_points))
+        with ThreadPoolExecutor(max_workers=max_workers or default_max_workers()) as executor:
+            return list(executor.map(with_current_context(draft_one), knowledge_points))
     else:
         results: List[Any] = []
         for kp in knowledge_points:
@@ -129,6 +161,83 @@ def draft_knowledge_points_with_llm(
         return results
 
 
+async def adraft_knowledge_point_with_llm(
+    llm,
+    learner_profile,
+    learning_path,
+    learning_session,
+    knowledge_points,
+    knowledge_point,
+    use_search: bool = True,
+    *,
+    search_rag_manager: Optional[SearchRagManager] = None,
+    external_resources: str = "",
+):
+    """Async variant of :func:`draft_knowledge_point_with_llm`."""
+    if search_rag_manager is None and use_search:
+        search_rag_manager = await asyncio.to_thread(SearchRagManager.from_config, load_config())
+    drafter = SearchEnhancedKnowledgeDrafter(llm, search_rag_manager=search_rag_manager, use_search=use_search)
+    payload = {
+        "learner_profile": learner_profile,
+        "learning_path": learning_path,
+        "learning_session": learning_session,
+        "knowledge_points": knowledge_points,
+        "knowledge_point": knowledge_point,
+        "external_resources": external_resources,
+    }
+    return await drafter.adraft(payload)
+
+
+async def adraft_knowledge_points_with_llm(
+    llm,
+    learner_profile,
+    learning_path,
+    learning_session,
+    knowledge_points,
+    allow_parallel: bool = True,
+    use_search: bool = True,
+    max_workers: Optional[int] = None,
+    *,
+    search_rag_manager: Optional[SearchRagManager] = None,
+):
+    """Draft multiple knowledge points concurrently with ``asyncio.gather``.
+
+    ``max_workers`` bounds the number of drafts in flight at once and
+    defaults to ``rag.max_workers``.
+    """
+    if isinstance(learning_session, str):
+        learning_session = ast.literal_eval(learning_session)
+    if isinstance(knowledge_points, str):
+        knowledge_points = ast.literal_eval(knowledge_points)
+    if search_rag_manager is None and use_search:
+        search_rag_manager = await asyncio.to_thread(SearchRagManager.from_config, load_config())
+    async def draft_one(kp):
+        return await adraft_knowledge_point_with_llm(
+            llm,
+            learner_profile,
+            learning_path,
+            learning_session,
+            knowledge_points,
+            kp,
+            use_search=use_search,
+            search_rag_manager=search_rag_manager,
+        )
+
+    if allow_parallel:
+        semaphore = asyncio.Semaphore(max(1, max_workers or default_max_workers()))
+
+        async def draft_bounded(kp):
+            async with semaphore:
+                return await draft_one(kp)
+
+        return list(await asyncio.gather(*(draft_bounded(kp) for kp in knowledge_points)))
+    else:
+        results: List[Any] = []
+        for kp in knowledge_points:
+            results.append(await draft_one(kp))
+        return results
+
+
 if __name__ == "__main__":
     from config.loader import default_config
     from base.llm_factory import LLMFactory
@@ -1,3 +1,3 @@
-from .learning_goal_refiner import LearningGoalRefiner, refine_learning_goal_with_llm
-from .skill_gap_identifier import SkillGapIdentifier, identify_skill_gap_with_llm
-from .skill_requirement_mapper import SkillRequirementMapper, map_goal_to_skills_with_llm
\ No newline at end of file
+from .learning_goal_refiner import LearningGoalRefiner, refine_learning_goal_with_llm, arefine_learning_goal_with_llm
+from .skill_gap_identifier import SkillGapIdentifier, identify_skill_gap_with_llm, aidentify_skill_gap_with_llm
+from .skill_requirement_mapper import SkillRequirementMapper, map_goal_to_skills_with_llm, amap_goal_to_skills_with_llm
\ No newline at end of file
@@ -42,6 +42,17 @@ class SkillGapIdentifier(BaseAgent):
         validated = SkillGaps.model_validate(raw_output)
         return validated.model_dump()
 
+    async def aidentify_skill_gap(
+        self,
+        input_dict: Mapping[str, Any],
+    ) -> JSONDict:
+        """Async variant of :meth:`identify_skill_gap`."""
+        payload_dict = SkillGapPayload(**input_dict).model_dump()
+        task_prompt = skill_gap_identifier_task_prompt
+        raw_output = await self.ainvoke(payload_dict, task_prompt=task_prompt)
+        validated = SkillGaps.model_validate(raw_output)
+        return validated.model_dump()
+
 def identify_skill_gap_with_llm(
     llm: Any,
     learning_goal: str,
@@ -67,6 +78,31 @@ def identify_skill_gap_with_llm(
     )
     return skill_gaps, effective_requirements
 
+
+async def aidentify_skill_gap_with_llm(
+    llm: Any,
+    learning_goal: str,
+    learner_information: str,
+    skill_requirements: Optional[Dict[str, Any]] = None,
+) -> Tuple[JSONDict, JSONDict]:
+    """Async variant of :func:`identify_skill_gap_with_llm`."""
+
+    if not skill_requirements:
+        mapper = SkillRequirementMapper(llm)
+        effective_requirements = await mapper.amap_goal_to_skill({"learning_goal": learning_goal})
+    else:
+        effective_requirements = skill_requirements
+
+    skill_gap_identifier = SkillGapIdentifier(llm)
+    skill_gaps = await skill_gap_identifier.aidentify_skill_gap(
+        {
+            "learning_goal": learning_goal,
+            "learner_information": learner_information,
+            "skill_requirements": effective_requirements,
+        },
+    )
+    return skill_gaps, effective_requirements
+
 if __name__ == "__main__":
     # python -m modules.skill_gap_identification.agents.skill_gap_identifier
     from base.llm_factory import LLMFactory
@@ -36,8 +36,20 @@ class SkillRequirementMapper(BaseAgent):
 		validated = SkillRequirements.model_validate(raw_output)
 		return validated.model_dump()
 
+	async def amap_goal_to_skill(self, input_dict: Mapping[str, Any]) -> JSONDict:
+		payload_dict = Goal2SkillPayload(**input_dict).model_dump()
+		task_prompt = skill_requirement_mapper_task_prompt
+		raw_output = await self.ainvoke(payload_dict, task_prompt=task_prompt)
+		validated = SkillRequirements.model_validate(raw_output)
+		return validated.model_dump()
+
 
 def map_goal_to_skills_with_llm(llm: Any, learning_goal: str) -> JSONDict:
 	mapper = SkillRequirementMapper(llm)
 	return mapper.map_goal_to_skill({"learning_goal": learning_goal})
 
+
+async def amap_goal_to_skills_with_llm(llm: Any, learning_goal: str) -> JSONDict:
+	mapper = SkillRequirementMapper(llm)
+	return await mapper.amap_goal_to_skill({"learning_goal": learning_goal})
+
@@ -0,0 +1,216 @@
+"""Multi-process production server (POSIX only: relies on fork).
+
+    python serve.py [--workers N] [--host HOST] [--port PORT]
+
+The master process:
+
+1. forks the vector owner, the one process that loads the embedding model and
+   opens the persistent vector store (see ``base/vector_owner.py``), and waits
+   until it answers;
+2. imports ``main`` once, so the application, its dependencies, config and
+   prompt templates are loaded before any worker exists, then moves all of it to
+   the GC's permanent generation (``gc.freeze``) so that collections in the
+   workers do not write to those pages and they stay shared copy-on-write;
+3. binds the listening socket and forks the uvicorn workers, which accept on it
+   directly;
+4. supervises: a worker or owner that dies is replaced, SIGTERM/SIGINT stop the
+   workers gracefully and then the owner.
+
+For development keep using ``uvicorn main:app --reload``.
+"""
+
+import argparse
+import gc
+import logging
+import os
+import secrets
+import signal
+import socket
+import sys
+import time
+from typing import Any, Callable, Dict
+
+import uvicorn
+
+from base.vector_owner import VECTOR_OWNER_AUTHKEY_ENV, VECTOR_OWNER_ENV, VectorOwnerClient, run_vector_owner
+from config import load_config
+
+logger = logging.getLogger("serve")
+
+
+def fork_process(target: Callable[[], None], name: str) -> int:
+    pid = os.fork()
+    if pid == 0:
+        code = 0
+        try:
+            target()
+        except BaseException:
+            logger.exception(f"{name} exited with an error")
+            code = 1
+        finally:
+            logging.shutdown()
+            os._exit(code)
+    logger.info(f"Started {name} (pid {pid})")
+    return pid
+
+
+def bind_socket(host: str, port: int) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+class Master:
+    def __init__(self, config: Any, workers: int, host: str, port: int) -> None:
+        serving = config.get("serving", {})
+        self.config = config
+        self.workers = workers
+        self.host = host
+        self.port = port
+        self.use_vector_owner = bool(serving.get("vector_owner", True))
+        self.socket_path = os.path.abspath(serving.get("socket_path", "data/vector_owner.sock"))
+        self.owner_start_timeout = float(serving.get("owner_start_timeout_seconds", 300))
+        self.graceful_timeout = float(serving.get("graceful_timeout_seconds", 30))
+        self.log_level = str(config.get("log_level", "info")).lower()
+        self.authkey = secrets.token_bytes(32)
+        self.owner_pid = None
+        self.worker_pids: Dict[int, int] = {}
+        self.app = None
+        self.sock = None
+        self.stopping = False
+
+    def start_owner(self) -> None:
+        def run() -> None:
+            # Ctrl+C reaches the whole process group; the master decides when the owner stops.
+            signal.signal(signal.SIGINT, signal.SIG_IGN)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            run_vector_owner(self.config, self.socket_path, self.authkey)
+
+        self.owner_pid = fork_process(run, "vector owner")
+
+    def wait_for_owner(self) -> None:
+        client = VectorOwnerClient(self.socket_path, self.authkey, connect_timeout_seconds=self.owner_start_timeout)
+        started = time.perf_counter()
+        client.ping()
+        client.close()
+        logger.info(f"Vector owner ready after {time.perf_counter() - started:.1f}s")
+
+    def preload(self) -> None:
+        if self.use_vector_owner:
+            os.environ[VECTOR_OWNER_ENV] = self.socket_path
+            os.environ[VECTOR_OWNER_AUTHKEY_ENV] = self.authkey.hex()
+        started = time.perf_counter()
+        import main
+
+        self.app = main.app
+        gc.collect()
+        gc.freeze()
+        logger.info(f"Preloaded the application in {time.perf_counter() - started:.1f}s ({gc.get_freeze_count()} objects frozen)")
+
+    def start_worker(self, index: int) -> None:
+        def run() -> None:
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            server = uvicorn.Server(uvicorn.Config(self.app, log_level=self.log_level))
+            server.run(sockets=[self.sock])
+
+        self.worker_pids[fork_process(run, f"worker {index}")] = index
+
+    def _request_stop(self, signum: int, frame: Any) -> None:
+        self.stopping = True
+
+    def run(self) -> None:
+        if self.workers > 1 and not self.use_vector_owner:
+            raise ValueError("serving.vector_owner must be enabled with more than one worker: the vector store has a single writer.")
+        if self.use_vector_owner:
+            self.start_owner()
+            self.wait_for_owner()
+        self.preload()
+        self.sock = bind_socket(self.host, self.port)
+        logger.info(f"Serving on {self.host}:{self.port} with {self.workers} workers")
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGINT, self._request_stop)
+        for index in range(self.workers):
+            self.start_worker(index)
+        try:
+            self.supervise()
+        finally:
+            self.shutdown()
+
+    def supervise(self) -> None:
+        while not self.stopping:
+            time.sleep(0.5)
+            while True:
+                try:
+                    pid, status = os.waitpid(-1, os.WNOHANG)
+                except ChildProcessError:
+                    return
+                if pid == 0:
+                    break
+                if self.stopping:
+                    continue
+                if pid == self.owner_pid:
+                    logger.error(f"Vector owner exited with status {status}; restarting it")
+                    self.start_owner()
+                elif pid in self.worker_pids:
+                    index = self.worker_pids.pop(pid)
+                    logger.error(f"Worker {index} exited with status {status}; restarting it")
+                    self.start_worker(index)
+
+    def _wait(self, pids: set, timeout: float) -> set:
+        deadline = time.monotonic() + timeout
+        while pids and time.monotonic() < deadline:
+            for pid in list(pids):
+                try:
+                    done, _ = os.waitpid(pid, os.WNOHANG)
+                except ChildProcessError:
+                    done = pid
+                if done:
+                    pids.discard(pid)
+            time.sleep(0.1)
+        return pids
+
+    def _terminate(self, pids: set, timeout: float) -> None:
+        for pid in pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        for pid in self._wait(set(pids), timeout):
+            logger.warning(f"Process {pid} did not stop in {timeout:.0f}s; killing it")
+            os.kill(pid, signal.SIGKILL)
+            self._wait({pid}, 5)
+
+    def shutdown(self) -> None:
+        logger.info("Stopping workers")
+        self._terminate(set(self.worker_pids), self.graceful_timeout)
+        if self.owner_pid is not None:
+            self._terminate({self.owner_pid}, 10)
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+        if self.sock is not None:
+            self.sock.close()
+
+
+def main() -> None:
+    config = load_config(config_name="main")
+    serving = config.get("serving", {})
+    server = config.get("server", {})
+    parser = argparse.ArgumentParser(description="Run the backend with several worker processes.")
+    parser.add_argument("--workers", type=int, default=int(serving.get("workers", 4)))
+    parser.add_argument("--host", default=server.get("host", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(server.get("port", 5000)))
+    args = parser.parse_args()
+    logging.basicConfig(
+        level=str(config.get("log_level", "INFO")).upper(),
+        format="%(asctime)s [%(process)d] %(name)s %(levelname)s: %(message)s",
+    )
+    Master(config, workers=max(1, args.workers), host=args.host, port=args.port).run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,19 @@
+from .admission import AdmissionController, AdmissionMiddleware, AdmissionRejected
+from .executor import AgentExecutor
+from .jobs import JobQueue, JobStore
+from .singleflight import SingleFlight
+from .tracing import TracingMiddleware
+from .warmup import Warmup
+
+
+__all__ = [
+    "AdmissionController",
+    "AdmissionMiddleware",
+    "AdmissionRejected",
+    "AgentExecutor",
+    "JobQueue",
+    "JobStore",
+    "SingleFlight",
+    "TracingMiddleware",
+    "Warmup",
+]
@@ -0,0 +1,269 @@
+"""Admission control with priority classes for agent-backed endpoints.
+
+Interactive calls (tutor chat, goal refinement) and heavy batch calls
+(content generation, iterative refinement) share the same LLM capacity. The
+:class:`AdmissionController` caps requests in progress, queues the rest per
+priority class in bounded queues, and hands freed slots out by weighted fair
+(stride) scheduling, so a burst of batch work cannot push chat latency to
+minutes. A full queue, or a wait longer than the class allows, is answered
+with ``429`` and a ``Retry-After`` estimate.
+
+:class:`AdmissionMiddleware` applies the controller to ``POST`` requests by
+path, holding the slot until the response (streams included) is finished.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple, Union
+
+import orjson
+from omegaconf import DictConfig
+
+from server.executor import TimingStats
+from utils.config import ensure_config_dict
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionRejected(Exception):
+
+    def __init__(self, priority_class: str, reason: str, retry_after_seconds: int) -> None:
+        super().__init__(f"{priority_class} queue {reason}")
+        self.priority_class = priority_class
+        self.reason = reason
+        self.retry_after_seconds = retry_after_seconds
+
+
+class PriorityClass:
+    """One traffic class: its share of freed slots, optional cap and bounded queue."""
+
+    def __init__(
+        self,
+        name: str,
+        weight: float = 1.0,
+        max_concurrent: Optional[int] = None,
+        max_queue: int = 32,
+        max_wait_seconds: Optional[float] = None,
+        endpoints: Optional[List[str]] = None,
+    ) -> None:
+        self.name = name
+        self.weight = max(float(weight), 1e-3)
+        self.max_concurrent = max_concurrent
+        self.max_queue = max(0, int(max_queue))
+        self.max_wait_seconds = max_wait_seconds
+        self.endpoints = list(endpoints or [])
+        self.queue: Deque[Tuple[asyncio.Future, float]] = deque()
+        self.running = 0
+        self.pass_value = 0.0
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.wait = TimingStats()
+        self.service = TimingStats()
+
+    def has_capacity(self) -> bool:
+        return self.max_concurrent is None or self.running < self.max_concurrent
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "weight": self.weight,
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "running": self.running,
+            "queued": len(self.queue),
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "wait": self.wait.snapshot(),
+            "service": self.service.snapshot(),
+        }
+
+
+class AdmissionController:
+    """Global cap on requests in progress with per-class queues and weighted fair dispatch.
+
+    Must be used from a single event loop.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = 16,
+        classes: Optional[Dict[str, Dict[str, Any]]] = None,
+        default_class: str = "standard",
+        exempt: Optional[List[str]] = None,
+        enabled: bool = True,
+    ) -> None:
+        self.enabled = enabled
+        self.max_concurrent = max(1, int(max_concurrent))
+        self.classes: Dict[str, PriorityClass] = {
+            name: PriorityClass(name, **dict(options or {})) for name, options in (classes or {}).items()
+        }
+        if default_class not in self.classes:
+            self.classes[default_class] = PriorityClass(default_class)
+        self.default_class = default_class
+        self.exempt = tuple(exempt or ())
+        self._endpoint_classes = {
+            endpoint: name for name, pclass in self.classes.items() for endpoint in pclass.endpoints
+        }
+        self.running = 0
+        self._virtual_time = 0.0
+
+    @staticmethod
+    def from_config(config: Union[DictConfig, Dict[str, Any]]) -> "AdmissionController":
+        config = ensure_config_dict(config)
+        return AdmissionController(**(config.get("admission") or {}))
+
+    @staticmethod
+    def endpoint_name(path: str) -> str:
+        """``/v2/chat-with-tutor/stream`` -> ``chat-with-tutor/stream``; v1 and v2 share classes."""
+        name = path.strip("/")
+        return name[3:] if name.startswith("v2/") else name
+
+    def classify(self, method: str, path: str) -> Optional[str]:
+        """Priority class of a request, or ``None`` when it bypasses admission."""
+        if not self.enabled or method != "POST":
+            return None
+        endpoint = self.endpoint_name(path)
+        if endpoint.startswith(self.exempt):
+            return None
+        return self._endpoint_classes.get(endpoint, self.default_class)
+
+    def _retry_after(self, pclass: PriorityClass) -> int:
+        """Seconds until a slot is likely free for a newcomer to ``pclass``."""
+        avg_service = pclass.service.total / pclass.service.count if pclass.service.count else 5.0
+        slots = pclass.max_concurrent or self.max_concurrent
+        return max(1, math.ceil((len(pclass.queue) + 1) * avg_service / slots))
+
+    def _dispatch(self) -> None:
+        while self.running < self.max_concurrent:
+            ready = [c for c in self.classes.values() if c.queue and c.has_capacity()]
+            if not ready:
+                return
+            # Stride scheduling: the class with the smallest pass value goes next and
+            # advances by 1/weight, so freed slots are shared in proportion to weight.
+            pclass = min(ready, key=lambda c: (c.pass_value, -c.weight))
+            future, _ = pclass.queue.popleft()
+            if future.done():
+                continue
+            self._grant(pclass)
+            future.set_result(None)
+
+    def _grant(self, pclass: PriorityClass) -> None:
+        # A class that was idle does not get to spend credit it saved up meanwhile.
+        start = max(pclass.pass_value, self._virtual_time)
+        self._virtual_time = start
+        pclass.pass_value = start + 1.0 / pclass.weight
+        self.running += 1
+        pclass.running += 1
+        pclass.admitted += 1
+
+    def _release(self, pclass: PriorityClass) -> None:
+        self.running -= 1
+        pclass.running -= 1
+        self._dispatch()
+
+    async def _acquire(self, pclass: PriorityClass) -> None:
+        if not any(c.queue for c in self.classes.values()) and self.running < self.max_concurrent and pclass.has_capacity():
+            self._grant(pclass)
+            pclass.wait.observe(0.0)
+            return
+        if len(pclass.queue) >= pclass.max_queue:
+            pclass.rejected += 1
+            raise AdmissionRejected(pclass.name, "is full", self._retry_after(pclass))
+        future = asyncio.get_running_loop().create_future()
+        enqueued_at = time.perf_counter()
+        pclass.queue.append((future, enqueued_at))
+        self._dispatch()
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout=pclass.max_wait_seconds)
+        except asyncio.TimeoutError:
+            if future.done():
+                return
+            future.cancel()
+            pclass.queue.remove((future, enqueued_at))
+            pclass.timed_out += 1
+            raise AdmissionRejected(pclass.name, "wait exceeded", self._retry_after(pclass))
+        except asyncio.CancelledError:
+            # The client went away while queued, or just after being granted a slot.
+            if future.done() and not future.cancelled():
+                self._release(pclass)
+            else:
+                future.cancel()
+                pclass.queue.remove((future, enqueued_at))
+            raise
+        finally:
+            pclass.wait.observe(time.perf_counter() - enqueued_at)
+
+    async def acquire(self, priority_class: str) -> float:
+        """Wait for a slot of ``priority_class``; returns the start time to pass to :meth:`release`."""
+        await self._acquire(self.classes[priority_class])
+        return time.perf_counter()
+
+    def release(self, priority_class: str, started: float) -> None:
+        pclass = self.classes[priority_class]
+        pclass.service.observe(time.perf_counter() - started)
+        self._release(pclass)
+
+    @asynccontextmanager
+    async def admit(self, priority_class: str) -> AsyncIterator[None]:
+        """Hold a slot of ``priority_class`` for the duration of the block."""
+        started = await self.acquire(priority_class)
+        try:
+            yield
+        finally:
+            self.release(priority_class, started)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "max_concurrent": self.max_concurrent,
+            "running": self.running,
+            "queued": sum(len(c.queue) for c in self.classes.values()),
+            "classes": {name: pclass.stats() for name, pclass in self.classes.items()},
+        }
+
+
+class AdmissionMiddleware:
+    """ASGI middleware that runs classified requests under :meth:`AdmissionController.admit`."""
+
+    def __init__(self, app: Any, controller: AdmissionController) -> None:
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        priority_class = None
+        if scope["type"] == "http":
+            priority_class = self.controller.classify(scope["method"], scope["path"])
+        if priority_class is None:
+            await self.app(scope, receive, send)
+            return
+        try:
+            started = await self.controller.acquire(priority_class)
+        except AdmissionRejected as e:
+            logger.warning(f"Rejected {scope['path']}: {e}")
+            await self._reject(send, e)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(priority_class, started)
+
+    @staticmethod
+    async def _reject(send: Any, error: AdmissionRejected) -> None:
+        body = orjson.dumps({"detail": f"Server busy: {error}", "priority_class": error.priority_class})
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(error.retry_after_seconds).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,141 @@
+"""Bounded worker pool that keeps blocking agent calls off the event loop.
+
+FastAPI endpoints are ``async def`` but the agent helpers block on network
+I/O. Every agent-backed endpoint hands its work to a shared
+:class:`AgentExecutor` so that a slow content-generation call cannot stall
+cheap requests served by the same uvicorn worker.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, TypeVar, Union
+
+from omegaconf import DictConfig
+
+from base.metrics import EXECUTOR_QUEUE_SECONDS
+from utils.config import ensure_config_dict
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass
+class TimingStats:
+    """Running count/total/max of observed durations (seconds)."""
+
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "avg_seconds": self.total / self.count if self.count else 0.0,
+            "max_seconds": self.max,
+            "total_seconds": self.total,
+        }
+
+
+class AgentExecutor:
+    """Fixed-size thread pool with queue-time and run-time metrics."""
+
+    def __init__(self, max_workers: int = 16, thread_name_prefix: str = "agent-worker") -> None:
+        self.max_workers = max(1, int(max_workers))
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=thread_name_prefix)
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._cancelled = 0
+        self._queue_time = TimingStats()
+        self._run_time = TimingStats()
+
+    @staticmethod
+    def from_config(config: Union[DictConfig, Dict[str, Any]]) -> "AgentExecutor":
+        """Size the pool from ``server.max_workers``, falling back to ``rag.max_workers``."""
+        config = ensure_config_dict(config)
+        max_workers = (config.get("server") or {}).get("max_workers")
+        if not max_workers:
+            max_workers = (config.get("rag") or {}).get("max_workers", 3)
+        logger.info(f"Starting agent executor with {max_workers} workers")
+        return AgentExecutor(max_workers=max_workers)
+
+    async def run(self, func: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+        """Run ``func(*args, **kwargs)`` on the pool and await its result.
+
+        The caller's context variables are copied into the worker thread so that
+        request-scoped state (logging, tracing) follows the call.
+        """
+        submitted_at = time.perf_counter()
+        ctx = contextvars.copy_context()
+
+        def _call() -> T:
+            started_at = time.perf_counter()
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+                self._queue_time.observe(started_at - submitted_at)
+            EXECUTOR_QUEUE_SECONDS.observe(started_at - submitted_at)
+            ok = False
+            try:
+                result = ctx.run(func, *args, **kwargs)
+                ok = True
+                return result
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._run_time.observe(time.perf_counter() - started_at)
+                    if ok:
+                        self._completed += 1
+                    else:
+                        self._failed += 1
+
+        with self._lock:
+            self._queued += 1
+            self._submitted += 1
+        future = self._pool.submit(_call)
+        future.add_done_callback(self._on_done)
+        return await asyncio.wrap_future(future)
+
+    def _on_done(self, future: Future) -> None:
+        # A future cancelled while still queued never reaches ``_call``.
+        if future.cancelled():
+            with self._lock:
+                self._queued -= 1
+                self._cancelled += 1
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queued
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "queued": self._queued,
+                "running": self._running,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+                "cancelled": self._cancelled,
+                "queue_time": self._queue_time.snapshot(),
+                "run_time": self._run_time.snapshot(),
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait, cancel_futures=True)
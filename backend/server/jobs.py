@@ -0,0 +1,343 @@
+"""Durable background jobs for long-running pipelines.
+
+A full session document takes minutes to generate, longer than a proxy or a
+Streamlit rerun will keep a request open. ``POST /jobs/{pipeline}`` stores the
+payload in a local SQLite database and returns a job id right away; a fixed
+number of workers pick queued jobs up and write the result back, where the
+status and result endpoints read it.
+
+Jobs are keyed by ``(pipeline, payload hash)``: submitting the same payload
+while an equivalent job is queued, running or finished returns that job
+instead of starting a new one. Workers claim jobs through the database and
+refresh a heartbeat while they run, so jobs left behind by a crashed process
+are queued again, up to ``max_attempts`` claims: a job that keeps killing or
+hanging its worker is then marked failed instead of being claimed forever.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Type, Union
+
+from omegaconf import DictConfig
+from pydantic import BaseModel
+
+from utils.config import ensure_config_dict
+
+logger = logging.getLogger(__name__)
+
+QUEUED, RUNNING, SUCCEEDED, FAILED = "queued", "running", "succeeded", "failed"
+PENDING_STATUSES = (QUEUED, RUNNING)
+
+PipelineRunner = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    pipeline TEXT NOT NULL,
+    payload_hash TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    heartbeat_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_by_payload ON jobs (pipeline, payload_hash, created_at);
+CREATE INDEX IF NOT EXISTS jobs_by_status ON jobs (status, created_at);
+"""
+
+
+def payload_hash(pipeline: str, payload: Dict[str, Any]) -> str:
+    """Stable hash of a pipeline payload; key order does not matter."""
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(f"{pipeline}\n{canonical}".encode("utf-8")).hexdigest()
+
+
+class JobStore:
+    """SQLite-backed job table. All methods are blocking and thread-safe."""
+
+    def __init__(self, db_path: str = "data/jobs.sqlite3") -> None:
+        self.db_path = db_path
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        # SQLite connections must not cross fork(); a forked server worker opens its own
+        # (an in-memory database has nothing to reopen and stays a private copy).
+        if self._connection is None or (self._pid != os.getpid() and self.db_path != ":memory:"):
+            self._connection = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+            self._connection.row_factory = sqlite3.Row
+            self._pid = os.getpid()
+        return self._connection
+
+    @staticmethod
+    def _to_dict(row: Optional[sqlite3.Row]) -> Optional[Dict[str, Any]]:
+        if row is None:
+            return None
+        job = dict(row)
+        job["payload"] = json.loads(job["payload"])
+        job["result"] = json.loads(job["result"]) if job["result"] is not None else None
+        return job
+
+    def create_or_get(self, pipeline: str, payload: Dict[str, Any], *, force: bool = False) -> Tuple[Dict[str, Any], bool]:
+        """Return ``(job, created)``; reuses a non-failed job with the same payload unless ``force``."""
+        digest = payload_hash(pipeline, payload)
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                if not force:
+                    row = self._conn.execute(
+                        "SELECT * FROM jobs WHERE pipeline = ? AND payload_hash = ? AND status != ? "
+                        "ORDER BY created_at DESC LIMIT 1",
+                        (pipeline, digest, FAILED),
+                    ).fetchone()
+                    if row is not None:
+                        self._conn.execute("COMMIT")
+                        return self._to_dict(row), False
+                job_id = uuid.uuid4().hex
+                self._conn.execute(
+                    "INSERT INTO jobs (id, pipeline, payload_hash, payload, status, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    (job_id, pipeline, digest, json.dumps(payload, default=str), QUEUED, time.time()),
+                )
+                row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return self._to_dict(row), True
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_dict(row)
+
+    def claim_next(self, pipelines: List[str]) -> Optional[Dict[str, Any]]:
+        """Atomically move the oldest queued job of a known pipeline to ``running``."""
+        if not pipelines:
+            return None
+        placeholders = ",".join("?" for _ in pipelines)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                f"UPDATE jobs SET status = ?, started_at = ?, heartbeat_at = ?, attempts = attempts + 1 "
+                f"WHERE id = (SELECT id FROM jobs WHERE status = ? AND pipeline IN ({placeholders}) "
+                f"ORDER BY created_at LIMIT 1) RETURNING *",
+                (RUNNING, now, now, QUEUED, *pipelines),
+            ).fetchone()
+        return self._to_dict(row)
+
+    def finish(self, job_id: str, *, result: Any = None, error: Optional[str] = None) -> None:
+        status = FAILED if error is not None else SUCCEEDED
+        encoded = json.dumps(result, default=str) if error is None else None
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ? WHERE id = ?",
+                (status, encoded, error, time.time(), job_id),
+            )
+
+    def heartbeat(self, job_ids: List[str]) -> None:
+        if not job_ids:
+            return
+        placeholders = ",".join("?" for _ in job_ids)
+        with self._lock:
+            self._conn.execute(
+                f"UPDATE jobs SET heartbeat_at = ? WHERE status = ? AND id IN ({placeholders})",
+                (time.time(), RUNNING, *job_ids),
+            )
+
+    def requeue_stale(self, stale_after_seconds: float, max_attempts: Optional[int] = None) -> int:
+        """Put ``running`` jobs whose worker stopped heartbeating back in the queue.
+
+        Jobs already claimed ``max_attempts`` times are marked failed instead.
+        Returns the number of jobs queued again.
+        """
+        now = time.time()
+        deadline = now - stale_after_seconds
+        with self._lock:
+            if max_attempts:
+                failed = self._conn.execute(
+                    "UPDATE jobs SET status = ?, error = ?, finished_at = ? "
+                    "WHERE status = ? AND heartbeat_at < ? AND attempts >= ?",
+                    (FAILED, f"The worker stopped responding on each of {max_attempts} attempts",
+                     now, RUNNING, deadline, int(max_attempts)),
+                ).rowcount
+                if failed:
+                    logger.warning(f"Job store: failed {failed} stale job(s) after {max_attempts} attempts")
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, started_at = NULL WHERE status = ? AND heartbeat_at < ?",
+                (QUEUED, RUNNING, deadline),
+            )
+        return cursor.rowcount
+
+    def purge_finished(self, older_than_seconds: float) -> int:
+        deadline = time.time() - older_than_seconds
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND finished_at < ?",
+                (SUCCEEDED, FAILED, deadline),
+            )
+        return cursor.rowcount
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+        return {row["status"]: row["n"] for row in rows}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class JobQueue:
+    """Runs queued jobs from a :class:`JobStore` on ``concurrency`` asyncio workers."""
+
+    def __init__(
+        self,
+        store: JobStore,
+        concurrency: int = 2,
+        poll_interval_seconds: float = 2.0,
+        heartbeat_seconds: float = 10.0,
+        stale_after_seconds: float = 60.0,
+        max_attempts: Optional[int] = 3,
+        retention_seconds: float = 7 * 24 * 3600,
+    ) -> None:
+        self.store = store
+        self.concurrency = max(1, int(concurrency))
+        self.poll_interval_seconds = poll_interval_seconds
+        self.heartbeat_seconds = heartbeat_seconds
+        self.stale_after_seconds = stale_after_seconds
+        self.max_attempts = max_attempts
+        self.retention_seconds = retention_seconds
+        self._pipelines: Dict[str, PipelineRunner] = {}
+        self._request_models: Dict[str, Type[BaseModel]] = {}
+        self._running: Dict[str, float] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopping = False
+        self._submitted = 0
+        self._reattached = 0
+
+    @staticmethod
+    def from_config(config: Union[DictConfig, Dict[str, Any]]) -> "JobQueue":
+        config = ensure_config_dict(config)
+        jobs_config = dict(config.get("jobs") or {})
+        store = JobStore(jobs_config.pop("db_path", "data/jobs.sqlite3"))
+        return JobQueue(store, **jobs_config)
+
+    def register(self, pipeline: str, runner: PipelineRunner, request_model: Optional[Type[BaseModel]] = None) -> None:
+        """Register an async ``runner(payload) -> result`` under ``pipeline``.
+
+        Payloads of a pipeline with a ``request_model`` are validated on submit,
+        raising :class:`pydantic.ValidationError`, and stored normalised so that
+        equivalent payloads hash the same.
+        """
+        self._pipelines[pipeline] = runner
+        if request_model is not None:
+            self._request_models[pipeline] = request_model
+
+    @property
+    def pipelines(self) -> List[str]:
+        return sorted(self._pipelines)
+
+    async def submit(self, pipeline: str, payload: Dict[str, Any], *, force: bool = False) -> Tuple[Dict[str, Any], bool]:
+        if pipeline not in self._pipelines:
+            raise KeyError(pipeline)
+        request_model = self._request_models.get(pipeline)
+        if request_model is not None:
+            payload = request_model.model_validate(payload).model_dump(mode="json")
+        job, created = await asyncio.to_thread(self.store.create_or_get, pipeline, payload, force=force)
+        if created:
+            self._submitted += 1
+            if self._wakeup is not None:
+                self._wakeup.set()
+        else:
+            self._reattached += 1
+        return job, created
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self.store.get, job_id)
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        requeued = self.store.requeue_stale(self.stale_after_seconds, self.max_attempts)
+        purged = self.store.purge_finished(self.retention_seconds)
+        if requeued or purged:
+            logger.info(f"Job store: requeued {requeued} stale job(s), purged {purged} old job(s)")
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.concurrency)]
+        self._tasks.append(asyncio.create_task(self._heartbeat()))
+
+    async def stop(self) -> None:
+        # Cancelled jobs stay ``running`` and are picked up again once their heartbeat goes stale.
+        # The flag covers a cancellation swallowed by ``wait_for`` racing with a wake-up.
+        self._stopping = True
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _worker(self, index: int) -> None:
+        while not self._stopping:
+            job = await asyncio.to_thread(self.store.claim_next, self.pipelines)
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._run(job)
+
+    async def _run(self, job: Dict[str, Any]) -> None:
+        job_id, pipeline = job["id"], job["pipeline"]
+        self._running[job_id] = time.perf_counter()
+        logger.info(f"Job {job_id} ({pipeline}) started, attempt {job['attempts']}")
+        try:
+            result = await self._pipelines[pipeline](job["payload"])
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Job {job_id} ({pipeline}) failed: {e}")
+            await asyncio.to_thread(self.store.finish, job_id, error=getattr(e, "detail", None) or str(e))
+        else:
+            await asyncio.to_thread(self.store.finish, job_id, result=result)
+            logger.info(f"Job {job_id} ({pipeline}) finished in {time.perf_counter() - self._running[job_id]:.1f}s")
+        finally:
+            self._running.pop(job_id, None)
+
+    async def _heartbeat(self) -> None:
+        while not self._stopping:
+            await asyncio.sleep(self.heartbeat_seconds)
+            await asyncio.to_thread(self.store.heartbeat, list(self._running))
+            await asyncio.to_thread(self.store.requeue_stale, self.stale_after_seconds, self.max_attempts)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "concurrency": self.concurrency,
+            "pipelines": self.pipelines,
+            "running": len(self._running),
+            "submitted": self._submitted,
+            "reattached": self._reattached,
+            "jobs_by_status": self.store.counts(),
+        }
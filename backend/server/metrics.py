@@ -0,0 +1,171 @@
+"""Prometheus exposition for the backend: request timing and scrape-time state.
+
+:class:`MetricsMiddleware` times every HTTP request by route template (so
+``/jobs/{job_id}`` is one series), including streamed bodies.
+:class:`StatsCollector` turns the ``stats()`` of the worker pool, admission
+controller, caches, rate limiter and job queue into gauges and counters when
+``/metrics`` is scraped, so there is no second set of counters to keep in sync.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from prometheus_client import REGISTRY, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.registry import Collector
+
+from base.metrics import HTTP_REQUEST_SECONDS
+
+
+class MetricsMiddleware:
+    """ASGI middleware observing ``genmentor_http_request_seconds``."""
+
+    def __init__(self, app: Any, exclude_paths: Iterable[str] = ("/metrics", "/healthz", "/readyz")) -> None:
+        self.app = app
+        self.exclude_paths = set(exclude_paths)
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        status = {"code": 500}
+
+        async def send_with_status(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # Routing stores the matched route in the scope; unmatched paths share one series.
+            route = scope.get("route")
+            HTTP_REQUEST_SECONDS.labels(
+                method=scope["method"],
+                route=getattr(route, "path", "unmatched"),
+                status=str(status["code"]),
+            ).observe(time.perf_counter() - started)
+
+
+class StatsCollector(Collector):
+    """Exports component ``stats()`` snapshots at scrape time.
+
+    Every source is optional; ``sources`` maps a name (``executor``,
+    ``admission``, ``agent_graphs``, ``llm_cache``, ``pdf``, ``single_flight``,
+    ``rate_limits``, ``jobs``) to a zero-argument callable returning that
+    component's ``stats()``.
+    """
+
+    def __init__(self, sources: Dict[str, Callable[[], Dict[str, Any]]]) -> None:
+        self.sources = sources
+
+    def describe(self) -> Iterable[Any]:
+        # Nothing to check for name clashes; also keeps registration from calling collect().
+        return []
+
+    def _stats(self, name: str) -> Optional[Dict[str, Any]]:
+        source = self.sources.get(name)
+        return source() if source is not None else None
+
+    def collect(self) -> Iterable[Any]:
+        executor = self._stats("executor")
+        if executor is not None:
+            yield GaugeMetricFamily("genmentor_executor_queue_depth", "Agent calls waiting for a worker thread.", value=executor["queued"])
+            yield GaugeMetricFamily("genmentor_executor_running", "Agent calls running on worker threads.", value=executor["running"])
+            yield GaugeMetricFamily("genmentor_executor_max_workers", "Worker threads in the agent pool.", value=executor["max_workers"])
+
+        admission = self._stats("admission")
+        if admission is not None:
+            queued = GaugeMetricFamily("genmentor_admission_queued", "Requests waiting for admission.", labels=["priority_class"])
+            running = GaugeMetricFamily("genmentor_admission_running", "Admitted requests in progress.", labels=["priority_class"])
+            rejected = CounterMetricFamily("genmentor_admission_rejected", "Requests answered with 429.", labels=["priority_class", "reason"])
+            for name, pclass in admission["classes"].items():
+                queued.add_metric([name], pclass["queued"])
+                running.add_metric([name], pclass["running"])
+                rejected.add_metric([name, "queue_full"], pclass["rejected"])
+                rejected.add_metric([name, "wait_exceeded"], pclass["timed_out"])
+            yield from (queued, running, rejected)
+
+        lookups = CounterMetricFamily("genmentor_cache_lookups", "Cache lookups by cache and result.", labels=["cache", "result"])
+        hit_ratio = GaugeMetricFamily("genmentor_cache_hit_ratio", "Hits over lookups since start.", labels=["cache"])
+        graphs = self._stats("agent_graphs")
+        if graphs is not None:
+            lookups.add_metric(["agent_graphs", "hit"], graphs["hits"])
+            lookups.add_metric(["agent_graphs", "miss"], graphs["misses"])
+            hit_ratio.add_metric(["agent_graphs"], graphs["hit_rate"])
+        llm_cache = self._stats("llm_cache")
+        if llm_cache is not None and "misses" in llm_cache:
+            lookups.add_metric(["llm_responses", "memory_hit"], llm_cache["memory_hits"])
+            lookups.add_metric(["llm_responses", "disk_hit"], llm_cache["disk_hits"])
+            lookups.add_metric(["llm_responses", "miss"], llm_cache["misses"])
+            hit_ratio.add_metric(["llm_responses"], llm_cache["hit_rate"])
+        pdf = self._stats("pdf")
+        if pdf is not None:
+            lookups.add_metric(["pdf_text", "memory_hit"], pdf["memory_hits"])
+            lookups.add_metric(["pdf_text", "disk_hit"], pdf["disk_hits"])
+            lookups.add_metric(["pdf_text", "miss"], pdf["misses"])
+            hit_ratio.add_metric(["pdf_text"], pdf["hit_rate"])
+        flights = self._stats("single_flight")
+        if flights is not None:
+            lookups.add_metric(["single_flight", "hit"], flights["saved_calls"])
+            lookups.add_metric(["single_flight", "miss"], flights["executed"])
+            hit_ratio.add_metric(["single_flight"], flights["saved_ratio"])
+        rag = self._stats("rag")
+        if rag is not None and "embedding_cache" in rag:
+            embeddings = rag["embedding_cache"]
+            lookups.add_metric(["embeddings", "memory_hit"], embeddings["memory_hits"])
+            lookups.add_metric(["embeddings", "disk_hit"], embeddings["disk_hits"])
+            lookups.add_metric(["embeddings", "miss"], embeddings["misses"])
+            hit_ratio.add_metric(["embeddings"], embeddings["hit_rate"])
+        search = self._stats("search")
+        if search is not None and search["cache"]["enabled"]:
+            lookups.add_metric(["search_results", "memory_hit"], search["cache"]["memory_hits"])
+            lookups.add_metric(["search_results", "disk_hit"], search["cache"]["disk_hits"])
+            lookups.add_metric(["search_results", "miss"], search["cache"]["misses"])
+            hit_ratio.add_metric(["search_results"], search["cache"]["hit_rate"])
+        web_fetch = self._stats("web_fetch")
+        if web_fetch is not None and web_fetch["cache"]["enabled"]:
+            pages = web_fetch["cache"]
+            lookups.add_metric(["web_pages", "hit"], pages["hits"])
+            lookups.add_metric(["web_pages", "revalidated"], pages["revalidated"])
+            lookups.add_metric(["web_pages", "miss"], pages["misses"])
+            hit_ratio.add_metric(["web_pages"], pages["hit_rate"])
+        yield from (lookups, hit_ratio)
+
+        rate_limits = self._stats("rate_limits")
+        if rate_limits is not None:
+            labels = ["provider", "model_name"]
+            in_flight = GaugeMetricFamily("genmentor_llm_in_flight", "Model calls in flight.", labels=labels)
+            waiting = GaugeMetricFamily("genmentor_llm_waiting", "Model calls waiting for a concurrency slot.", labels=labels)
+            limited = CounterMetricFamily("genmentor_llm_rate_limited", "Provider 429 responses.", labels=labels)
+            throttled = CounterMetricFamily("genmentor_llm_throttled_seconds", "Time calls were held back by the limiter.", labels=labels)
+            for model in rate_limits["models"]:
+                key = [model["provider"], model["model_name"]]
+                in_flight.add_metric(key, model["in_flight"])
+                waiting.add_metric(key, model["waiting"])
+                limited.add_metric(key, model["rate_limited"])
+                throttled.add_metric(key, model["throttled_seconds"])
+            yield from (in_flight, waiting, limited, throttled)
+
+        jobs = self._stats("jobs")
+        if jobs is not None:
+            by_status = GaugeMetricFamily("genmentor_jobs", "Stored background jobs by status.", labels=["status"])
+            for status, count in jobs["jobs_by_status"].items():
+                by_status.add_metric([status], count)
+            yield by_status
+
+        if web_fetch is not None:
+            yield GaugeMetricFamily("genmentor_page_fetches_in_flight", "Web page requests in progress.", value=web_fetch["in_flight"])
+
+
+def register_stats_collector(sources: Dict[str, Callable[[], Dict[str, Any]]]) -> StatsCollector:
+    collector = StatsCollector(sources)
+    REGISTRY.register(collector)
+    return collector
+
+
+def render_metrics() -> bytes:
+    return generate_latest(REGISTRY)
@@ -0,0 +1,204 @@
+"""PDF text extraction off the event loop: spooled uploads, a process pool and a content-hash cache.
+
+An upload is copied chunk by chunk to a temporary file while it is hashed and
+its size checked, so a large PDF is never held in memory. Pages are extracted
+in batches by a pool of worker processes (pdfminer is pure Python and CPU-bound,
+so threads would not run in parallel). The page texts of a PDF already seen are
+served from the cache by SHA-256 of the file.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
+
+from omegaconf import DictConfig
+
+from base.kv_cache import TieredCache
+from base.tracing import span
+from utils.config import ensure_config_dict
+from utils.pdf import count_pages, extract_pages
+
+logger = logging.getLogger(__name__)
+
+SPOOL_CHUNK_BYTES = 1024 * 1024
+
+
+class PDFLimitExceeded(ValueError):
+    """The upload is over the configured size or page limit."""
+
+
+class PDFExtractor:
+    """Extracts page texts from uploaded PDFs; shared by all requests of the process."""
+
+    def __init__(
+        self,
+        max_bytes: int = 50 * 1024 * 1024,
+        max_pages: int = 500,
+        pages_per_task: int = 8,
+        max_processes: int = 4,
+        timeout_seconds: float = 300.0,
+        cache: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        cache = cache or {}
+        self.max_bytes = int(max_bytes)
+        self.max_pages = int(max_pages)
+        self.pages_per_task = max(1, int(pages_per_task))
+        self.max_processes = max(1, int(max_processes))
+        self.timeout_seconds = float(timeout_seconds)
+        self.cache = TieredCache.create(
+            max_entries=int(cache.get("max_entries", 128)),
+            ttl_seconds=cache.get("ttl_seconds", 604800),
+            disk_path=cache.get("disk_path"),
+            disk_max_entries=cache.get("disk_max_entries"),
+            table="pdf_pages",
+        )
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self.documents = 0
+        self.pages_extracted = 0
+        self.rejected = 0
+        self.extraction_seconds = 0.0
+
+    @staticmethod
+    def from_config(config: Union[DictConfig, Dict[str, Any]]) -> "PDFExtractor":
+        config = ensure_config_dict(config)
+        return PDFExtractor(**(config.get("pdf") or {}))
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        # Created on first use so that startup does not pay for it. Spawned,
+        # not forked: the server process has threads.
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self.max_processes,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+        return self._pool
+
+    def _reject(self, message: str) -> PDFLimitExceeded:
+        with self._lock:
+            self.rejected += 1
+        return PDFLimitExceeded(message)
+
+    async def spool(self, upload: Any) -> Tuple[str, str, int]:
+        """Copy an upload (anything with ``async read(size)``) to a temp file; returns ``(path, sha256, size)``."""
+        digest = hashlib.sha256()
+        size = 0
+        handle = tempfile.NamedTemporaryFile(prefix="upload-", suffix=".pdf", delete=False)
+        try:
+            with handle:
+                while True:
+                    chunk = await upload.read(SPOOL_CHUNK_BYTES)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if size > self.max_bytes:
+                        raise self._reject(f"PDF is larger than {self.max_bytes} bytes")
+                    digest.update(chunk)
+                    await asyncio.to_thread(handle.write, chunk)
+        except BaseException:
+            os.unlink(handle.name)
+            raise
+        return handle.name, digest.hexdigest(), size
+
+    async def _page_count(self, path: str) -> int:
+        page_count = await asyncio.wait_for(
+            asyncio.wrap_future(self.pool.submit(count_pages, path)), self.timeout_seconds
+        )
+        if page_count > self.max_pages:
+            raise self._reject(f"PDF has {page_count} pages; the limit is {self.max_pages}")
+        return page_count
+
+    async def _extract(self, path: str, page_count: int) -> AsyncIterator[Tuple[int, str]]:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout_seconds
+        batches = deque(range(0, page_count, self.pages_per_task))
+        in_flight: deque = deque()
+        try:
+            while batches or in_flight:
+                # At most one batch per worker in flight per document, so one large
+                # PDF does not queue ahead of every other upload.
+                while batches and len(in_flight) < self.max_processes:
+                    start = batches.popleft()
+                    end = min(start + self.pages_per_task, page_count)
+                    in_flight.append((start, self.pool.submit(extract_pages, path, start, end)))
+                start, future = in_flight.popleft()
+                texts = await asyncio.wait_for(asyncio.wrap_future(future), max(0.0, deadline - loop.time()))
+                for offset, text in enumerate(texts):
+                    yield start + offset, text
+        finally:
+            for _, future in in_flight:
+                future.cancel()
+
+    async def iter_pages(self, upload: Any) -> AsyncIterator[Dict[str, Any]]:
+        """Yield ``meta``, then one ``page`` event per page in order, then ``done``.
+
+        Pages are yielded as soon as their batch is extracted, so a client can
+        start using the beginning of a long document early.
+        """
+        path, digest, size = await self.spool(upload)
+        try:
+            with span("pdf.extract", **{"genmentor.pdf.bytes": size}) as current_span:
+                pages = await asyncio.to_thread(self.cache.get, digest)
+                current_span.set_attribute("genmentor.cache_hit", pages is not None)
+                if pages is not None:
+                    yield {"event": "meta", "pages": len(pages), "sha256": digest, "cached": True}
+                    for number, text in enumerate(pages, start=1):
+                        yield {"event": "page", "page": number, "text": text}
+                    yield {"event": "done", "pages": len(pages), "sha256": digest}
+                    return
+                started = time.perf_counter()
+                page_count = await self._page_count(path)
+                current_span.set_attribute("genmentor.pdf.pages", page_count)
+                yield {"event": "meta", "pages": page_count, "sha256": digest, "cached": False}
+                pages = []
+                async for index, text in self._extract(path, page_count):
+                    pages.append(text)
+                    yield {"event": "page", "page": index + 1, "text": text}
+                with self._lock:
+                    self.documents += 1
+                    self.pages_extracted += len(pages)
+                    self.extraction_seconds += time.perf_counter() - started
+                await asyncio.to_thread(self.cache.set, digest, pages)
+                yield {"event": "done", "pages": len(pages), "sha256": digest}
+        finally:
+            os.unlink(path)
+
+    async def extract(self, upload: Any) -> Dict[str, Any]:
+        """Whole-document text (pages joined by newlines) with page count, hash and cache flag."""
+        pages: List[str] = []
+        meta: Dict[str, Any] = {}
+        async for event in self.iter_pages(upload):
+            if event["event"] == "meta":
+                meta = event
+            elif event["event"] == "page":
+                pages.append(event["text"])
+        return {"text": "\n".join(pages), "pages": len(pages), "sha256": meta.get("sha256"), "cached": meta.get("cached", False)}
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "documents": self.documents,
+                "pages_extracted": self.pages_extracted,
+                "rejected": self.rejected,
+                "extraction_seconds": round(self.extraction_seconds, 3),
+                "max_processes": self.max_processes,
+                **self.cache.stats(),
+            }
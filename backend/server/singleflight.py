@@ -0,0 +1,74 @@
+"""Coalescing of identical in-flight requests.
+
+Streamlit reruns and double clicks often send the same payload two or three
+times at once. :class:`SingleFlight` lets the first caller run the
+computation and hands every concurrent duplicate the same result, so the
+pipeline is paid for once.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Per-key deduplication of concurrent async calls, with saved-call counters."""
+
+    def __init__(self) -> None:
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self._executed: Dict[str, int] = defaultdict(int)
+        self._coalesced: Dict[str, int] = defaultdict(int)
+
+    @staticmethod
+    def make_key(endpoint: str, payload: Any, model: Hashable = None) -> str:
+        """Canonical hash of (endpoint, payload, model); dict key order does not matter."""
+        canonical = json.dumps([endpoint, payload, model], sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    async def do(self, endpoint: str, key: str, func: Callable[[], Awaitable[T]]) -> T:
+        """Await ``func()``, or the already running call with the same ``key``.
+
+        The computation runs in its own task, so a caller that goes away (for
+        example a closed connection) does not cancel it for the others.
+        """
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda t, key=key: self._finish(key, t))
+            self._executed[endpoint] += 1
+        else:
+            self._coalesced[endpoint] += 1
+            logger.info(f"Coalesced duplicate {endpoint} request")
+        return await asyncio.shield(task)
+
+    def _finish(self, key: str, task: asyncio.Task) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Mark the exception as retrieved in case every caller has gone away.
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        endpoints = sorted(set(self._executed) | set(self._coalesced))
+        executed = sum(self._executed.values())
+        saved = sum(self._coalesced.values())
+        return {
+            "in_flight": len(self._in_flight),
+            "executed": executed,
+            "saved_calls": saved,
+            "saved_ratio": saved / (executed + saved) if executed + saved else 0.0,
+            "by_endpoint": {
+                endpoint: {"executed": self._executed[endpoint], "saved_calls": self._coalesced[endpoint]}
+                for endpoint in endpoints
+            },
+        }
@@ -0,0 +1,52 @@
+"""Root span per HTTP request, so agent and search spans of one call share a trace."""
+
+from __future__ import annotations
+
+from typing import Any, Dict
+
+from opentelemetry import propagate
+from opentelemetry.trace import SpanKind
+
+from base.tracing import tracer
+
+# Scrapes and probes would only add noise to the traces.
+UNTRACED_PATHS = {"/metrics", "/healthz", "/readyz"}
+
+
+class TracingMiddleware:
+    """ASGI middleware opening a server span for every HTTP request.
+
+    An incoming ``traceparent`` header is honoured, so a caller that traces
+    can see the backend work inside its own trace. The span stays open until
+    the response body, streams included, has been sent.
+    """
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http" or scope["path"] in UNTRACED_PATHS:
+            await self.app(scope, receive, send)
+            return
+        headers = {key.decode("latin-1"): value.decode("latin-1") for key, value in scope.get("headers", [])}
+        parent = propagate.extract(headers)
+        method = scope["method"]
+        with tracer.start_as_current_span(
+            f"{method} {scope['path']}",
+            context=parent,
+            kind=SpanKind.SERVER,
+            attributes={"http.request.method": method, "url.path": scope["path"]},
+        ) as current_span:
+
+            async def send_with_status(message: Dict[str, Any]) -> None:
+                if message["type"] == "http.response.start":
+                    current_span.set_attribute("http.response.status_code", message["status"])
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                route = scope.get("route")
+                if route is not None:
+                    current_span.update_name(f"{method} {route.path}")
+                    current_span.set_attribute("http.route", route.path)
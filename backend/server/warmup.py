@@ -0,0 +1,135 @@
+"""Background warm-up of heavy components once the server is listening.
+
+Heavy components (embedding model, vector store, LLM clients) are created
+lazily, so importing the app and binding the port are fast. :class:`Warmup`
+then creates them in the background, in worker threads, and tracks the
+readiness reported by ``GET /readyz``. Until a step has finished, a request
+that needs the component simply creates it itself.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from omegaconf import DictConfig
+
+from utils.config import ensure_config_dict
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+@dataclass
+class WarmupStep:
+    name: str
+    func: Callable[[], Any]
+    required: bool = True  # required steps gate readiness
+    status: str = PENDING
+    attempts: int = 0
+    seconds: Optional[float] = None
+    error: Optional[str] = None
+
+
+class Warmup:
+    """Runs registered steps one after another in a background task.
+
+    A failed step is retried every ``retry_seconds`` (``None`` disables retries).
+    With ``enabled=False`` nothing is run and the server is ready at once.
+    """
+
+    def __init__(self, enabled: bool = True, retry_seconds: Optional[float] = 30.0) -> None:
+        self.enabled = enabled
+        self.retry_seconds = retry_seconds
+        self.steps: List[WarmupStep] = []
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def from_config(config: Union[DictConfig, Dict[str, Any]]) -> "Warmup":
+        config = ensure_config_dict(config)
+        warmup_config = config.get("warmup") or {}
+        return Warmup(
+            enabled=bool(warmup_config.get("enabled", True)),
+            retry_seconds=warmup_config.get("retry_seconds", 30.0),
+        )
+
+    def add(self, name: str, func: Callable[[], Any], *, required: bool = True) -> None:
+        self.steps.append(WarmupStep(name=name, func=func, required=required))
+
+    @property
+    def ready(self) -> bool:
+        if not self.enabled:
+            return True
+        return all(step.status == DONE for step in self.steps if step.required)
+
+    def start(self) -> None:
+        """Schedule the warm-up on the running event loop and return immediately."""
+        if not self.enabled or self._task is not None:
+            return
+        self.started_at = time.time()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        # A step already running in a thread finishes on its own; only the loop is cancelled.
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run_step(self, step: WarmupStep) -> None:
+        step.status = RUNNING
+        step.attempts += 1
+        started = time.perf_counter()
+        try:
+            await asyncio.to_thread(step.func)
+        except Exception as e:
+            step.status = FAILED
+            step.error = f"{type(e).__name__}: {e}"
+            logger.warning(f"Warm-up step '{step.name}' failed: {step.error}")
+        else:
+            step.status = DONE
+            step.error = None
+            logger.info(f"Warm-up step '{step.name}' done in {time.perf_counter() - started:.2f}s")
+        step.seconds = round(time.perf_counter() - started, 3)
+
+    async def _run(self) -> None:
+        pending = list(self.steps)
+        while True:
+            for step in pending:
+                await self._run_step(step)
+            pending = [step for step in pending if step.status == FAILED]
+            if not pending:
+                self.finished_at = time.time()
+                logger.info(f"Warm-up finished in {self.finished_at - self.started_at:.2f}s")
+                return
+            if self.retry_seconds is None:
+                return
+            await asyncio.sleep(float(self.retry_seconds))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "ready": self.ready,
+            "seconds": round(self.finished_at - self.started_at, 3) if self.finished_at and self.started_at else None,
+            "steps": {
+                step.name: {
+                    "status": step.status,
+                    "required": step.required,
+                    "attempts": step.attempts,
+                    "seconds": step.seconds,
+                    "error": step.error,
+                }
+                for step in self.steps
+            },
+        }
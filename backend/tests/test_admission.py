@@ -0,0 +1,128 @@
+"""Check priority classification, weighted fair dispatch and queue limits.
+
+Run from the repo root:
+    python backend/tests/test_admission.py
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from server.admission import AdmissionController, AdmissionRejected
+
+
+def make_controller(**overrides):
+    config = {
+        "max_concurrent": 1,
+        "exempt": ["jobs"],
+        "classes": {
+            "interactive": {"weight": 3, "max_queue": 10, "endpoints": ["chat-with-tutor"]},
+            "standard": {"weight": 1, "max_queue": 10},
+            "batch": {"weight": 1, "max_concurrent": 1, "max_queue": 1, "endpoints": ["tailor-knowledge-content"]},
+        },
+    }
+    config.update(overrides)
+    return AdmissionController(**config)
+
+
+def test_classify():
+    controller = make_controller()
+    assert controller.classify("POST", "/chat-with-tutor") == "interactive"
+    assert controller.classify("POST", "/v2/tailor-knowledge-content") == "batch"
+    assert controller.classify("POST", "/schedule-learning-path") == "standard"
+    assert controller.classify("POST", "/jobs/tailor-knowledge-content") is None
+    assert controller.classify("GET", "/server-stats") is None
+
+
+def test_weighted_fair_order():
+    async def scenario():
+        controller = make_controller()
+        order = []
+        gate = asyncio.Event()
+
+        async def request(name, label):
+            async with controller.admit(name):
+                order.append(label)
+                if label == "first":
+                    await gate.wait()
+
+        first = asyncio.create_task(request("standard", "first"))
+        await asyncio.sleep(0)
+        waiters = [asyncio.create_task(request("standard", f"s{i}")) for i in range(4)]
+        waiters += [asyncio.create_task(request("interactive", f"i{i}")) for i in range(6)]
+        await asyncio.sleep(0)
+        gate.set()
+        await asyncio.gather(first, *waiters)
+        return order[1:]
+
+    order = asyncio.run(scenario())
+    # Interactive (weight 3) gets three slots for every standard one; the first
+    # standard request has already been charged for.
+    assert order == ["i0", "i1", "i2", "i3", "s0", "i4", "i5", "s1", "s2", "s3"], order
+
+
+def test_full_queue_is_rejected_with_retry_after():
+    async def scenario():
+        controller = make_controller(max_concurrent=4)
+        gate = asyncio.Event()
+
+        async def batch():
+            async with controller.admit("batch"):
+                await gate.wait()
+
+        running = asyncio.create_task(batch())
+        await asyncio.sleep(0)
+        queued = asyncio.create_task(batch())
+        await asyncio.sleep(0)
+        try:
+            await controller.acquire("batch")
+        except AdmissionRejected as e:
+            rejected = e
+        # Batch is capped at one slot, but other classes still get in.
+        async with controller.admit("interactive"):
+            pass
+        gate.set()
+        await asyncio.gather(running, queued)
+        return rejected, controller.stats()
+
+    rejected, stats = asyncio.run(scenario())
+    assert rejected.retry_after_seconds >= 1
+    assert stats["classes"]["batch"]["rejected"] == 1
+    assert stats["running"] == 0 and stats["queued"] == 0
+
+
+def test_queue_wait_limit():
+    async def scenario():
+        controller = make_controller()
+        controller.classes["standard"].max_wait_seconds = 0.02
+        gate = asyncio.Event()
+
+        async def hold():
+            async with controller.admit("standard"):
+                await gate.wait()
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        try:
+            await controller.acquire("standard")
+            timed_out = False
+        except AdmissionRejected:
+            timed_out = True
+        gate.set()
+        await holder
+        return timed_out, controller.stats()
+
+    timed_out, stats = asyncio.run(scenario())
+    assert timed_out
+    assert stats["classes"]["standard"]["timed_out"] == 1
+    assert stats["queued"] == 0
+
+
+if __name__ == "__main__":
+    test_classify()
+    test_weighted_fair_order()
+    test_full_queue_is_rejected_with_retry_after()
+    test_queue_wait_limit()
+    print("All admission checks passed.")
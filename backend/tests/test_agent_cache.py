@@ -0,0 +1,91 @@
+"""Check that equivalent agents share one compiled graph and that set_prompts evicts it.
+
+Run from the repo root:
+    python backend/tests/test_agent_cache.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from langchain_core.language_models import FakeListChatModel
+from langchain_core.tools import tool
+
+from base import BaseAgent
+from base.agent_cache import AgentGraphCache, agent_graph_cache
+
+
+@tool
+def lookup(term: str) -> str:
+    """Look a term up."""
+    return term
+
+
+@tool
+def define(term: str) -> str:
+    """Define a term."""
+    return term
+
+
+class ToolFriendlyModel(FakeListChatModel):
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+
+def test_same_key_shares_one_graph():
+    agent_graph_cache.clear()
+    model = ToolFriendlyModel(responses=["ok"])
+    first = BaseAgent(model, system_prompt="You help.", tools=[lookup], debug=False)
+    second = BaseAgent(model, system_prompt="You help.", tools=[lookup], debug=False)
+    assert second._agent is first._agent
+    # Anything that changes the key compiles its own graph.
+    others = [
+        BaseAgent(model, system_prompt="You teach.", tools=[lookup], debug=False),
+        BaseAgent(model, system_prompt="You help.", tools=[define], debug=False),
+        BaseAgent(model, system_prompt="You help.", tools=[lookup, define], debug=False),
+        BaseAgent(model, system_prompt="You help.", tools=[lookup], debug=True),
+        BaseAgent(ToolFriendlyModel(responses=["ok"]), system_prompt="You help.", tools=[lookup], debug=False),
+    ]
+    assert len({id(agent._agent) for agent in [first, *others]}) == 6
+    stats = agent_graph_cache.stats()
+    assert stats["size"] == 6 and stats["hits"] >= 1 and stats["misses"] >= 6
+
+
+def test_set_prompts_evicts_the_old_graph():
+    agent_graph_cache.clear()
+    model = ToolFriendlyModel(responses=["ok"])
+    agent = BaseAgent(model, system_prompt="You help.")
+    old_key, old_graph = agent._graph_key(), agent._agent
+    agent.set_prompts(system_prompt="You teach.")
+    assert agent._agent is not old_graph and agent._graph_key() != old_key
+    assert old_key not in agent_graph_cache._graphs and agent._graph_key() in agent_graph_cache._graphs
+    # An agent built with the old prompt compiles a fresh graph rather than reusing the evicted one.
+    assert BaseAgent(model, system_prompt="You help.")._agent is not old_graph
+
+
+def test_bounded_and_unhashable_kwargs_bypass():
+    cache = AgentGraphCache(max_size=2)
+    builds = []
+
+    def build(name):
+        return lambda: builds.append(name) or name
+
+    for name in ("a", "b", "a", "c", "b"):
+        cache.get_or_build((name,), build(name))
+    # "b" was the least recently used when "c" was added.
+    assert builds == ["a", "b", "c", "b"] and cache.stats()["size"] == 2
+    assert AgentGraphCache.make_key(object(), "p", None, {"middleware": [{"names"}]}) is None
+    cache.get_or_build(None, build("x"))
+    cache.get_or_build(None, build("x"))
+    assert builds.count("x") == 2
+    cache.configure(enabled=False)
+    assert cache.stats()["size"] == 0
+
+
+if __name__ == "__main__":
+    test_same_key_shares_one_graph()
+    test_set_prompts_evicts_the_old_graph()
+    test_bounded_and_unhashable_kwargs_bypass()
+    print("All agent graph cache checks passed.")
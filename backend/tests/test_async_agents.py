@@ -0,0 +1,135 @@
+"""Check the async agent path: BaseAgent.ainvoke/astream, the call limit and the drafting fan-out.
+
+Run from the repo root:
+    python backend/tests/test_async_agents.py
+"""
+
+import asyncio
+import json
+import os
+import sys
+from typing import Any, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from base import BaseAgent
+from base.base_agent import use_llm_call_limit
+from modules.ai_chatbot_tutor import achat_with_tutor_with_llm
+from modules.personalized_resource_delivery.agents.search_enhanced_knowledge_drafter import (
+    adraft_knowledge_points_with_llm,
+)
+
+
+class FakeChatModel(BaseChatModel):
+    """Replies with a draft of the knowledge point named in the prompt, after a short delay."""
+
+    delay: float = 0.05
+    active: int = 0
+    peak: int = 0
+    prompts: List[str] = []
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake"
+
+    def _reply(self, messages) -> str:
+        prompt = messages[-1].content
+        self.prompts.append(prompt)
+        for name in ("alpha", "beta", "gamma", "delta", "epsilon"):
+            if f"kp-{name}" in prompt:
+                return json.dumps({"title": name, "content": f"All about {name}."})
+        return "<think>hidden</think>Hello there, learner."
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self._reply(messages)))])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            return self._generate(messages)
+        finally:
+            self.active -= 1
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs: Any):
+        for word in self._reply(messages).split(" "):
+            await asyncio.sleep(0)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=word + " "))
+
+
+def knowledge_points(names):
+    return [{"name": f"kp-{name}", "role": "foundational"} for name in names]
+
+
+def test_ainvoke_parses_json_output():
+    async def scenario():
+        agent = BaseAgent(FakeChatModel(), system_prompt="You draft.")
+        assert await agent.ainvoke({"kp": "kp-alpha"}, task_prompt="Draft {kp}.") == {
+            "title": "alpha", "content": "All about alpha."
+        }
+
+    asyncio.run(scenario())
+
+
+def test_astream_yields_text_without_think_tags():
+    async def scenario():
+        agent = BaseAgent(FakeChatModel(), system_prompt="You chat.", jsonalize_output=False)
+        chunks = [chunk async for chunk in agent.astream({}, task_prompt="Hi.")]
+        assert len(chunks) > 1 and "".join(chunks).strip() == "Hello there, learner."
+
+    asyncio.run(scenario())
+
+
+def test_call_limit_caps_calls_in_flight():
+    async def scenario():
+        model = FakeChatModel()
+        agent = BaseAgent(model, system_prompt="You draft.")
+        with use_llm_call_limit(asyncio.Semaphore(2)):
+            results = await asyncio.gather(*(
+                agent.ainvoke({"kp": f"kp-{name}"}, task_prompt="Draft {kp}.") for name in ("alpha", "beta", "gamma", "delta")
+            ))
+        assert [result["title"] for result in results] == ["alpha", "beta", "gamma", "delta"] and model.peak == 2
+        await agent.ainvoke({"kp": "kp-alpha"}, task_prompt="Draft {kp}.")  # outside the context there is no cap
+
+    asyncio.run(scenario())
+
+
+def test_drafts_fan_out_in_parallel_and_keep_input_order():
+    async def scenario(allow_parallel, max_workers):
+        model = FakeChatModel()
+        drafts = await adraft_knowledge_points_with_llm(
+            model, {"name": "learner"}, [], {"id": "Session 1", "title": "Asyncio"},
+            knowledge_points(["alpha", "beta", "gamma", "delta", "epsilon"]),
+            allow_parallel=allow_parallel, use_search=False, max_workers=max_workers,
+        )
+        return [draft["title"] for draft in drafts], model.peak
+
+    names = ["alpha", "beta", "gamma", "delta", "epsilon"]
+    assert asyncio.run(scenario(True, 2)) == (names, 2)
+    assert asyncio.run(scenario(True, 8)) == (names, 5)
+    assert asyncio.run(scenario(False, 8)) == (names, 1)
+
+
+def test_tutor_chat_runs_without_the_executor():
+    async def scenario():
+        model = FakeChatModel()
+        response = await achat_with_tutor_with_llm(
+            model, [{"role": "user", "content": "What is a coroutine?"}], {"name": "learner"}, use_search=False
+        )
+        assert response == "Hello there, learner." and "What is a coroutine?" in model.prompts[-1]
+
+    asyncio.run(scenario())
+
+
+if __name__ == "__main__":
+    test_ainvoke_parses_json_output()
+    test_astream_yields_text_without_think_tags()
+    test_call_limit_caps_calls_in_flight()
+    test_drafts_fan_out_in_parallel_and_keep_input_order()
+    test_tutor_chat_runs_without_the_executor()
+    print("All async agent checks passed.")
@@ -0,0 +1,251 @@
+"""Check the streamed content pipelines with fake agents: event order, draft ordering, quiz counts, search and limits.
+
+Run from the repo root:
+    python backend/tests/test_content_streams.py
+"""
+
+import asyncio
+import os
+import sys
+from contextlib import contextmanager, nullcontext
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from langchain_core.documents import Document
+
+from base import llm_call_limit
+from modules.personalized_resource_delivery.agents import (
+    document_quiz_generator,
+    goal_oriented_knowledge_explorer,
+    learning_document_integrator,
+    search_enhanced_knowledge_drafter,
+)
+from modules.personalized_resource_delivery.agents.learning_content_creator import (
+    astream_learning_content_with_llm,
+    astream_learning_path_content_with_llm,
+)
+
+SESSION = {"id": "Session 1", "title": "s1"}
+PATH = [{"id": f"Session {i}", "title": f"s{i}"} for i in range(4)]
+
+
+class FakeAgents:
+    """Stand-ins for the agent helpers; each call sleeps ``delays[name]`` seconds like an LLM call would."""
+
+    def __init__(self, points=3, delays=None, failing=()):
+        self.points = points
+        self.delays = delays or {}
+        self.failing = set(failing)
+        self.active = self.peak = 0
+        self.cancelled = []
+        self.quiz_counts = []
+        self.contexts = {}
+
+    async def _call(self, name):
+        # Waits on the batch's limit like BaseAgent.ainvoke does.
+        async with llm_call_limit.get() or nullcontext():
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            try:
+                await asyncio.sleep(self.delays.get(name, 0.01))
+            except asyncio.CancelledError:
+                self.cancelled.append(name)
+                raise
+            finally:
+                self.active -= 1
+        if name in self.failing:
+            raise RuntimeError(f"{name} failed")
+
+    async def explore(self, llm, learner_profile, learning_path, learning_session):
+        title = learning_session["title"]
+        await self._call(f"explore {title}")
+        return {"knowledge_points": [{"name": f"{title}-kp{i}"} for i in range(self.points)]}
+
+    async def draft(self, llm, learner_profile, learning_path, learning_session, knowledge_points, knowledge_point,
+                    use_search=True, *, search_rag_manager=None, external_resources=""):
+        await self._call(knowledge_point["name"])
+        self.contexts[knowledge_point["name"]] = external_resources
+        return {"title": knowledge_point["name"], "content": external_resources}
+
+    async def integrate(self, llm, learner_profile, learning_path, learning_session, knowledge_points, knowledge_drafts,
+                        output_markdown=True):
+        await self._call(f"integrate {learning_session['title']}")
+        return " | ".join(draft["title"] for draft in knowledge_drafts)
+
+    async def quizzes(self, llm, learner_profile, learning_document, **counts):
+        await self._call(f"quiz {learning_document}")
+        self.quiz_counts.append(counts)
+        return {"counts": counts}
+
+
+class FakeSearch:
+    """Stand-in for SearchRagManager's shared search pass and the reads that follow it."""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.prefetched = []
+        self.retrieved = []
+
+    def prefetch(self, queries, max_workers):
+        if self.fail:
+            raise ConnectionError("search is down")
+        self.prefetched.extend(queries)
+        return len(set(queries))
+
+    def retrieve(self, query):
+        self.retrieved.append(query)
+        return [Document(page_content=f"notes on {query}", metadata={"source": "https://docs.example"})]
+
+
+@contextmanager
+def fake_agents(**kwargs):
+    fakes = FakeAgents(**kwargs)
+    replaced = [
+        (goal_oriented_knowledge_explorer, "aexplore_knowledge_points_with_llm", fakes.explore),
+        (search_enhanced_knowledge_drafter, "adraft_knowledge_point_with_llm", fakes.draft),
+        (learning_document_integrator, "aintegrate_learning_document_with_llm", fakes.integrate),
+        (document_quiz_generator, "agenerate_document_quizzes_with_llm", fakes.quizzes),
+    ]
+    originals = [(module, name, getattr(module, name)) for module, name, _ in replaced]
+    for module, name, fake in replaced:
+        setattr(module, name, fake)
+    try:
+        yield fakes
+    finally:
+        for module, name, original in originals:
+            setattr(module, name, original)
+
+
+async def collect(events):
+    return [event async for event in events]
+
+
+def test_stages_arrive_in_order_and_drafts_as_they_finish():
+    with fake_agents(delays={"s1-kp0": 0.15, "s1-kp1": 0.01, "s1-kp2": 0.08}) as fakes:
+        events = asyncio.run(collect(astream_learning_content_with_llm(
+            None, {}, [SESSION], SESSION, quiz_counts={"single_choice_count": 1, "true_false_count": 2},
+        )))
+    assert [event["event"] for event in events] == [
+        "knowledge_points", "knowledge_draft", "knowledge_draft", "knowledge_draft", "document", "quizzes", "done"
+    ]
+    drafts = [event for event in events if event["event"] == "knowledge_draft"]
+    assert [draft["index"] for draft in drafts] == [1, 2, 0]
+    assert all(draft["knowledge_point"]["name"] == draft["knowledge_draft"]["title"] == f"s1-kp{draft['index']}" for draft in drafts)
+    # The document is integrated from the drafts in knowledge-point order, not completion order.
+    assert events[4]["learning_document"] == "s1-kp0 | s1-kp1 | s1-kp2"
+    assert fakes.quiz_counts == [
+        {"single_choice_count": 1, "multiple_choice_count": 0, "true_false_count": 2, "short_answer_count": 0}
+    ]
+    assert events[5]["document_quiz"]["counts"] == fakes.quiz_counts[0]
+
+
+def test_max_workers_bounds_drafts_and_quizzes_are_optional():
+    with fake_agents(points=4) as fakes:
+        events = asyncio.run(collect(astream_learning_content_with_llm(None, {}, [SESSION], SESSION, max_workers=2, with_quiz=False)))
+        assert fakes.peak == 2 and [event["event"] for event in events][-2:] == ["document", "done"]
+    with fake_agents(points=4) as fakes:
+        asyncio.run(collect(astream_learning_content_with_llm(None, {}, [SESSION], SESSION, allow_parallel=False)))
+        assert fakes.peak == 1 and fakes.quiz_counts == [
+            {"single_choice_count": 3, "multiple_choice_count": 0, "true_false_count": 0, "short_answer_count": 0}
+        ]
+
+
+def test_pending_drafts_are_cancelled_when_the_consumer_stops():
+    async def scenario(fakes):
+        events = astream_learning_content_with_llm(None, {}, [SESSION], SESSION)
+        async for event in events:
+            if event["event"] == "knowledge_draft":
+                break
+        await events.aclose()
+        await asyncio.sleep(0.05)
+        assert event["index"] == 0 and sorted(fakes.cancelled) == ["s1-kp1", "s1-kp2"]
+        assert fakes.active == 0 and fakes.quiz_counts == []
+
+    with fake_agents(delays={"s1-kp1": 5, "s1-kp2": 5}) as fakes:
+        asyncio.run(scenario(fakes))
+
+
+def test_failed_draft_cancels_the_others():
+    async def scenario(fakes):
+        try:
+            await collect(astream_learning_content_with_llm(None, {}, [SESSION], SESSION))
+        except RuntimeError as e:
+            assert str(e) == "s1-kp0 failed"
+        else:
+            raise AssertionError("a failed draft ends the stream with its error")
+        await asyncio.sleep(0.05)
+        assert sorted(fakes.cancelled) == ["s1-kp1", "s1-kp2"]
+
+    with fake_agents(delays={"s1-kp1": 5, "s1-kp2": 5}, failing={"s1-kp0"}) as fakes:
+        asyncio.run(scenario(fakes))
+
+
+def test_batch_events_arrive_in_stage_order_and_failures_stay_local():
+    search = FakeSearch()
+    with fake_agents(points=2, failing={"explore s1", "integrate s2"}, delays={"s3-kp0": 0.1}) as fakes:
+        events = asyncio.run(collect(astream_learning_path_content_with_llm(
+            None, {}, {"learning_path": PATH}, session_indices=[3, 1, 2, 0, 2], with_quiz=False, search_rag_manager=search,
+        )))
+    kinds = [(event["event"], event.get("session_index")) for event in events]
+    assert sorted(kinds[:4]) == [("knowledge_points", 0), ("knowledge_points", 2), ("knowledge_points", 3), ("session_error", 1)]
+    assert kinds[4] == ("search", None) and kinds[-1] == ("done", None)
+    assert sorted(kinds[5:-1]) == [("session", 0), ("session", 3), ("session_error", 2)]
+    # Session 3 has the slowest draft, so it finishes last; session 2 was not held back by it.
+    assert kinds[-2] == ("session", 3)
+    assert events[4]["queries"] == 6 and events[4]["documents"] == 6 and "error" not in events[4]
+    assert sorted(search.prefetched) == sorted(search.retrieved) and len(search.retrieved) == 6
+    assert events[-2]["learning_content"] == {"document": "s3-kp0 | s3-kp1"}
+    # Each draft reads its own query's context back from the store.
+    assert "notes on s0 s0-kp1" in fakes.contexts["s0-kp1"] and "s0-kp0" not in fakes.contexts["s0-kp1"]
+    assert next(event for event in events if event["event"] == "session_error")["detail"] == "explore s1 failed"
+
+
+def test_batch_drafts_without_context_when_the_shared_search_fails():
+    search = FakeSearch(fail=True)
+    with fake_agents(points=2) as fakes:
+        events = asyncio.run(collect(astream_learning_path_content_with_llm(
+            None, {}, PATH[:2], with_quiz=True, quiz_counts={"short_answer_count": 1}, search_rag_manager=search,
+        )))
+    search_event = next(event for event in events if event["event"] == "search")
+    assert search_event["documents"] == 0 and search_event["error"] == "search is down"
+    assert [event["event"] for event in events].count("session") == 2 and events[-1] == {"event": "done"}
+    assert search.retrieved == [] and set(fakes.contexts.values()) == {""}
+    assert fakes.quiz_counts == [
+        {"single_choice_count": 3, "multiple_choice_count": 0, "true_false_count": 0, "short_answer_count": 1}
+    ] * 2
+
+
+def test_batch_llm_calls_share_one_limit():
+    async def scenario(fakes, **kwargs):
+        events = await collect(astream_learning_path_content_with_llm(None, {}, PATH, with_quiz=False, use_search=False, **kwargs))
+        assert [event["event"] for event in events].count("session") == 4
+        return fakes.peak
+
+    with fake_agents(points=3) as fakes:
+        assert asyncio.run(scenario(fakes, llm_semaphore=asyncio.Semaphore(2))) == 2
+    with fake_agents(points=3) as fakes:
+        assert asyncio.run(scenario(fakes, llm_concurrency=3)) == 3
+    with fake_agents(points=3) as fakes:
+        # Without a limit, three sessions draft three points each at once.
+        assert asyncio.run(scenario(fakes, max_concurrent_sessions=3)) == 9
+
+
+def test_batch_rejects_sessions_outside_the_path():
+    try:
+        asyncio.run(collect(astream_learning_path_content_with_llm(None, {}, PATH, session_indices=[1, 4])))
+    except ValueError as e:
+        assert "[4]" in str(e)
+    else:
+        raise AssertionError("out-of-range session indices are rejected")
+
+
+if __name__ == "__main__":
+    test_stages_arrive_in_order_and_drafts_as_they_finish()
+    test_max_workers_bounds_drafts_and_quizzes_are_optional()
+    test_pending_drafts_are_cancelled_when_the_consumer_stops()
+    test_failed_draft_cancels_the_others()
+    test_batch_events_arrive_in_stage_order_and_failures_stay_local()
+    test_batch_drafts_without_context_when_the_shared_search_fails()
+    test_batch_llm_calls_share_one_limit()
+    test_batch_rejects_sessions_outside_the_path()
+    print("All content stream checks passed.")
@@ -0,0 +1,60 @@
+"""Check that the embedding cache sends only uncached texts to the model and persists vectors.
+
+Run from the repo root:
+    python backend/tests/test_embedding_cache.py
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from base.embedding_cache import CachedEmbeddings
+
+
+class RecordingEmbeddings(DeterministicFakeEmbedding):
+    calls: list = []
+
+    def embed_documents(self, texts):
+        self.calls.append(list(texts))
+        return super().embed_documents(texts)
+
+    def embed_query(self, text):
+        self.calls.append(text)
+        return super().embed_query(text)
+
+
+def test_only_misses_reach_the_model():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "embeddings.sqlite3")
+        model = RecordingEmbeddings(size=8, calls=[])
+        cached = CachedEmbeddings(model, model="fake:8", disk_path=path)
+        first = cached.embed_documents(["alpha", "beta", "alpha"])
+        assert model.calls == [["alpha", "beta"]]
+        assert first[0] == first[2]
+        second = cached.embed_documents(["alpha", "gamma"])
+        assert model.calls[1:] == [["gamma"]] and second[0] == first[0]
+        assert cached.stats()["memory_hits"] == 1 and cached.stats()["embedded"] == 3
+
+        # Queries are cached apart from documents.
+        cached.embed_query("alpha")
+        cached.embed_query("alpha")
+        assert model.calls[2:] == ["alpha"]
+
+        # A new process reads the vectors from disk; another model does not.
+        model.calls.clear()
+        restarted = CachedEmbeddings(model, model="fake:8", disk_path=path)
+        again = restarted.embed_documents(["gamma", "beta", "alpha"])
+        assert model.calls == []
+        assert all(abs(a - b) < 1e-6 for a, b in zip(again[2], first[0]))
+        assert restarted.stats()["disk_hits"] == 3 and restarted.stats()["hit_rate"] == 1.0
+        CachedEmbeddings(model, model="fake:16", disk_path=path).embed_documents(["alpha"])
+        assert model.calls == [["alpha"]]
+
+
+if __name__ == "__main__":
+    test_only_misses_reach_the_model()
+    print("All embedding cache checks passed.")
@@ -0,0 +1,108 @@
+"""Check the agent executor: pool bound, timing stats, context propagation and errors.
+
+Run from the repo root:
+    python backend/tests/test_executor.py
+"""
+
+import asyncio
+import contextvars
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from server.executor import AgentExecutor
+
+request_id = contextvars.ContextVar("request_id", default=None)
+
+
+def test_calls_beyond_max_workers_queue():
+    async def scenario():
+        executor = AgentExecutor(max_workers=2)
+        release = threading.Event()
+        lock = threading.Lock()
+        active = peak = 0
+
+        def blocking(n):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            release.wait(5)
+            with lock:
+                active -= 1
+            return n
+
+        calls = [asyncio.create_task(executor.run(blocking, n)) for n in range(5)]
+        for _ in range(100):
+            stats = executor.stats()
+            if stats["running"] == 2 and stats["queued"] == 3:
+                break
+            await asyncio.sleep(0.01)
+        assert stats["running"] == 2 and stats["queued"] == 3 and executor.queue_depth == 3
+        await asyncio.sleep(0.05)  # the queued calls wait for a worker
+        release.set()
+        assert await asyncio.gather(*calls) == list(range(5))
+        executor.shutdown()
+        stats = executor.stats()
+        assert peak == 2 and stats["submitted"] == stats["completed"] == 5
+        assert stats["queued"] == stats["running"] == 0
+        # Three calls waited for a worker, at least the 50 ms held above.
+        assert stats["queue_time"]["count"] == 5 and stats["queue_time"]["max_seconds"] >= 0.05
+        assert stats["run_time"]["count"] == 5 and stats["run_time"]["max_seconds"] >= 0.05
+
+    asyncio.run(scenario())
+
+
+def test_run_time_is_recorded():
+    async def scenario():
+        executor = AgentExecutor(max_workers=1)
+        await executor.run(time.sleep, 0.05)
+        executor.shutdown()
+        run_time = executor.stats()["run_time"]
+        assert run_time["count"] == 1 and 0.05 <= run_time["total_seconds"] < 1
+        assert run_time["avg_seconds"] == run_time["total_seconds"] == run_time["max_seconds"]
+
+    asyncio.run(scenario())
+
+
+def test_context_variables_reach_the_worker():
+    async def scenario():
+        executor = AgentExecutor(max_workers=1)
+        request_id.set("req-42")
+        seen = await executor.run(lambda: (request_id.get(), threading.current_thread().name))
+        executor.shutdown()
+        assert seen[0] == "req-42" and seen[1].startswith("agent-worker")
+
+    asyncio.run(scenario())
+
+
+def test_exceptions_propagate():
+    async def scenario():
+        executor = AgentExecutor(max_workers=1)
+
+        def fail():
+            raise KeyError("missing")
+
+        try:
+            await executor.run(fail)
+        except KeyError as e:
+            assert e.args == ("missing",)
+        else:
+            raise AssertionError("the callable's exception reaches the caller")
+        assert await executor.run(sum, [1, 2]) == 3
+        executor.shutdown()
+        stats = executor.stats()
+        assert stats["failed"] == 1 and stats["completed"] == 1 and stats["run_time"]["count"] == 2
+
+    asyncio.run(scenario())
+
+
+if __name__ == "__main__":
+    test_calls_beyond_max_workers_queue()
+    test_run_time_is_recorded()
+    test_context_variables_reach_the_worker()
+    test_exceptions_propagate()
+    print("All agent executor checks passed.")
@@ -0,0 +1,123 @@
+"""Check the BM25 index, reciprocal-rank fusion and hybrid retrieval in SearchRagManager.
+
+Run from the repo root:
+    python backend/tests/test_hybrid_retrieval.py
+"""
+
+import os
+import sys
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import FakeEmbeddings
+from langchain_core.vectorstores import InMemoryVectorStore
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from base.chunk_ids import chunk_id
+from base.lexical_index import BM25Index, reciprocal_rank_fusion, tokenize
+from base.search_rag import SearchRagManager
+from base.vector_owner import VectorOwner
+
+PAGES = {
+    "https://docs.example/gather": "Use asyncio.gather to run awaitables concurrently and collect their results.",
+    "https://docs.example/tasks": "Tasks schedule coroutines on the event loop; cancel them with Task.cancel.",
+    "https://docs.example/sockets": "Set TCP_NODELAY on a socket to disable Nagle's algorithm for small writes.",
+    "https://docs.example/threads": "A thread pool runs blocking functions without stalling the event loop.",
+}
+
+
+def page_documents():
+    return [Document(page_content=text, metadata={"source": source}) for source, text in PAGES.items()]
+
+
+def test_tokenize_keeps_identifiers():
+    tokens = tokenize("Call asyncio.gather() or std::vector, set TCP_NODELAY in C++ 学习")
+    assert {"asyncio.gather", "asyncio", "gather", "std::vector", "std", "vector", "tcp_nodelay", "c++", "学", "习"} <= set(tokens)
+    assert "call" in tokens and "(" not in tokens
+
+
+def test_bm25_ranks_exact_terms_and_is_incremental():
+    index = BM25Index()
+    documents = [Document(id=source, page_content=text, metadata={"source": source}) for source, text in PAGES.items()]
+    assert index.add_documents(documents[:2]) == 2
+    assert index.search("TCP_NODELAY") == []
+    assert index.add_documents(documents) == 2 and len(index) == 4
+    hits = index.search("how does TCP_NODELAY work", k=2)
+    assert hits[0][0].id == "https://docs.example/sockets" and len(hits) == 1
+    assert index.search("gather")[0][0].id == "https://docs.example/gather"
+    assert index.search("") == []
+
+
+def test_reciprocal_rank_fusion():
+    a, b, c = (Document(id=name, page_content=name) for name in "abc")
+    # b is second in both rankings, a first in one only.
+    assert [doc.id for doc in reciprocal_rank_fusion([[a, b], [c, b]])] == ["b", "a", "c"]
+    assert [doc.id for doc in reciprocal_rank_fusion([[a, b], [c]], weights=[1.0, 3.0])] == ["c", "a", "b"]
+
+
+def test_hybrid_retrieve_finds_exact_terms():
+    embedder = FakeEmbeddings(size=8)  # random vectors: the vector ranking is noise
+    splitter = RecursiveCharacterTextSplitter(chunk_size=200, chunk_overlap=0)
+    store = InMemoryVectorStore(embedding=embedder)
+    manager = SearchRagManager(
+        embedder=embedder, text_splitter=splitter, vectorstore=store, retrieval_mode="hybrid", hybrid_candidates=4
+    )
+    manager.add_documents(page_documents())
+    assert len(manager.lexical_index) == 4
+    for term, source in [("TCP_NODELAY", "sockets"), ("asyncio.gather", "gather"), ("Task.cancel", "tasks")]:
+        assert manager.retrieve(f"What is {term}?", k=1)[0].metadata["source"] == f"https://docs.example/{source}"
+    assert manager.stats()["lexical_index"]["documents"] == 4
+
+    vector_only = SearchRagManager(embedder=embedder, vectorstore=store)
+    assert vector_only.lexical_index is None and len(vector_only.retrieve("TCP_NODELAY", k=2)) == 2
+    try:
+        SearchRagManager(retrieval_mode="keyword")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("unknown retrieval modes are rejected")
+
+
+def test_index_is_loaded_from_a_persistent_collection():
+    import chromadb
+
+    collection = chromadb.EphemeralClient().create_collection(f"hybrid-{uuid.uuid4().hex}", embedding_function=None)
+    collection.add(
+        ids=list(PAGES),
+        documents=list(PAGES.values()),
+        metadatas=[{"source": source} for source in PAGES],
+        embeddings=[[float(i)] * 4 for i in range(len(PAGES))],
+    )
+    index = BM25Index()
+    assert index.load(collection, batch_size=3) == 4 and index.load(collection) == 0
+    assert index.search("Nagle")[0][0].metadata["source"] == "https://docs.example/sockets"
+
+
+def test_owner_keeps_the_index_in_sync():
+    embedder = FakeEmbeddings(size=8)
+    index = BM25Index()
+    owner = VectorOwner(embedder, InMemoryVectorStore(embedding=embedder), index)
+    documents = [Document(id=source, page_content=text, metadata={"source": source}) for source, text in PAGES.items()]
+    owner.handle("add_documents", (documents,))
+    assert [doc.id for doc in owner.handle("lexical_search", ("TCP_NODELAY", 3))] == ["https://docs.example/sockets"]
+    assert owner.stats()["lexical_index"]["documents"] == 4
+
+    # Texts are indexed too, under the same stable ids as in the store.
+    ids = owner.handle("add_texts", (["Raise RecursionError with sys.setrecursionlimit."], [{"source": "https://docs.example/sys"}]))
+    assert [doc.id for doc in owner.handle("lexical_search", ("setrecursionlimit", 3))] == ids
+    assert owner.vectorstore.get_by_ids(ids)[0].metadata["source"] == "https://docs.example/sys"
+    assert owner.handle("add_texts", (["No metadata here."], None)) == [chunk_id(None, "No metadata here.")]
+    assert len(index) == 6
+    assert VectorOwner(embedder, InMemoryVectorStore(embedding=embedder)).handle("lexical_search", ("x", 3)) == []
+
+
+if __name__ == "__main__":
+    test_tokenize_keeps_identifiers()
+    test_bm25_ranks_exact_terms_and_is_incremental()
+    test_reciprocal_rank_fusion()
+    test_hybrid_retrieve_finds_exact_terms()
+    test_index_is_loaded_from_a_persistent_collection()
+    test_owner_keeps_the_index_in_sync()
+    print("All hybrid retrieval checks passed.")
@@ -0,0 +1,89 @@
+"""Check stable chunk ids, skipped re-embedding and de-duplication of an existing collection.
+
+Run from the repo root:
+    python backend/tests/test_ingest_dedup.py
+"""
+
+import os
+import sys
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import FakeEmbeddings
+from langchain_core.vectorstores import InMemoryVectorStore
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from base.chunk_ids import chunk_id, dedupe_collection
+from base.search_rag import SearchRagManager
+
+PAGE = "\n\n".join(f"Paragraph {i} about Python decorators and closures." for i in range(6))
+
+
+class CountingEmbeddings(FakeEmbeddings):
+    embedded: int = 0
+
+    def embed_documents(self, texts):
+        self.embedded += len(texts)
+        return super().embed_documents(texts)
+
+
+def make_manager(embedder, vectorstore):
+    splitter = RecursiveCharacterTextSplitter(chunk_size=60, chunk_overlap=0)
+    return SearchRagManager(embedder=embedder, text_splitter=splitter, vectorstore=vectorstore)
+
+
+def test_pages_are_embedded_once():
+    embedder = CountingEmbeddings(size=8)
+    store = InMemoryVectorStore(embedding=embedder)
+    manager = make_manager(embedder, store)
+    manager.add_documents([Document(page_content=PAGE, metadata={"source": "https://a.example/decorators"})])
+    chunks = embedder.embedded
+    assert chunks == 6 and len(store.store) == 6
+    assert set(store.store) == {chunk_id("https://a.example/decorators", text) for text in PAGE.split("\n\n")}
+
+    manager.add_documents([Document(page_content=PAGE, metadata={"source": "https://a.example/decorators"})])
+    # A restarted process does not remember the page but finds its chunk ids in the store.
+    make_manager(embedder, store).add_documents([Document(page_content=PAGE, metadata={"source": "https://a.example/decorators"})])
+    assert embedder.embedded == chunks and len(store.store) == 6
+
+    # An edited page only embeds its new chunk; the same text elsewhere is a different chunk.
+    edited = PAGE + "\n\nA new paragraph about functools.wraps."
+    manager.add_documents([Document(page_content=edited, metadata={"source": "https://a.example/decorators"})])
+    assert embedder.embedded == chunks + 1
+    manager.add_documents([Document(page_content=PAGE, metadata={"source": "https://b.example/mirror"})])
+    assert embedder.embedded == 2 * chunks + 1 and len(store.store) == 13
+
+
+def test_dedupe_collection():
+    import chromadb
+
+    collection = chromadb.EphemeralClient().create_collection(f"dedupe-{uuid.uuid4().hex}", embedding_function=None)
+    texts = ["first chunk", "second chunk", "first chunk", "first chunk", "second chunk"]
+    ids = [uuid.uuid4().hex for _ in texts]
+    ids[3] = chunk_id("https://a.example", "first chunk")  # already at its stable id
+    collection.add(
+        ids=ids,
+        documents=texts,
+        metadatas=[{"source": "https://a.example"}] * len(texts),
+        embeddings=[[float(i), 1.0] for i in range(len(texts))],
+    )
+    assert dedupe_collection(collection, batch_size=2, dry_run=True)["duplicates"] == 3
+    assert collection.count() == 5
+
+    summary = dedupe_collection(collection, batch_size=2)
+    assert summary == {"records": 5, "unique": 2, "duplicates": 3, "rekeyed": 1}
+    remaining = collection.get(include=["documents", "embeddings"])
+    by_id = dict(zip(remaining["ids"], remaining["documents"]))
+    assert by_id == {
+        chunk_id("https://a.example", "first chunk"): "first chunk",
+        chunk_id("https://a.example", "second chunk"): "second chunk",
+    }
+    assert dedupe_collection(collection)["duplicates"] == 0
+
+
+if __name__ == "__main__":
+    test_pages_are_embedded_once()
+    test_dedupe_collection()
+    print("All ingestion de-duplication checks passed.")
@@ -0,0 +1,162 @@
+"""Check the durable job store: payload de-duplication, claiming, stale requeue and the attempt cap.
+
+Run from the repo root:
+    python backend/tests/test_jobs.py
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+from pydantic import BaseModel, ValidationError
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from server.jobs import FAILED, QUEUED, RUNNING, SUCCEEDED, JobQueue, JobStore, payload_hash
+
+
+def make_store():
+    return JobStore(os.path.join(tempfile.mkdtemp(), "jobs.sqlite3"))
+
+
+def go_stale(store, job_id):
+    # As if the worker's last heartbeat was long ago.
+    with store._lock:
+        store._conn.execute("UPDATE jobs SET heartbeat_at = ? WHERE id = ?", (time.time() - 3600, job_id))
+
+
+def test_same_payload_reattaches():
+    store = make_store()
+    assert payload_hash("p", {"a": 1, "b": 2}) == payload_hash("p", {"b": 2, "a": 1})
+    job, created = store.create_or_get("p", {"a": 1, "b": 2})
+    again, created_again = store.create_or_get("p", {"b": 2, "a": 1})
+    assert created and not created_again and again["id"] == job["id"]
+    assert store.create_or_get("other", {"a": 1, "b": 2})[1]
+    assert store.create_or_get("p", {"a": 2})[1]
+    forced, created = store.create_or_get("p", {"a": 1, "b": 2}, force=True)
+    assert created and forced["id"] != job["id"]
+
+
+def test_failed_job_is_not_reused():
+    store = make_store()
+    job, _ = store.create_or_get("p", {"x": 1})
+    store.finish(job["id"], error="boom")
+    failed = store.get(job["id"])
+    assert failed["status"] == FAILED and failed["error"] == "boom"
+    retry, created = store.create_or_get("p", {"x": 1})
+    assert created and retry["id"] != job["id"]
+
+
+def test_claim_lifecycle():
+    store = make_store()
+    first, _ = store.create_or_get("p", {"n": 1})
+    second, _ = store.create_or_get("p", {"n": 2})
+    store.create_or_get("unknown", {"n": 3})
+    claimed = store.claim_next(["p"])
+    assert claimed["id"] == first["id"] and claimed["status"] == RUNNING and claimed["attempts"] == 1
+    assert store.claim_next(["p"])["id"] == second["id"]
+    assert store.claim_next(["p"]) is None and store.claim_next([]) is None
+    store.finish(first["id"], result={"ok": True})
+    done = store.get(first["id"])
+    assert done["status"] == SUCCEEDED and done["result"] == {"ok": True} and done["finished_at"]
+    assert store.counts() == {SUCCEEDED: 1, RUNNING: 1, QUEUED: 1}
+
+
+def test_stale_jobs_are_requeued_until_the_attempt_cap():
+    store = make_store()
+    job, _ = store.create_or_get("p", {"crash": True})
+    for attempt in (1, 2):
+        assert store.claim_next(["p"])["attempts"] == attempt
+        store.heartbeat([job["id"]])
+        assert store.requeue_stale(60, max_attempts=3) == 0  # still heartbeating
+        go_stale(store, job["id"])
+        assert store.requeue_stale(60, max_attempts=3) == 1
+        assert store.get(job["id"])["status"] == QUEUED
+    assert store.claim_next(["p"])["attempts"] == 3
+    go_stale(store, job["id"])
+    assert store.requeue_stale(60, max_attempts=3) == 0
+    failed = store.get(job["id"])
+    assert failed["status"] == FAILED and "3 attempts" in failed["error"]
+    # The next submission starts over instead of reattaching to the failed job.
+    assert store.create_or_get("p", {"crash": True})[1]
+
+    # Without a cap a stale job is requeued however often it was claimed.
+    endless, _ = store.create_or_get("q", {})
+    for _ in range(5):
+        store.claim_next(["q"])
+        go_stale(store, endless["id"])
+        assert store.requeue_stale(60) == 1
+
+
+class DoubleRequest(BaseModel):
+    n: int
+
+
+def test_malformed_payload_is_rejected_before_queueing():
+    async def scenario():
+        queue = JobQueue(make_store())
+
+        async def double(payload):
+            return payload["n"] * 2
+
+        queue.register("double", double, DoubleRequest)
+        for malformed in ({}, {"n": "many"}, {"n": [1]}):
+            try:
+                await queue.submit("double", malformed)
+            except ValidationError as e:
+                assert e.errors()[0]["loc"] == ("n",)
+            else:
+                raise AssertionError(f"{malformed} is rejected")
+        assert queue.store.counts() == {}
+        # The stored payload is the normalised body, so equivalent bodies reattach.
+        job, created = await queue.submit("double", {"n": "21", "extra": True})
+        again, created_again = await queue.submit("double", {"n": 21})
+        assert created and not created_again and again["id"] == job["id"] and job["payload"] == {"n": 21}
+        try:
+            await queue.submit("triple", {"n": 1})
+        except KeyError:
+            pass
+        else:
+            raise AssertionError("unknown pipelines are rejected")
+
+    asyncio.run(scenario())
+
+
+def test_queue_runs_jobs_and_records_failures():
+    async def scenario():
+        queue = JobQueue(make_store(), concurrency=2, poll_interval_seconds=0.05)
+
+        async def double(payload):
+            if payload["n"] < 0:
+                raise ValueError("negative")
+            return payload["n"] * 2
+
+        queue.register("double", double)
+        queue.start()
+        try:
+            ok, _ = await queue.submit("double", {"n": 21})
+            bad, _ = await queue.submit("double", {"n": -1})
+            for _ in range(100):
+                jobs = [await queue.get(ok["id"]), await queue.get(bad["id"])]
+                if all(job["status"] in (SUCCEEDED, FAILED) for job in jobs):
+                    break
+                await asyncio.sleep(0.02)
+        finally:
+            await queue.stop()
+        assert jobs[0]["status"] == SUCCEEDED and jobs[0]["result"] == 42
+        assert jobs[1]["status"] == FAILED and jobs[1]["error"] == "negative"
+        assert (await queue.submit("double", {"n": 21}))[1] is False
+
+    asyncio.run(scenario())
+
+
+if __name__ == "__main__":
+    test_same_payload_reattaches()
+    test_failed_job_is_not_reused()
+    test_claim_lifecycle()
+    test_stale_jobs_are_requeued_until_the_attempt_cap()
+    test_malformed_payload_is_rejected_before_queueing()
+    test_queue_runs_jobs_and_records_failures()
+    print("All job queue checks passed.")
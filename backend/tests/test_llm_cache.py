@@ -0,0 +1,89 @@
+"""Check the tiered key/value cache and the LLM response cache rules.
+
+Run from the repo root:
+    python backend/tests/test_llm_cache.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from base.kv_cache import SQLiteCache, TieredCache
+from base.llm_cache import LLMResponseCache
+
+
+class FakeModel:
+
+    def __init__(self, model_name="gpt-4o", temperature=0):
+        self.model_name = model_name
+        self.temperature = temperature
+
+
+def test_disk_tier_survives_a_new_process():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cache.sqlite3")
+        TieredCache.create(disk_path=path).set("k", {"answer": 42})
+        cache = TieredCache.create(disk_path=path)
+        assert cache.get("k") == {"answer": 42}
+        assert cache.get("k") == {"answer": 42}
+        stats = cache.stats()
+        assert stats["disk_hits"] == 1 and stats["memory_hits"] == 1
+
+
+def test_entries_expire():
+    cache = TieredCache.create(ttl_seconds=0.05)
+    cache.set("k", "v")
+    assert cache.get("k") == "v"
+    time.sleep(0.1)
+    assert cache.get("k") is None
+
+
+def test_memory_tier_is_bounded():
+    cache = TieredCache.create(max_entries=2)
+    for key in "abc":
+        cache.set(key, key)
+    assert cache.get("a") is None
+    assert cache.get("c") == "c"
+
+
+def test_disk_tier_is_bounded_by_size():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = SQLiteCache(os.path.join(tmp, "cache.sqlite3"), max_bytes=10_000)
+        for i in range(4):
+            cache.set(f"k{i}", "x" * 2_000)
+            time.sleep(0.001)
+        cache.get("k0")  # read recently, so kept
+        time.sleep(0.001)
+        cache.set("k4", "x" * 2_000)
+        assert len(cache) == 4
+        assert cache.get("k0") is not None and cache.get("k4") is not None
+        assert cache.get("k1") is None
+
+
+def test_only_deterministic_calls_are_cached():
+    cache = LLMResponseCache(enabled=True, agents={"AITutorChatbot": False})
+    prompt = {"messages": [{"role": "user", "content": "hi"}]}
+    key = cache.lookup_key("SkillGapIdentifier", FakeModel(), "system", prompt)
+    assert key is not None
+    assert key != cache.lookup_key("SkillGapIdentifier", FakeModel("gpt-4o-mini"), "system", prompt)
+    assert cache.lookup_key("SkillGapIdentifier", FakeModel(temperature=0.7), "system", prompt) is None
+    assert cache.lookup_key("SkillGapIdentifier", FakeModel(), "system", prompt, tools=[object()]) is None
+    assert cache.lookup_key("AITutorChatbot", FakeModel(), "system", prompt) is None
+
+    assert cache.get("SkillGapIdentifier", key) is None
+    cache.set(key, '{"skill_gaps": []}')
+    assert cache.get("SkillGapIdentifier", key) == '{"skill_gaps": []}'
+    counts = cache.stats()["by_agent"]["SkillGapIdentifier"]
+    assert counts == {"hits": 1, "misses": 1, "bypassed": 2}
+
+
+if __name__ == "__main__":
+    test_disk_tier_survives_a_new_process()
+    test_entries_expire()
+    test_memory_tier_is_bounded()
+    test_disk_tier_is_bounded_by_size()
+    test_only_deterministic_calls_are_cached()
+    print("All LLM cache checks passed.")
@@ -0,0 +1,93 @@
+"""Check that shared LLM clients are reused, evicted by size and idleness, and unregistered from the rate limiter.
+
+Run from the repo root:
+    python backend/tests/test_llm_registry.py
+"""
+
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import base.llm_registry as llm_registry
+from base.llm_registry import LLMClientRegistry
+from base.rate_limiter import llm_rate_limiter
+
+
+class FakeChatModel:
+
+    def __init__(self, model=None, model_provider=None, temperature=0, base_url=None, **kwargs):
+        self.model_name = model
+        self.temperature = temperature
+        self.base_url = base_url
+        self.kwargs = kwargs
+
+
+@contextmanager
+def fake_factory():
+    created = []
+
+    def create(**kwargs):
+        created.append(FakeChatModel(**kwargs))
+        return created[-1]
+
+    original = llm_registry.LLMFactory.create
+    llm_registry.LLMFactory.create = staticmethod(create)
+    try:
+        yield created
+    finally:
+        llm_registry.LLMFactory.create = original
+
+
+def registered(client):
+    return id(client) in llm_rate_limiter._models
+
+
+def test_same_key_shares_one_client():
+    with fake_factory() as created:
+        registry = LLMClientRegistry(max_clients=8)
+        client = registry.get(model="m", model_provider="fake", temperature=0)
+        assert registry.get(model="m", model_provider="fake", temperature=0.0) is client
+        assert registry.get(model="m", model_provider="fake", temperature=0.7) is not client
+        assert registry.get(model="m", model_provider="fake", base_url="http://other") is not client
+        assert registry.get(model="m", model_provider="fake", max_tokens=10) is not client
+        assert len(created) == 4 and registered(client)
+        stats = registry.stats()
+        assert len(stats["clients"]) == 4 and stats["clients"][0]["hits"] == 2
+        registry.clear()
+        assert not any(registered(c) for c in created)
+
+
+def test_least_recently_used_client_is_evicted():
+    with fake_factory() as created:
+        registry = LLMClientRegistry(max_clients=2)
+        first = registry.get(model="a", model_provider="fake")
+        second = registry.get(model="b", model_provider="fake")
+        registry.get(model="a", model_provider="fake")  # "b" is now the least recently used
+        registry.get(model="c", model_provider="fake")
+        assert registry.get(model="a", model_provider="fake") is first
+        assert not registered(second) and registered(first)
+        assert registry.get(model="b", model_provider="fake") is not second
+        assert len(created) == 4 and registry.stats()["evictions"] == 2
+        registry.clear()
+
+
+def test_idle_clients_expire():
+    with fake_factory() as created:
+        registry = LLMClientRegistry(max_clients=8, idle_ttl_seconds=0.05)
+        idle = registry.get(model="a", model_provider="fake")
+        time.sleep(0.1)
+        fresh = registry.get(model="b", model_provider="fake")
+        assert [client["model_name"] for client in registry.stats()["clients"]] == ["b"]
+        assert not registered(idle) and registered(fresh)
+        assert registry.get(model="a", model_provider="fake") is not idle and len(created) == 3
+        registry.clear()
+
+
+if __name__ == "__main__":
+    test_same_key_shares_one_client()
+    test_least_recently_used_client_is_evicted()
+    test_idle_clients_expire()
+    print("All LLM client registry checks passed.")
@@ -0,0 +1,97 @@
+"""Check the embedding micro-batcher, sentence-transformers style pooling and int8 model lookup.
+
+Run from the repo root:
+    python backend/tests/test_onnx_embedder.py
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import numpy as np
+
+from base.onnx_embedder import MicroBatcher, OnnxEmbeddings, pool
+
+
+def test_concurrent_requests_share_forward_passes():
+    passes = []
+
+    def encode(texts):
+        passes.append(list(texts))
+        time.sleep(0.01)
+        return [[float(len(text)), 1.0] for text in texts]
+
+    batcher = MicroBatcher(encode, max_batch_size=16, max_wait_ms=20)
+    results = {}
+
+    def call(i):
+        results[i] = batcher.submit(["x" * i, "y" * (i + 1)])
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(12)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    batcher.close()
+    # Every caller gets its own vectors, in order.
+    assert all(results[i] == [[float(i), 1.0], [float(i + 1), 1.0]] for i in range(12))
+    assert len(passes) < 12 and max(len(texts) for texts in passes) <= 16
+    assert batcher.stats()["texts"] == 24
+
+
+def test_errors_reach_every_caller_in_the_batch():
+    def encode(texts):
+        raise RuntimeError("model failed")
+
+    batcher = MicroBatcher(encode, max_wait_ms=0)
+    try:
+        batcher.submit(["text"])
+    except RuntimeError as e:
+        assert str(e) == "model failed"
+    else:
+        raise AssertionError("the encode error was swallowed")
+    batcher.close()
+
+
+def test_mean_pooling_ignores_padding():
+    tokens = np.array([[[1.0, 0.0], [3.0, 0.0], [100.0, 100.0]]])
+    mask = np.array([[1, 1, 0]])
+    assert np.allclose(pool(tokens, mask, normalize=False), [[2.0, 0.0]])
+    assert np.allclose(pool(tokens, mask), [[1.0, 0.0]])
+    assert np.allclose(pool(tokens, mask, mode="cls", normalize=False), [[1.0, 0.0]])
+
+
+def test_missing_onnx_package_is_reported():
+    model_dir = tempfile.mkdtemp()
+    os.makedirs(os.path.join(model_dir, "onnx"))
+    for name in ("model.onnx", "model_qint8.onnx"):
+        open(os.path.join(model_dir, "onnx", name), "wb").close()
+    assert OnnxEmbeddings._model_path(model_dir, "onnx/model.onnx", None).endswith("onnx/model.onnx")
+    assert OnnxEmbeddings._model_path(model_dir, "onnx/model.onnx", "onnx/model_qint8.onnx").endswith("model_qint8.onnx")
+
+    # No int8 export, and quantising locally cannot import (as without the ``onnx`` package).
+    saved = sys.modules.get("onnxruntime.quantization")
+    sys.modules["onnxruntime.quantization"] = None
+    try:
+        OnnxEmbeddings._model_path(model_dir, "onnx/model.onnx", "onnx/model_quint8_avx2.onnx")
+    except ImportError as e:
+        assert "'onnx' package" in str(e) and "onnx/model_quint8_avx2.onnx" in str(e)
+    else:
+        raise AssertionError("a missing onnx package is reported")
+    finally:
+        if saved is None:
+            sys.modules.pop("onnxruntime.quantization", None)
+        else:
+            sys.modules["onnxruntime.quantization"] = saved
+
+
+if __name__ == "__main__":
+    test_concurrent_requests_share_forward_passes()
+    test_errors_reach_every_caller_in_the_batch()
+    test_mean_pooling_ignores_padding()
+    test_missing_onnx_package_is_reported()
+    print("All ONNX embedder checks passed.")
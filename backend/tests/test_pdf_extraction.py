@@ -0,0 +1,107 @@
+"""Check parallel page extraction, its ordering, the content-hash cache and the limits.
+
+Run from the repo root:
+    python backend/tests/test_pdf_extraction.py
+"""
+
+import asyncio
+import io
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from server.pdf_extraction import PDFExtractor, PDFLimitExceeded
+
+
+def make_pdf(page_texts):
+    """A minimal PDF with one line of Helvetica text per page."""
+    count = len(page_texts)
+    font_id = 3 + 2 * count
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [" + b" ".join(b"%d 0 R" % (3 + 2 * i) for i in range(count)) + b"] /Count %d >>" % count,
+    ]
+    for i, text in enumerate(page_texts):
+        stream = b"BT /F1 12 Tf 72 720 Td (" + text.encode("latin-1") + b") Tj ET"
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents %d 0 R "
+                       b"/Resources << /Font << /F1 %d 0 R >> >> >>" % (4 + 2 * i, font_id))
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+class Upload:
+    """Stands in for FastAPI's UploadFile: only ``async read(size)`` is used."""
+
+    def __init__(self, data):
+        self.buffer = io.BytesIO(data)
+
+    async def read(self, size=-1):
+        return self.buffer.read(size)
+
+
+def make_extractor(**overrides):
+    options = {"pages_per_task": 3, "max_processes": 2, "cache": {"disk_path": None}}
+    options.update(overrides)
+    return PDFExtractor(**options)
+
+
+def test_pages_stream_in_order_and_are_cached():
+    texts = [f"Page number {i}" for i in range(1, 11)]
+    pdf = make_pdf(texts)
+    extractor = make_extractor()
+
+    async def scenario():
+        events = [event async for event in extractor.iter_pages(Upload(pdf))]
+        again = await extractor.extract(Upload(pdf))
+        return events, again
+
+    try:
+        events, again = asyncio.run(scenario())
+    finally:
+        extractor.shutdown()
+    assert events[0]["event"] == "meta" and events[0]["pages"] == 10 and not events[0]["cached"]
+    pages = [event for event in events if event["event"] == "page"]
+    assert [event["page"] for event in pages] == list(range(1, 11))
+    assert [event["text"].strip() for event in pages] == texts
+    assert events[-1] == {"event": "done", "pages": 10, "sha256": events[0]["sha256"]}
+    assert again["cached"] and again["pages"] == 10
+    assert again["text"].split("\n") == [event["text"] for event in pages]
+    assert extractor.stats()["documents"] == 1
+
+
+def test_limits():
+    pdf = make_pdf(["one", "two", "three"])
+    extractor = make_extractor(max_pages=2)
+
+    async def extract(target, data):
+        try:
+            await target.extract(Upload(data))
+        except PDFLimitExceeded:
+            return True
+        return False
+
+    try:
+        assert asyncio.run(extract(extractor, pdf))
+        assert asyncio.run(extract(make_extractor(max_bytes=len(pdf) - 1), pdf))
+    finally:
+        extractor.shutdown()
+    assert extractor.stats()["rejected"] == 1
+
+
+if __name__ == "__main__":
+    test_pages_stream_in_order_and_are_cached()
+    test_limits()
+    print("All PDF extraction checks passed.")
@@ -0,0 +1,94 @@
+"""Check token-bucket pacing, per-provider limits and 429 backoff.
+
+Run from the repo root:
+    python backend/tests/test_rate_limiter.py
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from base.rate_limiter import LLMRateLimiter, TokenBucket
+
+
+class FakeModel:
+
+    def __init__(self, model_name="gpt-4o"):
+        self.model_name = model_name
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+def test_bucket_makes_callers_queue():
+    bucket = TokenBucket(per_minute=60)  # one per second, burst of 60
+    now = time.monotonic()
+    assert bucket.reserve(60, now) == 0.0
+    assert abs(bucket.reserve(1, now) - 1.0) < 1e-6
+    assert abs(bucket.reserve(1, now) - 2.0) < 1e-6
+
+
+def test_provider_and_model_overrides():
+    limiter = LLMRateLimiter(
+        enabled=True,
+        default={"requests_per_minute": 100, "tokens_per_minute": 1000, "max_concurrent": 4},
+        providers={"ollama": {"requests_per_minute": None, "tokens_per_minute": None}, "openai/gpt-4o-mini": {"max_concurrent": 1}},
+    )
+    local, mini = FakeModel("llama3"), FakeModel("gpt-4o-mini")
+    limiter.register_model(local, "ollama", "llama3")
+    limiter.register_model(mini, "openai", "gpt-4o-mini")
+    assert limiter.limiter_for(local).requests is None
+    assert limiter.limiter_for(local).max_concurrent == 4
+    assert limiter.limiter_for(mini).max_concurrent == 1
+    assert limiter.limiter_for(mini).requests.per_minute == 100
+
+
+def test_429_is_retried_after_backoff():
+    limiter = LLMRateLimiter(enabled=True, max_retries=2, backoff_base_seconds=0.05, default={})
+    model = FakeModel()
+    limiter.register_model(model, "openai", "gpt-4o")
+    attempts = []
+
+    def flaky():
+        attempts.append(time.monotonic())
+        if len(attempts) < 3:
+            raise RateLimitError("slow down")
+        return "ok"
+
+    assert limiter.call(model, 10, flaky) == "ok"
+    assert attempts[1] - attempts[0] >= 0.05
+    assert attempts[2] - attempts[1] >= 0.1
+    stats = limiter.stats()["models"][0]
+    assert stats["rate_limited"] == 2 and stats["calls"] == 1
+    assert stats["rate_factor"] < 1.0
+
+
+def test_concurrency_cap_applies_to_async_calls():
+    limiter = LLMRateLimiter(enabled=True, default={"max_concurrent": 2})
+    model = FakeModel()
+    peak = current = 0
+
+    async def call():
+        nonlocal peak, current
+        current += 1
+        peak = max(peak, current)
+        await asyncio.sleep(0.02)
+        current -= 1
+
+    async def scenario():
+        await asyncio.gather(*(limiter.acall(model, 10, call) for _ in range(6)))
+
+    asyncio.run(scenario())
+    assert peak == 2
+
+
+if __name__ == "__main__":
+    test_bucket_makes_callers_queue()
+    test_provider_and_model_overrides()
+    test_429_is_retried_after_backoff()
+    test_concurrency_cap_applies_to_async_calls()
+    print("All rate limiter checks passed.")
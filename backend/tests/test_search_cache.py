@@ -0,0 +1,78 @@
+"""Check search result caching by normalised query.
+
+Run from the repo root:
+    python backend/tests/test_search_cache.py
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from base.search_cache import SearchResultCache, normalize_query
+from base.searcher_factory import SearchRunner
+
+
+class FakeSearcher:
+
+    def __init__(self):
+        self.queries = []
+
+    def results(self, query, max_results):
+        self.queries.append(query)
+        if "nothing" in query:
+            return []
+        return [{"title": f"About {query}", "snippet": query}][:max_results]
+
+
+def test_normalize_query():
+    assert normalize_query("  Introduction to\tPython   Decorators ") == "introduction python decorators"
+    assert normalize_query("What is the GIL?") == "gil?"
+    assert normalize_query("What is this") == "what is this"
+    assert normalize_query("The Who") == "who"
+    assert normalize_query("not a number") == "not number"
+
+
+def test_acronyms_are_not_stopwords():
+    # Each of these would otherwise share a cache entry with the query after the arrow.
+    for query, other in [
+        ("IT project management", "project management"),
+        ("WHO guidelines on nutrition", "guidelines on nutrition"),
+        ("CAN bus basics", "bus basics"),
+        ("May Day history", "day history"),
+    ]:
+        assert normalize_query(query) != normalize_query(other)
+    assert normalize_query("Who is it for?") == "who it for?"
+
+
+def test_provider_is_called_once_per_normalised_query():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "search.sqlite3")
+        searcher = FakeSearcher()
+        runner = SearchRunner(searcher, cache=SearchResultCache(enabled=True, disk_path=path))
+        first = runner.invoke("Introduction to Python Decorators")
+        second = runner.invoke("introduction  python decorators")
+        assert searcher.queries == ["Introduction to Python Decorators"]
+        assert [r.title for r in second] == [r.title for r in first]
+
+        runner.invoke("nothing here")
+        runner.invoke("nothing here")
+        assert searcher.queries[1:] == ["nothing here", "nothing here"]
+
+        # Results depend on the number requested, and the disk tier outlives the process.
+        SearchRunner(searcher, max_search_results=3, cache=SearchResultCache(enabled=True, disk_path=path)).invoke(
+            "introduction python decorators"
+        )
+        assert len(searcher.queries) == 4
+        other = SearchRunner(FakeSearcher(), cache=SearchResultCache(enabled=True, disk_path=path))
+        other.invoke("Introduction to Python decorators")
+        assert other.searcher.queries == []
+        assert other.stats()["cache"]["disk_hits"] == 1
+
+
+if __name__ == "__main__":
+    test_normalize_query()
+    test_acronyms_are_not_stopwords()
+    test_provider_is_called_once_per_normalised_query()
+    print("All search cache checks passed.")
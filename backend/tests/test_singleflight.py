@@ -0,0 +1,89 @@
+"""Verify that concurrent identical calls share one computation.
+
+Run from the repo root:
+    python backend/tests/test_singleflight.py
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from server.singleflight import SingleFlight
+
+
+def test_key_ignores_dict_order():
+    a = SingleFlight.make_key("draft", {"x": 1, "y": [1, 2]}, ("openai", "gpt-4o"))
+    b = SingleFlight.make_key("draft", {"y": [1, 2], "x": 1}, ("openai", "gpt-4o"))
+    c = SingleFlight.make_key("draft", {"x": 1, "y": [1, 2]}, ("openai", "gpt-4o-mini"))
+    assert a == b
+    assert a != c
+
+
+def test_concurrent_duplicates_are_coalesced():
+    async def scenario():
+        flight = SingleFlight()
+        calls = 0
+
+        async def pipeline():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return {"skill_gaps": []}
+
+        key = SingleFlight.make_key("identify", {"goal": "ml"})
+        results = await asyncio.gather(*(flight.do("identify", key, pipeline) for _ in range(3)))
+        # Once finished, the next identical call runs again.
+        await flight.do("identify", key, pipeline)
+        return calls, results, flight.stats()
+
+    calls, results, stats = asyncio.run(scenario())
+    assert calls == 2
+    assert all(result == {"skill_gaps": []} for result in results)
+    assert stats["executed"] == 2
+    assert stats["saved_calls"] == 2
+    assert stats["in_flight"] == 0
+
+
+def test_errors_reach_every_waiter_and_are_not_cached():
+    async def scenario():
+        flight = SingleFlight()
+
+        async def failing():
+            await asyncio.sleep(0.01)
+            raise ValueError("provider error")
+
+        key = SingleFlight.make_key("draft", {})
+        results = await asyncio.gather(*(flight.do("draft", key, failing) for _ in range(2)), return_exceptions=True)
+        return results, flight.stats()
+
+    results, stats = asyncio.run(scenario())
+    assert all(isinstance(result, ValueError) for result in results)
+    assert stats["in_flight"] == 0
+
+
+def test_cancelled_caller_does_not_cancel_others():
+    async def scenario():
+        flight = SingleFlight()
+
+        async def pipeline():
+            await asyncio.sleep(0.05)
+            return "done"
+
+        key = SingleFlight.make_key("draft", {})
+        first = asyncio.ensure_future(flight.do("draft", key, pipeline))
+        second = asyncio.ensure_future(flight.do("draft", key, pipeline))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(scenario()) == "done"
+
+
+if __name__ == "__main__":
+    test_key_ignores_dict_order()
+    test_concurrent_duplicates_are_coalesced()
+    test_errors_reach_every_waiter_and_are_not_cached()
+    test_cancelled_caller_does_not_cancel_others()
+    print("All single-flight checks passed.")
@@ -0,0 +1,76 @@
+"""Check lazy creation of the RAG components and background warm-up readiness.
+
+Run from the repo root:
+    python backend/tests/test_startup.py
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from langchain_core.embeddings import FakeEmbeddings
+from langchain_core.vectorstores import InMemoryVectorStore
+
+from base.search_rag import SearchRagManager
+from server.warmup import Warmup
+
+
+def test_components_are_created_on_first_use():
+    created = []
+
+    def create_embedder():
+        created.append("embedder")
+        return FakeEmbeddings(size=8)
+
+    def create_vectorstore(embedder):
+        created.append("vectorstore")
+        return InMemoryVectorStore(embedding=embedder)
+
+    manager = SearchRagManager(embedder_factory=create_embedder, vectorstore_factory=create_vectorstore)
+    assert created == [] and not manager.initialized
+    manager.retrieve("anything", k=1)
+    assert created == ["embedder", "vectorstore"] and manager.initialized
+    manager.warm_up()
+    assert created == ["embedder", "vectorstore"]
+
+
+def test_warmup_retries_until_ready():
+    async def scenario():
+        warmup = Warmup(retry_seconds=0.01)
+        attempts = []
+
+        def flaky():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise OSError("model download interrupted")
+
+        warmup.add("search_rag", flaky)
+        warmup.add("llm_client", lambda: None, required=False)
+        warmup.start()
+        assert not warmup.ready
+        for _ in range(100):
+            if warmup.ready:
+                break
+            await asyncio.sleep(0.01)
+        await warmup.stop()
+        return warmup.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["ready"]
+    assert stats["steps"]["search_rag"]["attempts"] == 3
+    assert stats["steps"]["search_rag"]["error"] is None
+
+
+def test_disabled_warmup_is_ready():
+    warmup = Warmup(enabled=False)
+    warmup.add("search_rag", lambda: None)
+    assert warmup.ready
+
+
+if __name__ == "__main__":
+    test_components_are_created_on_first_use()
+    test_warmup_retries_until_ready()
+    test_disabled_warmup_is_ready()
+    print("All startup checks passed.")
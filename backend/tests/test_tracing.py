@@ -0,0 +1,79 @@
+"""Check span nesting across thread pools and the OTLP/JSON file exporter.
+
+Run from the repo root:
+    python backend/tests/test_tracing.py
+"""
+
+import json
+import os
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from base.tracing import OTLPJsonFileSpanExporter, span, with_current_context
+
+memory_exporter = InMemorySpanExporter()
+provider = TracerProvider()
+provider.add_span_processor(SimpleSpanProcessor(memory_exporter))
+trace.set_tracer_provider(provider)
+
+
+def test_context_follows_work_into_threads():
+    memory_exporter.clear()
+
+    def child(i):
+        with span("child", index=i, skipped=None):
+            pass
+
+    with span("parent") as parent:
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            list(pool.map(with_current_context(child), range(3)))
+    children = [s for s in memory_exporter.get_finished_spans() if s.name == "child"]
+    assert len(children) == 3
+    for s in children:
+        assert s.parent.span_id == parent.get_span_context().span_id
+        assert "skipped" not in s.attributes
+
+
+def test_exception_is_recorded():
+    memory_exporter.clear()
+    try:
+        with span("failing"):
+            raise ValueError("boom")
+    except ValueError:
+        pass
+    (failed,) = memory_exporter.get_finished_spans()
+    assert not failed.status.is_ok
+    assert failed.events[0].name == "exception"
+
+
+def test_otlp_json_file_exporter():
+    memory_exporter.clear()
+    with span("outer", **{"genmentor.texts": 2}):
+        with span("inner"):
+            pass
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "traces", "spans.jsonl")
+        exporter = OTLPJsonFileSpanExporter(path)
+        exporter.export(memory_exporter.get_finished_spans())
+        exporter.shutdown()
+        with open(path, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    assert len(lines) == 1
+    request = json.loads(lines[0])
+    spans = request["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert sorted(s["name"] for s in spans) == ["inner", "outer"]
+
+
+if __name__ == "__main__":
+    test_context_follows_work_into_threads()
+    test_exception_is_recorded()
+    test_otlp_json_file_exporter()
+    print("All tracing checks passed.")
@@ -0,0 +1,80 @@
+"""Check that workers reach the embedding model and vector store through the owner process.
+
+Run from the repo root:
+    python backend/tests/test_vector_owner.py
+"""
+
+import os
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import InMemoryVectorStore
+
+from base.vector_owner import RemoteEmbeddings, RemoteVectorStore, VectorOwner, VectorOwnerClient, VectorOwnerError
+
+
+class KeywordEmbeddings(Embeddings):
+    """Counts a few keywords; enough for similarity search to be deterministic."""
+
+    words = ("python", "rust", "graph", "vector")
+
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text):
+        return [float(text.lower().count(word)) + 0.01 for word in self.words]
+
+
+def start_owner():
+    # The listener thread lives until exit and unlinks its socket then, so the directory is kept.
+    address = os.path.join(tempfile.mkdtemp(), "owner.sock")
+    authkey = b"test-key"
+    embedder = KeywordEmbeddings()
+    owner = VectorOwner(embedder, InMemoryVectorStore(embedding=embedder))
+    threading.Thread(target=owner.serve_forever, args=(address, authkey), daemon=True).start()
+    return owner, VectorOwnerClient(address, authkey, connect_timeout_seconds=5)
+
+
+def test_remote_store_round_trip():
+    owner, client = start_owner()
+    assert client.ping()
+    store = RemoteVectorStore(client, embedding=RemoteEmbeddings(client))
+    store.add_documents([
+        Document(page_content="Python generators", metadata={"source": "a"}),
+        Document(page_content="Rust ownership", metadata={"source": "b"}),
+    ])
+    hits = store.similarity_search("python", k=1)
+    assert [doc.metadata["source"] for doc in hits] == ["a"]
+    assert store.embeddings.embed_query("graph graph") == KeywordEmbeddings().embed_query("graph graph")
+    stats = client.stats()
+    assert stats["requests"]["add_documents"] == 1 and stats["requests"]["similarity_search"] == 1
+    client.close()
+
+
+def test_concurrent_callers_and_errors():
+    owner, client = start_owner()
+    store = RemoteVectorStore(client)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(lambda i: store.add_texts([f"vector note {i}"], [{"i": i}]), range(20)))
+    assert len(store.similarity_search("vector", k=50)) == 20
+    assert owner.stats()["requests"]["add_texts"] == 20
+    try:
+        client.call("drop_everything")
+        raised = False
+    except VectorOwnerError:
+        raised = True
+    assert raised
+    assert owner.stats()["errors"] == {"drop_everything": 1}
+    client.close()
+
+
+if __name__ == "__main__":
+    test_remote_store_round_trip()
+    test_concurrent_callers_and_errors()
+    print("All vector owner checks passed.")
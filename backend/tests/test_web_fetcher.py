@@ -0,0 +1,161 @@
+"""Check concurrent page fetching: URL alignment, the batch deadline, the size cap and the per-host cap.
+
+Run from the repo root:
+    python backend/tests/test_web_fetcher.py
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from base.page_cache import normalize_url
+from base.web_fetcher import WebPageFetcher
+
+
+class Handler(BaseHTTPRequestHandler):
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+    versioned = {"200": 0, "304": 0}
+
+    def log_message(self, *args):
+        pass
+
+    def reply(self, body, content_type="text/html; charset=utf-8", status=200, headers=()):
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the fetcher stops reading truncated pages
+
+    def do_GET(self):
+        if self.path.startswith("/page/"):
+            name = self.path.rsplit("/", 1)[-1]
+            self.reply(f'<html lang="en"><head><title>Page {name}</title></head><body>Body {name}</body></html>'.encode())
+        elif self.path == "/slow":
+            time.sleep(2)
+            self.reply(b"<html><body>late</body></html>")
+        elif self.path == "/big":
+            self.reply(b"<html><body>" + b"x" * 100_000 + b"</body></html>")
+        elif self.path == "/file.pdf":
+            self.reply(b"%PDF-1.4", content_type="application/pdf")
+        elif self.path.startswith("/versioned"):
+            if self.headers.get("If-None-Match") == '"v1"':
+                Handler.versioned["304"] += 1
+                self.reply(b"", status=304, headers=[("ETag", '"v1"')])
+            else:
+                Handler.versioned["200"] += 1
+                self.reply(b"<html><head><title>Versioned</title></head><body>v1</body></html>", headers=[("ETag", '"v1"')])
+        elif self.path.startswith("/hold/"):
+            with Handler.lock:
+                Handler.active += 1
+                Handler.peak = max(Handler.peak, Handler.active)
+            time.sleep(0.2)
+            with Handler.lock:
+                Handler.active -= 1
+            self.reply(b"<html><body>held</body></html>")
+        else:
+            self.reply(b"not found", status=404)
+
+
+def serve():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def test_results_stay_aligned_with_urls():
+    server, base = serve()
+    fetcher = WebPageFetcher()
+    fetcher.configure(deadline_seconds=1, max_bytes=10_000)
+    try:
+        urls = [f"{base}/page/b", f"{base}/missing", f"{base}/slow", f"{base}/page/a",
+                f"{base}/file.pdf", f"{base}/big", f"{base}/page/b"]
+        started = time.monotonic()
+        documents = fetcher.fetch_many(urls)
+        elapsed = time.monotonic() - started
+    finally:
+        fetcher.close()
+        server.shutdown()
+    assert len(documents) == len(urls)
+    assert documents[0].metadata["title"] == "Page b" and documents[0].page_content == "Page bBody b"
+    assert documents[0].metadata["source"] == urls[0] and documents[0].metadata["language"] == "en"
+    assert documents[1] is None and documents[2] is None and documents[4] is None
+    assert documents[3].metadata["title"] == "Page a"
+    assert documents[5].metadata["truncated"] and len(documents[5].page_content) < 10_000
+    assert documents[6] is documents[0]
+    # The slow page is dropped at the deadline instead of holding up the batch.
+    assert elapsed < 1.8
+    outcomes = fetcher.stats()["outcomes"]
+    assert outcomes == {"requested": 6, "loaded": 3, "failed": 1, "timed_out": 1, "unsupported": 1, "truncated": 1}
+
+
+def test_per_host_cap():
+    server, base = serve()
+    fetcher = WebPageFetcher()
+    fetcher.configure(per_host=2, deadline_seconds=10)
+    try:
+        documents = fetcher.fetch_many([f"{base}/hold/{i}" for i in range(6)])
+    finally:
+        fetcher.close()
+        server.shutdown()
+    assert all(document is not None for document in documents)
+    assert Handler.peak == 2
+
+
+def test_normalize_url():
+    assert normalize_url("HTTPS://Docs.Python.org:443/3/?b=2&utm_source=x&a=1#intro") == "https://docs.python.org/3/?a=1&b=2"
+    assert normalize_url("http://example.com") == "http://example.com/"
+    assert normalize_url("http://example.com:8080/a?fbclid=1") == "http://example.com:8080/a"
+
+
+def test_pages_are_cached_and_revalidated():
+    server, base = serve()
+    tmp = tempfile.mkdtemp()
+    cache = {"fresh_seconds": 60, "disk_path": os.path.join(tmp, "pages.sqlite3")}
+    fetcher = WebPageFetcher()
+    fetcher.configure(cache=cache)
+    try:
+        first = fetcher.fetch_many([f"{base}/versioned?utm_source=search"])[0]
+        first.metadata["source_type"] = "web_search"
+        second = fetcher.fetch_many([f"{base}/versioned#top"])[0]
+        assert Handler.versioned == {"200": 1, "304": 0}
+        assert second.page_content == first.page_content and second.metadata["title"] == "Versioned"
+        assert second.metadata["source"] == f"{base}/versioned#top" and "source_type" not in second.metadata
+
+        fetcher.page_cache.fresh_seconds = 0
+        third = fetcher.fetch_many([f"{base}/versioned"])[0]
+        assert Handler.versioned == {"200": 1, "304": 1}
+        assert third.page_content == first.page_content
+        stats = fetcher.stats()
+        assert stats["outcomes"]["cached"] == 1 and stats["outcomes"]["revalidated"] == 1
+        assert stats["cache"]["hits"] == 1 and stats["cache"]["revalidated"] == 1 and stats["cache"]["misses"] == 1
+
+        # Another process (a fresh fetcher) finds the page on disk.
+        other = WebPageFetcher()
+        other.configure(cache=cache)
+        assert other.fetch_many([f"{base}/versioned"])[0].page_content == first.page_content
+        assert other.stats()["cache"]["disk_hits"] == 1 and Handler.versioned["200"] == 1
+        other.close()
+    finally:
+        fetcher.close()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    test_results_stay_aligned_with_urls()
+    test_per_host_cap()
+    test_normalize_url()
+    test_pages_are_cached_and_revalidated()
+    print("All web fetcher checks passed.")
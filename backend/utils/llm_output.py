@@ -64,3 +64,46 @@ def preprocess_response(response, only_text=True, exclude_think=False, json_outp
             raise e
     return response
 
+
+class ThinkTagFilter:
+    """Drop ``<think>...</think>`` spans from a stream of text chunks.
+
+    Tags may be split across chunks, so a trailing fragment that could still
+    turn into a tag is held back until the next chunk arrives.
+    """
+
+    OPEN, CLOSE = "<think>", "</think>"
+
+    def __init__(self):
+        self._buffer = ""
+        self._inside = False
+
+    def feed(self, text):
+        self._buffer += text
+        out = []
+        while self._buffer:
+            tag = self.CLOSE if self._inside else self.OPEN
+            idx = self._buffer.find(tag)
+            if idx != -1:
+                if not self._inside:
+                    out.append(self._buffer[:idx])
+                self._buffer = self._buffer[idx + len(tag):]
+                self._inside = not self._inside
+                continue
+            keep = self._partial_tag_length(self._buffer, tag)
+            if not self._inside:
+                out.append(self._buffer[:len(self._buffer) - keep])
+            self._buffer = self._buffer[len(self._buffer) - keep:]
+            break
+        return "".join(out)
+
+    def flush(self):
+        rest, self._buffer = ("" if self._inside else self._buffer), ""
+        return rest
+
+    @staticmethod
+    def _partial_tag_length(text, tag):
+        for size in range(min(len(tag) - 1, len(text)), 0, -1):
+            if text.endswith(tag[:size]):
+                return size
+        return 0
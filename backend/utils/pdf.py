@@ -0,0 +1,24 @@
+"""Page-level PDF text extraction, run in worker processes by ``server.pdf_extraction``.
+
+Only depends on pdfplumber so that a freshly spawned worker starts quickly.
+"""
+
+from typing import List
+
+import pdfplumber
+
+
+def count_pages(path: str) -> int:
+    with pdfplumber.open(path) as pdf:
+        return len(pdf.pages)
+
+
+def extract_pages(path: str, start: int, end: int) -> List[str]:
+    """Text of pages ``start`` to ``end - 1`` (0-based); a page without text gives ``""``."""
+    texts = []
+    with pdfplumber.open(path) as pdf:
+        for page in pdf.pages[start:end]:
+            texts.append(page.extract_text() or "")
+            # Drops the page's parsed layout; long documents otherwise keep every page in memory.
+            page.close()
+    return texts
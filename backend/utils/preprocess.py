@@ -10,10 +10,7 @@ import hashlib
 def extract_text_from_pdf(file_path):
     assert file_path.endswith('.pdf'), "Invalid file format. Please provide a PDF file."
     with pdfplumber.open(file_path) as pdf:
-        text = ""
-        for page in pdf.pages:
-            text += page.extract_text()
-        return text
+        return "".join(page.extract_text() or "" for page in pdf.pages)
 
 def save_json(file_path, data):
     base_dir = os.path.dirname(os.path.abspath(__file__))
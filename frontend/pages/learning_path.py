@@ -8,7 +8,9 @@ from utils.request_api import (
     simulate_path_feedback,
     refine_learning_path_with_feedback,
     iterative_refine_learning_path,
+    stream_learning_path_content,
 )
+from config import use_mock_data, use_search
 from components.navigation import render_navigation
 from utils.state import save_persistent_state
 
@@ -219,6 +221,7 @@ def render_learning_sessions(goal):
                     pass
                 st.toast("🎉 Successfully re-schedule learning path!")
                 st.rerun()
+    render_batch_preparation(goal)
     save_persistent_state()
     columns_spec = 2
     num_columns = math.ceil(len(goal["learning_path"]) / columns_spec)  
@@ -267,4 +270,54 @@ def render_learning_sessions(goal):
                             st.switch_page("pages/knowledge_document.py")
 
 
+def render_batch_preparation(goal):
+    """Generate the documents of every session that has none yet, in one batch request."""
+    selected_gid = st.session_state["selected_goal_id"]
+    pending = [
+        sid for sid in range(len(goal["learning_path"]))
+        if not st.session_state["document_caches"].get(f"{selected_gid}-{sid}")
+    ]
+    with st.expander("Prepare All Session Documents", expanded=False):
+        if not pending:
+            st.success("Documents for all sessions are ready.")
+            return
+        st.info(f"{len(pending)} session(s) have no document yet. They can be generated together in the background of this page.")
+        if use_mock_data:
+            st.warning("Using mock data for session documents.")
+        if not st.button("Prepare Documents", type="primary", key="prepare_all_documents"):
+            return
+        progress = st.progress(0.0, text="Exploring knowledge points ...")
+        done = 0
+        for event in stream_learning_path_content(
+            goal["learner_profile"],
+            goal["learning_path"],
+            session_indices=pending,
+            use_search=use_search,
+            quiz_counts={
+                "single_choice_count": 3,
+                "multiple_choice_count": 1,
+                "true_false_count": 1,
+                "short_answer_count": 1,
+            },
+        ):
+            kind = event.get("event")
+            if kind == "search":
+                progress.progress(0.0, text="Drafting session documents ...")
+            elif kind in ("session", "session_error"):
+                done += 1
+                sid = event["session_index"]
+                title = goal["learning_path"][sid]["title"]
+                if kind == "session":
+                    st.session_state["document_caches"][f"{selected_gid}-{sid}"] = event["learning_content"]
+                    save_persistent_state()
+                    st.write(f"✅ {sid + 1}: {title}")
+                else:
+                    st.write(f"❌ {sid + 1}: {title} ({event.get('detail')})")
+                progress.progress(done / len(pending), text=f"Prepared {done}/{len(pending)} sessions")
+            elif kind == "error":
+                st.error(f"Failed to prepare documents: {event.get('detail')}")
+                return
+        st.toast("🎉 Session documents prepared!")
+
+
 render_learning_path()
\ No newline at end of file
@@ -3,8 +3,15 @@ import httpx
 import streamlit as st
 from config import backend_endpoint, use_mock_data, use_search
 
+# Agent endpoints are served from the typed JSON API; request bodies carry the
+# profile, path and session objects as-is instead of their str() form.
+API_VERSION = "v2"
+
 API_NAMES = {
     "chat_with_tutor": "chat-with-tutor",
+    "stream_chat_with_tutor": "chat-with-tutor/stream",
+    "stream_learning_content": "tailor-knowledge-content/stream",
+    "stream_learning_path_content": "learning-path-content/stream",
     "refine_goal": "refine-learning-goal",
     "identify_skill_gap": "identify-skill-gap-with-info",
     "create_profile": "create-learner-profile-with-info",
@@ -32,7 +39,7 @@ def make_post_request(api_name, data, mock_data_path=None, timeout=500):
     if use_mock_data and mock_data_path:
         return json.load(open(mock_data_path))
 
-    backend_url = f"{backend_endpoint}{api_name}"
+    backend_url = f"{backend_endpoint}{API_VERSION}/{api_name}"
     try:
         response = httpx.post(backend_url, json=data, timeout=timeout)
         
@@ -45,6 +52,20 @@ def make_post_request(api_name, data, mock_data_path=None, timeout=500):
         st.write("Failed to fetch data. Error:", e)
         return {}
 
+def make_stream_request(api_name, data, timeout=500):
+    """POST to a streaming backend endpoint and yield its NDJSON events as dicts."""
+    backend_url = f"{backend_endpoint}{API_VERSION}/{api_name}"
+    try:
+        with httpx.stream("POST", backend_url, json=data, timeout=timeout) as response:
+            if response.status_code != 200:
+                st.write("Failed to fetch data. Status code:", response.status_code)
+                return
+            for line in response.iter_lines():
+                if line:
+                    yield json.loads(line)
+    except Exception as e:
+        st.write("Failed to fetch data. Error:", e)
+
 def extract_pdf_text(file):
     """Extract text from a PDF file using the backend API."""
     backend_url = f"{backend_endpoint}extract-pdf-text"
@@ -75,14 +96,35 @@ def get_available_models(backend_endpoint):
 
 def chat_with_tutor(chat_messages, learner_profile, llm_type="gpt4o", method_name="genmentor"):
     data = {
-        "messages": str(chat_messages),
-        "learner_profile": str(learner_profile),
+        "messages": chat_messages,
+        "learner_profile": learner_profile,
         "llm_type": str(llm_type),
         "method_name": str(method_name),
     }
     response = make_post_request(API_NAMES["chat_with_tutor"], data, "./assets/data_example/ai)tutor_chat.json")
     return response.get("response") if response else None
 
+def stream_chat_with_tutor(chat_messages, learner_profile, llm_type="gpt4o", method_name="genmentor"):
+    """Yield the tutor reply chunk by chunk from the NDJSON streaming endpoint."""
+    if use_mock_data:
+        response = chat_with_tutor(chat_messages, learner_profile, llm_type, method_name)
+        if response:
+            yield response
+        return
+
+    data = {
+        "messages": chat_messages,
+        "learner_profile": learner_profile,
+        "llm_type": str(llm_type),
+        "method_name": str(method_name),
+    }
+    for event in make_stream_request(API_NAMES["stream_chat_with_tutor"], data):
+        if event.get("event") == "token":
+            yield event.get("text", "")
+        elif event.get("event") == "error":
+            st.write("Failed to fetch data. Error:", event.get("detail"))
+            return
+
 def refine_learning_goal(learning_goal, learner_information, llm_type="gpt4o", method_name="genmentor"):
     data = {
         "learning_goal": str(learning_goal),
@@ -108,8 +150,8 @@ def identify_skill_gap(learning_goal, learner_information, llm_type="gpt4o", met
 def create_learner_profile(learning_goal, learner_information, skill_gaps, llm_type="gpt4o", method_name="genmentor"):
     data = {
         "learning_goal": str(learning_goal),
-        "learner_information": str(learner_information),
-        "skill_gaps": str(skill_gaps),
+        "learner_information": learner_information,
+        "skill_gaps": skill_gaps,
         "llm_type": str(llm_type),
         "method_name": str(method_name),
     }
@@ -118,10 +160,10 @@ def create_learner_profile(learning_goal, learner_information, skill_gaps, llm_t
 
 def update_learner_profile(learner_profile, learner_interactions, learner_information="", session_information="", llm_type="gpt4o", method_name="genmentor"):
     data = {
-        "learner_profile": str(learner_profile),
-        "learner_interactions": str(learner_interactions),
-        "learner_information": str(learner_information),
-        "session_information": str(session_information),
+        "learner_profile": learner_profile,
+        "learner_interactions": learner_interactions,
+        "learner_information": learner_information,
+        "session_information": session_information,
         "llm_type": str(llm_type),
         "method_name": str(method_name),
     }
@@ -131,7 +173,7 @@ def update_learner_profile(learner_profile, learner_interactions, learner_inform
 # @st.cache_resource
 def schedule_learning_path(learner_profile, session_count, llm_type="gpt4o", method_name="genmentor"):
     data = {
-        "learner_profile": str(learner_profile),
+        "learner_profile": learner_profile,
         "session_count": session_count,
         "llm_type": str(llm_type),
         "method_name": str(method_name),
@@ -141,10 +183,10 @@ def schedule_learning_path(learner_profile, session_count, llm_type="gpt4o", met
 
 def reschedule_learning_path(learning_path, learner_profile, session_count, other_feedback="", llm_type="gpt4o", method_name="genmentor"):
     data = {
-        "learning_path": str(learning_path),
-        "learner_profile": str(learner_profile),
+        "learning_path": learning_path,
+        "learner_profile": learner_profile,
         "session_count": int(session_count),
-        "other_feedback": str(other_feedback),
+        "other_feedback": other_feedback,
         "llm_type": str(llm_type),
         "method_name": str(method_name),
     }
@@ -154,8 +196,8 @@ def reschedule_learning_path(learning_path, learner_profile, session_count, othe
 # @st.cache_resource
 def generate_document_quizzes(learner_profile, learning_document, single_choice_count, multiple_choice_count, true_false_count, short_answer_count, llm_type="gpt4o", method_name="genmentor"):
     data = {
-        "learner_profile": str(learner_profile),
-        "learning_document": str(learning_document),
+        "learner_profile": learner_profile,
+        "learning_document": learning_document,
         "single_choice_count": single_choice_count,
         "multiple_choice_count": multiple_choice_count,
         "true_false_count": true_false_count,
@@ -163,62 +205,62 @@ def generate_document_quizzes(learner_profile, learning_document, single_choice_
         "llm_type": str(llm_type),
         "method_name": str(method_name),
     }
-    response = make_post_request("generate-document-quizzes", data, "./assets/data_example/document_quiz.json")
+    response = make_post_request(API_NAMES["generate_document_quizzes"], data, "./assets/data_example/document_quiz.json")
     return response.get("document_quiz") if response else None
 
 # @st.cache_resource
 def explore_knowledge_points(learner_profile, learning_path, learning_session, llm_type="gpt4o", method_name="genmentor"):
     data = {
-        "learner_profile": str(learner_profile),
-        "learning_path": str(learning_path),
-        "learning_session": str(learning_session),
+        "learner_profile": learner_profile,
+        "learning_path": learning_path,
+        "learning_session": learning_session,
     }
-    response = make_post_request("explore-knowledge-points", data, "./assets/data_example/knowledge_points.json")
+    response = make_post_request(API_NAMES["explore_knowledge_points"], data, "./assets/data_example/knowledge_points.json")
     return response.get("knowledge_points") if response else None
 
 # @st.cache_resource
 def draft_knowledge_point(learner_profile, learning_path, learning_session, knowledge_points, knowledge_point, use_search, llm_type="gpt4o", method_name="genmentor"):
     data = {
-        "learner_profile": str(learner_profile),
-        "learning_path": str(learning_path),
-        "learning_session": str(learning_session),
-        "knowledge_points": str(knowledge_points),
-        "knowledge_point": str(knowledge_point),
+        "learner_profile": learner_profile,
+        "learning_path": learning_path,
+        "learning_session": learning_session,
+        "knowledge_points": knowledge_points,
+        "knowledge_point": knowledge_point,
         "use_search": use_search,
         "llm_type": str(llm_type),
         "method_name": str(method_name),
     }
-    response = make_post_request("draft-knowledge-point", data, "./assets/data_example/knowledge_point.json")
+    response = make_post_request(API_NAMES["draft_knowledge_point"], data, "./assets/data_example/knowledge_point.json")
     return response.get("knowledge_draft") if response else None
 
 # @st.cache_resource
 def draft_knowledge_points(learner_profile, learning_path, learning_session, knowledge_points, allow_parallel, use_search, llm_type="gpt4o", method_name="genmentor"):
     data = {
-        "learner_profile": str(learner_profile),
-        "learning_path": str(learning_path),
-        "learning_session": str(learning_session),
-        "knowledge_points": str(knowledge_points),
+        "learner_profile": learner_profile,
+        "learning_path": learning_path,
+        "learning_session": learning_session,
+        "knowledge_points": knowledge_points,
         "allow_parallel": allow_parallel,
         "use_search": use_search,
         "llm_type": str(llm_type),
         "method_name": str(method_name),
     }
-    response = make_post_request("draft-knowledge-points", data, "./assets/data_example/knowledge_points.json")
+    response = make_post_request(API_NAMES["draft_knowledge_points"], data, "./assets/data_example/knowledge_points.json")
     return response.get("knowledge_drafts") if response else None
 
 # @st.cache_resource
 def integrate_learning_document(learner_profile, learning_path, learning_session, knowledge_points, knowledge_drafts, output_markdown=False, llm_type="gpt4o", method_name="genmentor"):
     data = {
-        "learner_profile": str(learner_profile),
-        "learning_path": str(learning_path),
-        "learning_session": str(learning_session),
-        "knowledge_points": str(knowledge_points),
-        "knowledge_drafts": str(knowledge_drafts),
+        "learner_profile": learner_profile,
+        "learning_path": learning_path,
+        "learning_session": learning_session,
+        "knowledge_points": knowledge_points,
+        "knowledge_drafts": knowledge_drafts,
         "output_markdown": output_markdown,
         "llm_type": str(llm_type),
         "method_name": str(method_name),
     }
-    response = make_post_request("integrate-learning-document", data, "./assets/data_example/learning_document.json")
+    response = make_post_request(API_NAMES["integrate_learning_document"], data, "./assets/data_example/learning_document.json")
     if output_markdown:
         return response.get("learning_document") if response else None
     else:
@@ -226,8 +268,8 @@ def integrate_learning_document(learner_profile, learning_path, learning_session
 
 def simulate_path_feedback(learner_profile, learning_path, llm_type="gpt4o", method_name="genmentor"):
     data = {
-        "learner_profile": str(learner_profile),
-        "learning_path": str(learning_path),
+        "learner_profile": learner_profile,
+        "learning_path": learning_path,
         "llm_type": str(llm_type),
         "method_name": str(method_name),
     }
@@ -236,8 +278,8 @@ def simulate_path_feedback(learner_profile, learning_path, llm_type="gpt4o", met
 
 def refine_learning_path_with_feedback(learning_path, feedback, llm_type="gpt4o", method_name="genmentor"):
     data = {
-        "learning_path": str(learning_path),
-        "feedback": str(feedback),
+        "learning_path": learning_path,
+        "feedback": feedback,
         "llm_type": str(llm_type),
         "method_name": str(method_name),
     }
@@ -246,8 +288,8 @@ def refine_learning_path_with_feedback(learning_path, feedback, llm_type="gpt4o"
 
 def iterative_refine_learning_path(learner_profile, learning_path, max_iterations=2, llm_type="gpt4o", method_name="genmentor"):
     data = {
-        "learner_profile": str(learner_profile),
-        "learning_path": str(learning_path),
+        "learner_profile": learner_profile,
+        "learning_path": learning_path,
         "max_iterations": max_iterations,
         "llm_type": str(llm_type),
         "method_name": str(method_name),
@@ -259,3 +301,42 @@ def iterative_refine_learning_path(learner_profile, learning_path, max_iteration
             "iterations": response.get("iterations", [])
         }
     return None
+
+def stream_learning_content(learner_profile, learning_path, learning_session, use_search=True, allow_parallel=True, with_quiz=True, quiz_counts=None, llm_type="gpt4o", method_name="genmentor"):
+    """Yield the content pipeline's stage events (knowledge points, drafts, document, quizzes)."""
+    data = {
+        "learner_profile": learner_profile,
+        "learning_path": learning_path,
+        "learning_session": learning_session,
+        "use_search": use_search,
+        "allow_parallel": allow_parallel,
+        "with_quiz": with_quiz,
+        "output_markdown": True,
+        "llm_type": str(llm_type),
+        "method_name": str(method_name),
+        **(quiz_counts or {}),
+    }
+    yield from make_stream_request(API_NAMES["stream_learning_content"], data)
+
+def stream_learning_path_content(learner_profile, learning_path, session_indices=None, use_search=True, with_quiz=True, quiz_counts=None, llm_type="gpt4o", method_name="genmentor"):
+    """Yield batch events for several sessions; each ``session`` event carries one session's content."""
+    if use_mock_data:
+        learning_content = json.load(open("./assets/data_example/knowledge_document.json"))
+        for session_index in (range(len(learning_path)) if session_indices is None else session_indices):
+            yield {"event": "session", "session_index": session_index, "learning_content": learning_content}
+        yield {"event": "done"}
+        return
+
+    data = {
+        "learner_profile": learner_profile,
+        "learning_path": learning_path,
+        "session_indices": session_indices,
+        "use_search": use_search,
+        "with_quiz": with_quiz,
+        "output_markdown": True,
+        "llm_type": str(llm_type),
+        "method_name": str(method_name),
+        **(quiz_counts or {}),
+    }
+    yield from make_stream_request(API_NAMES["stream_learning_path_content"], data, timeout=1800)
+
@@ -2,7 +2,9 @@
 set -euo pipefail
 
 # Start the FastAPI backend in the foreground
-# Usage: ./scripts/start_backend.sh [PORT]
+# Usage: ./scripts/start_backend.sh [PORT] [WORKERS]
+#   WORKERS > 1 (or BACKEND_WORKERS) runs the multi-process server (serve.py)
+#   instead of a single reloading uvicorn process.
 
 # Resolve repo root (one level up from this script dir)
 ROOT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")"/.. && pwd)"
@@ -17,6 +19,12 @@ if [[ -f .env ]]; then
 fi
 
 PORT="${1:-${BACKEND_PORT:-5000}}"
+WORKERS="${2:-${BACKEND_WORKERS:-1}}"
+
+if [[ "${WORKERS}" -gt 1 ]]; then
+  echo "Starting backend (serve.py, ${WORKERS} workers) on port ${PORT}..."
+  exec python serve.py --port "${PORT}" --workers "${WORKERS}"
+fi
 
 echo "Starting backend (uvicorn) on port ${PORT}..."
 exec uvicorn main:app --port "${PORT}" --reload